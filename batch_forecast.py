@@ -0,0 +1,83 @@
+import os
+import glob
+import numpy as np
+import pandas as pd
+from regression_engine import fit_grouped
+from usage_store import load_usage_arrays
+from tariff import TARIFF_RATE, calculate_cost_and_usage_batch
+
+
+def load_meter_directory(directory, pattern="*.csv"):
+    """
+    Memuat semua file CSV dalam satu direktori menjadi satu tabel format panjang
+    dengan kolom 'meter_id', 'day' dan 'electricity_kWh_left'.
+    Id meter diambil dari nama file (tanpa ekstensi).
+    """
+    frames = []
+    for path in sorted(glob.glob(os.path.join(directory, pattern))):
+        day, kwh = load_usage_arrays(path)
+        frames.append(pd.DataFrame({
+            'meter_id': os.path.splitext(os.path.basename(path))[0],
+            'day': day,
+            'electricity_kWh_left': kwh,
+        }))
+
+    if not frames:
+        raise ValueError(f"Tidak ada file CSV di direktori '{directory}'.")
+    return pd.concat(frames, ignore_index=True)
+
+
+def forecast_fleet(usage_table, initial_capacity, target_day, tariff_rate=TARIFF_RATE):
+    """
+    Menghitung regresi dan estimasi biaya untuk banyak meter sekaligus.
+
+    `usage_table` adalah tabel format panjang (kolom 'meter_id', 'day',
+    'electricity_kWh_left') atau jalur direktori berisi file CSV per meter.
+    `initial_capacity` dan `target_day` boleh skalar, array sepanjang jumlah meter,
+    atau `pd.Series` yang diindeks dengan id meter.
+
+    Mengembalikan DataFrame kolumnar dengan satu baris per meter.
+    """
+    if isinstance(usage_table, (str, os.PathLike)):
+        usage_table = load_meter_directory(usage_table)
+
+    usage_table = usage_table.dropna(subset=['meter_id', 'day', 'electricity_kWh_left'])
+    if usage_table.empty:
+        raise ValueError("Tabel pemakaian tidak memiliki data yang valid untuk analisis.")
+
+    codes, meter_ids = pd.factorize(usage_table['meter_id'], sort=True)
+    n_samples, slope, intercept = fit_grouped(
+        codes,
+        usage_table['day'].to_numpy(dtype=np.float64),
+        usage_table['electricity_kWh_left'].to_numpy(dtype=np.float64),
+        n_groups=len(meter_ids),
+    )
+
+    if isinstance(initial_capacity, pd.Series):
+        initial_capacity = initial_capacity.reindex(meter_ids).to_numpy(dtype=np.float64)
+    if isinstance(target_day, pd.Series):
+        target_day = target_day.reindex(meter_ids).to_numpy(dtype=np.float64)
+    target_day = np.broadcast_to(np.asarray(target_day, dtype=np.float64), slope.shape)
+
+    predicted_kwh = intercept + slope * target_day
+    daily_usage_rate = -slope
+    with np.errstate(divide='ignore', invalid='ignore'):
+        day_at_zero_exact = np.where(slope != 0, -intercept / slope, np.nan)
+
+    remaining_kwh, total_usage, estimated_cost, day_at_zero_rounded = \
+        calculate_cost_and_usage_batch(initial_capacity, target_day, daily_usage_rate, tariff_rate)
+
+    return pd.DataFrame({
+        'meter_id': meter_ids,
+        'n_samples': n_samples,
+        'slope': slope,
+        'intercept': intercept,
+        'target_day': target_day,
+        'predicted_kWh': predicted_kwh,
+        'daily_usage_rate': daily_usage_rate,
+        'day_at_zero_exact': day_at_zero_exact,
+        'remaining_kWh': np.broadcast_to(remaining_kwh, slope.shape),
+        'total_usage': np.broadcast_to(total_usage, slope.shape),
+        'estimated_cost': np.broadcast_to(estimated_cost, slope.shape),
+        'day_at_zero_rounded': np.broadcast_to(day_at_zero_rounded, slope.shape),
+    })
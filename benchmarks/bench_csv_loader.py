@@ -0,0 +1,74 @@
+"""
+Benchmark pemuatan CSV: jalur lama (pd.read_csv + drop + dropna) dibandingkan
+dengan `usage_loader.read_usage_arrays`.
+
+Jalankan dari root proyek:
+    python benchmarks/bench_csv_loader.py --rows 2000000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from usage_loader import read_usage_arrays
+
+
+def write_sample_csv(path, rows, seed=0):
+    """Membuat file CSV sintetis dengan format data/electricity_usage.csv."""
+    rng = np.random.default_rng(seed)
+    day = np.arange(1, rows + 1)
+    kwh = 1e6 - 0.3 * day + rng.normal(0, 0.05, rows)
+    usage = np.full(rows, np.nan)
+    pd.DataFrame({'day': day, 'electricity_kWh_left': kwh.round(2),
+                  'usage_per_day': usage}).to_csv(path, index=False)
+
+
+def load_pandas_baseline(path):
+    df_csv = pd.read_csv(path)
+    if 'usage_per_day' in df_csv.columns:
+        df_csv = df_csv.drop(columns=['usage_per_day'])
+    df_csv = df_csv.dropna()
+    return df_csv['day'].to_numpy(), df_csv['electricity_kWh_left'].to_numpy()
+
+
+def best_of(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--chunksize', type=int, default=250_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'usage.csv')
+        write_sample_csv(path, args.rows)
+
+        results = {
+            'pandas read_csv + drop + dropna': best_of(lambda: load_pandas_baseline(path), args.repeat),
+            'read_usage_arrays': best_of(lambda: read_usage_arrays(path), args.repeat),
+            f'read_usage_arrays (chunksize={args.chunksize})':
+                best_of(lambda: read_usage_arrays(path, chunksize=args.chunksize), args.repeat),
+            'read_usage_arrays (float32)':
+                best_of(lambda: read_usage_arrays(path, kwh_dtype=np.float32), args.repeat),
+        }
+
+    baseline = results['pandas read_csv + drop + dropna']
+    print(f"{args.rows:,} baris, terbaik dari {args.repeat} percobaan")
+    for name, seconds in results.items():
+        print(f"  {name:<45} {seconds * 1000:9.1f} ms  ({baseline / seconds:4.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+Benchmark skala `fleet_runner.run_fleet` terhadap jumlah proses pekerja.
+
+Jalankan dari root proyek:
+    python benchmarks/bench_fleet.py --meters 2000 --days 3650
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fleet_runner import run_fleet
+from synthetic_meters import write_meter_fleet
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--meters', type=int, default=500)
+    parser.add_argument('--days', type=int, default=3650)
+    parser.add_argument('--topups', type=int, default=4)
+    parser.add_argument('--chunksize', type=int, default=8)
+    parser.add_argument('--workers', type=int, nargs='+', default=None,
+                        help="Jumlah pekerja yang diuji (default: 1, 2, 4, ... hingga jumlah CPU)")
+    args = parser.parse_args()
+
+    workers = args.workers
+    if workers is None:
+        workers = [1]
+        while workers[-1] * 2 <= (os.cpu_count() or 1):
+            workers.append(workers[-1] * 2)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        write_meter_fleet(tmp, args.meters, args.days, topups=args.topups, missing_fraction=0.01)
+        # Satu putaran awal membuat cache biner, agar setiap putaran mengukur hal yang sama
+        run_fleet(tmp, 100.0, 30, max_workers=1)
+
+        print(f"{args.meters:,} meter x {args.days:,} hari")
+        base = None
+        for count in workers:
+            start = time.perf_counter()
+            run_fleet(tmp, 100.0, 30, max_workers=count, chunksize=args.chunksize)
+            seconds = time.perf_counter() - start
+            base = base or seconds
+            print(f"  {count:>3} pekerja  {seconds * 1000:9.1f} ms  {args.meters / seconds:10,.0f} meter/s  "
+                  f"({base / seconds:4.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark alokasi dan waktu per prediksi: jalur lama (DataFrame satu baris untuk
+`predict`, tuple berisi df_csv, biaya skalar) dibandingkan dengan `ForecastResult`
+dan `forecast_batch` (array terstruktur).
+
+Jalankan dari root proyek:
+    python benchmarks/bench_forecast_records.py --forecasts 100000
+"""
+import argparse
+import math
+import os
+import sys
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from forecast_result import ForecastResult, forecast_batch
+from regression_engine import StreamingLinearRegression
+from tariff import TARIFF_RATE
+
+CAPACITY = 23.86
+
+
+def legacy_forecast(model, df_csv, target_day):
+    """Jalur lama: DataFrame satu baris untuk predict, 5-tuple, lalu biaya skalar."""
+    predicted_y = model.predict(pd.DataFrame([target_day], columns=['day']))[0]
+    daily_usage_rate = -model.coef_[0]
+    day_at_zero_exact = None
+    if model.coef_[0] != 0:
+        day_at_zero_exact = (0 - model.intercept_) / model.coef_[0]
+    result = (model, df_csv, predicted_y, daily_usage_rate, day_at_zero_exact)
+
+    remaining = CAPACITY - daily_usage_rate * (target_day - 1)
+    total_usage = max(0, daily_usage_rate * target_day)
+    cost = total_usage * TARIFF_RATE
+    return result, remaining, cost, math.floor(CAPACITY / daily_usage_rate)
+
+
+def measure(func, count):
+    """
+    (detik per prediksi, byte puncak sementara per panggilan, byte yang tertahan per
+    hasil bila semua hasil disimpan).
+    """
+    start = time.perf_counter()
+    func(count)
+    seconds = (time.perf_counter() - start) / count
+
+    sample = min(count, 1000)
+    tracemalloc.start()
+    func(1)
+    before = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    func(1)
+    peak = tracemalloc.get_traced_memory()[1] - before
+    kept = func(sample, keep=True)
+    retained = (tracemalloc.get_traced_memory()[0] - before) / sample
+    tracemalloc.stop()
+    del kept
+    return seconds, peak, retained
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--forecasts', type=int, default=20_000)
+    parser.add_argument('--days', type=int, default=365)
+    args = parser.parse_args()
+
+    day = np.arange(1, args.days + 1, dtype=np.float64)
+    kwh = 200 - 0.3 * day
+    df_csv = pd.DataFrame({'day': day, 'electricity_kWh_left': kwh})
+    sk_model = LinearRegression().fit(df_csv[['day']], df_csv['electricity_kWh_left'])
+    model = StreamingLinearRegression().fit(day, kwh)
+    target_days = np.arange(1, args.forecasts + 1) % 400 + 1
+    target_list = target_days.tolist()
+
+    def legacy(count, keep=False):
+        results = [legacy_forecast(sk_model, df_csv, target_day) for target_day in target_list[:count]]
+        return results if keep else None
+
+    def records(count, keep=False):
+        results = [ForecastResult.from_model(model, target_day, CAPACITY) for target_day in target_list[:count]]
+        return results if keep else None
+
+    def batch(count, keep=False):
+        return forecast_batch(model.slope_, model.intercept_, target_days[:count], CAPACITY)
+
+    print(f"{args.forecasts:,} prediksi")
+    for name, func in (('lama (DataFrame + tuple)', legacy), ('ForecastResult', records),
+                       ('forecast_batch', batch)):
+        seconds, peak, retained = measure(func, args.forecasts)
+        print(f"  {name:<26} {seconds * 1e6:9.3f} us/prediksi  puncak {peak:8,} B/panggilan  "
+              f"{retained:8.1f} B/hasil")
+
+
+if __name__ == '__main__':
+    main()
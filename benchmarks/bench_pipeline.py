@@ -0,0 +1,193 @@
+"""
+Benchmark per tahap jalur prediksi dengan data meter sintetis.
+
+Tahap yang diukur untuk setiap panjang riwayat:
+    read_csv_dropna   pd.read_csv + drop usage_per_day + dropna
+    sklearn_fit       LinearRegression.fit pada kolom 'day'
+    sklearn_predict   LinearRegression.predict untuk satu hari target
+    load_model        jalur cepat saat ini (cache biner .kwhcol hangat + regression_engine)
+    huber_fit         regresi robust Huber (IRLS) pada array yang sudah dimuat
+    theil_sen_fit     regresi robust Theil–Sen pada array yang sudah dimuat
+    cost_and_usage    main_CLI.calculate_cost_and_usage
+    graph_agg         main_CLI.create_visual_graph ke PNG (Agg)
+
+Setiap tahap melaporkan waktu terbaik, throughput (baris/detik atau panggilan/detik)
+dan memori puncak (tracemalloc). Hasil dapat disimpan sebagai baseline JSON dan
+dibandingkan antar versi.
+
+Jalankan dari root proyek:
+    python benchmarks/bench_pipeline.py --days 1000 100000 --save benchmarks/baselines/pipeline.json
+    python benchmarks/bench_pipeline.py --days 1000 100000 --compare benchmarks/baselines/pipeline.json
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import matplotlib
+
+matplotlib.use('Agg')
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from main_CLI import MODEL_CACHE, calculate_cost_and_usage, create_visual_graph
+from model_cache import load_model
+from robust_regression import huber_fit, theil_sen_fit
+from synthetic_meters import write_meter_fleet
+
+TARGET_DAY = 20
+CAPACITY = 23.86
+
+
+def read_csv_dropna(path):
+    df_csv = pd.read_csv(path)
+    if 'usage_per_day' in df_csv.columns:
+        df_csv = df_csv.drop(columns=['usage_per_day'])
+    return df_csv.dropna()
+
+
+def build_stages(paths, graph_dir):
+    """
+    Fungsi setiap tahap untuk semua meter, beserta satuan throughput-nya.
+    Data dan model untuk tahap hilir disiapkan sekali di sini agar setiap tahap
+    diukur tersendiri.
+    """
+    frames = [read_csv_dropna(path) for path in paths]
+    models = [LinearRegression().fit(df[['day']], df['electricity_kWh_left']) for df in frames]
+    rates = [-model.coef_[0] for model in models]
+    arrays = [(df['day'].to_numpy(dtype=float), df['electricity_kWh_left'].to_numpy()) for df in frames]
+    rows = sum(len(df) for df in frames)
+    calls = len(paths)
+
+    def graph():
+        for i, path in enumerate(paths):
+            create_visual_graph(CAPACITY, TARGET_DAY, path, output_path=os.path.join(graph_dir, f"{i}.png"))
+
+    return {
+        'read_csv_dropna': (lambda: [read_csv_dropna(path) for path in paths], rows, 'baris'),
+        'sklearn_fit': (lambda: [LinearRegression().fit(df[['day']], df['electricity_kWh_left'])
+                                 for df in frames], rows, 'baris'),
+        'sklearn_predict': (lambda: [model.predict(pd.DataFrame({'day': [TARGET_DAY]}))
+                                     for model in models], calls, 'panggilan'),
+        'load_model': (lambda: [load_model(path) for path in paths], rows, 'baris'),
+        'huber_fit': (lambda: [huber_fit(day, kwh) for day, kwh in arrays], rows, 'baris'),
+        'theil_sen_fit': (lambda: [theil_sen_fit(day, kwh) for day, kwh in arrays], rows, 'baris'),
+        'cost_and_usage': (lambda: [calculate_cost_and_usage(CAPACITY, TARGET_DAY, rate)
+                                    for rate in rates], calls, 'panggilan'),
+        'graph_agg': (graph, calls, 'grafik'),
+    }
+
+
+def best_time(func, repeat, min_seconds=0.05):
+    """Waktu terbaik per eksekusi; tahap yang sangat cepat diulang hingga >= `min_seconds`."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds or number >= 1 << 16:
+            break
+        number *= 4
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def peak_memory(func):
+    """Memori puncak (byte) yang dialokasikan selama satu eksekusi."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_size(days, args, tmp):
+    directory = os.path.join(tmp, f"days_{days}")
+    paths = write_meter_fleet(directory, args.meters, days, seed=args.seed, noise=args.noise,
+                              topups=args.topups, missing_fraction=args.missing,
+                              blank_fraction=args.blank)
+    graph_dir = os.path.join(directory, 'graphs')
+    os.makedirs(graph_dir)
+    MODEL_CACHE.clear()
+
+    results = {}
+    for name, (func, units, unit_name) in build_stages(paths, graph_dir).items():
+        if name == 'graph_agg' and args.skip_graph:
+            continue
+        func()  # pemanasan (impor, cache)
+        seconds = best_time(func, args.repeat)
+        results[name] = {'seconds': seconds, 'throughput': units / seconds, 'unit': unit_name,
+                         'peak_bytes': peak_memory(func)}
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Daftar (kunci, metrik, lama, baru) yang memburuk melebihi toleransi."""
+    regressions = []
+    for key, stage in results.items():
+        old = baseline.get(key)
+        if old is None:
+            continue
+        for metric in ('seconds', 'peak_bytes'):
+            if stage[metric] > old[metric] * (1 + tolerance):
+                regressions.append((key, metric, old[metric], stage[metric]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--days', type=int, nargs='+', default=[1000, 100_000],
+                        help="Panjang riwayat per meter (boleh lebih dari satu)")
+    parser.add_argument('--meters', type=int, default=1)
+    parser.add_argument('--noise', type=float, default=0.05)
+    parser.add_argument('--topups', type=int, default=0)
+    parser.add_argument('--missing', type=float, default=0.01, help="Porsi baris yang hilang")
+    parser.add_argument('--blank', type=float, default=0.01, help="Porsi baris dengan kWh kosong")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--skip-graph', action='store_true', help="Lewati tahap grafik")
+    parser.add_argument('--save', metavar='PATH', help="Simpan hasil sebagai baseline JSON")
+    parser.add_argument('--compare', metavar='PATH', help="Bandingkan dengan baseline JSON")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="Batas kenaikan relatif sebelum dianggap regresi (default 0.2)")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for days in args.days:
+            print(f"{args.meters} meter x {days:,} hari (terbaik dari {args.repeat} percobaan)")
+            for name, stage in run_size(days, args, tmp).items():
+                results[f"days={days}/{name}"] = stage
+                print(f"  {name:<16} {stage['seconds'] * 1000:10.3f} ms  "
+                      f"{stage['throughput']:14,.0f} {stage['unit']}/s  "
+                      f"puncak {stage['peak_bytes'] / 2**20:8.2f} MiB")
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        config = {key: value for key, value in vars(args).items() if key not in ('save', 'compare')}
+        with open(args.save, 'w') as f:
+            json.dump({'python': sys.version.split()[0], 'config': config, 'results': results}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.tolerance)
+        for key, metric, old, new in regressions:
+            print(f"[REGRESI] {key} {metric}: {old:.6g} -> {new:.6g}")
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark waktu mulai (cold start) titik masuk CLI.
+
+Mengukur waktu impor `main_CLI`, waktu satu prediksi non-interaktif, dan modul
+dengan biaya impor terbesar (dari `python -X importtime`). Hasil dapat disimpan
+sebagai baseline JSON dan dibandingkan antar rilis.
+
+Jalankan dari root proyek:
+    python benchmarks/bench_startup.py --save benchmarks/baselines/startup.json
+    python benchmarks/bench_startup.py --compare benchmarks/baselines/startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_CSV = os.path.join(ROOT, 'data', 'electricity_usage.csv')
+
+SCENARIOS = {
+    'import_main_cli': [sys.executable, '-c', 'import main_CLI'],
+    'single_query': [sys.executable, 'main_CLI.py', '--csv', SAMPLE_CSV,
+                     '--capacity', '23.86', '--target-day', '20', '--format', 'json'],
+}
+
+
+def time_command(command, repeat):
+    """Median waktu (detik) menjalankan perintah dalam proses baru."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def top_imports(limit):
+    """
+    Modul yang diimpor langsung oleh `main_CLI` (dan `main_CLI` sendiri) dengan
+    waktu impor kumulatif terbesar, dalam mikrodetik.
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import main_CLI'],
+                            cwd=ROOT, check=True, capture_output=True, text=True)
+    costs = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth <= 1:
+            costs[name.strip()] = int(cumulative_us)
+    return dict(sorted(costs.items(), key=lambda item: item[1], reverse=True)[:limit])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--save', metavar='PATH', help="Simpan hasil sebagai baseline JSON")
+    parser.add_argument('--compare', metavar='PATH', help="Bandingkan dengan baseline JSON")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="Batas kenaikan relatif sebelum dianggap regresi (default 0.2)")
+    args = parser.parse_args()
+
+    results = {name: time_command(command, args.repeat) for name, command in SCENARIOS.items()}
+    imports = top_imports(limit=8)
+
+    print(f"Median dari {args.repeat} percobaan")
+    for name, seconds in results.items():
+        print(f"  {name:<20} {seconds * 1000:8.1f} ms")
+    print("Impor terbesar (kumulatif):")
+    for name, micros in imports.items():
+        print(f"  {name:<20} {micros / 1000:8.1f} ms")
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, 'w') as f:
+            json.dump({'python': sys.version.split()[0], 'seconds': results,
+                       'top_imports_us': imports}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['seconds']
+        regressions = [name for name, seconds in results.items()
+                       if name in baseline and seconds > baseline[name] * (1 + args.tolerance)]
+        for name in regressions:
+            print(f"[REGRESI] {name}: {baseline[name] * 1000:.1f} ms -> {results[name] * 1000:.1f} ms")
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
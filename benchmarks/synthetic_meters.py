@@ -0,0 +1,93 @@
+"""
+Generator data meter sintetis untuk benchmark.
+
+Menghasilkan riwayat dengan format data/electricity_usage.csv (day,
+electricity_kWh_left, usage_per_day) dengan panjang, derau, top-up, baris yang
+hilang dan jumlah meter yang dapat diatur.
+
+Contoh:
+    python benchmarks/synthetic_meters.py out/ --meters 100 --days 3650 --topups 12
+"""
+import argparse
+import os
+import numpy as np
+
+CSV_HEADER = "day,electricity_kWh_left,usage_per_day\n"
+
+
+def generate_meter(days, daily_usage=0.3, noise=0.05, topups=0, topup_kwh=50.0,
+                   missing_fraction=0.0, blank_fraction=0.0, initial_capacity=None, seed=None):
+    """
+    Membuat riwayat satu meter.
+
+    - `days`             : panjang riwayat (hari ke-1 s.d. `days`)
+    - `noise`            : simpangan baku derau harian (kWh)
+    - `topups`           : jumlah pengisian ulang pada hari acak, masing-masing `topup_kwh`
+    - `missing_fraction` : porsi hari yang tidak tercatat sama sekali (baris hilang)
+    - `blank_fraction`   : porsi baris yang kolom kWh-nya kosong (dibuang oleh dropna)
+
+    Mengembalikan (day, kwh_left) sebagai array; kWh kosong bernilai NaN.
+    """
+    rng = np.random.default_rng(seed)
+    day = np.arange(1, days + 1, dtype=np.int64)
+    if initial_capacity is None:
+        initial_capacity = daily_usage * days * 1.1 + 10
+    usage = np.full(days, daily_usage)
+    if topups:
+        usage[rng.choice(days, size=min(topups, days), replace=False)] -= topup_kwh
+    kwh_left = initial_capacity - np.cumsum(usage) + rng.normal(0, noise, days)
+
+    if missing_fraction:
+        keep = rng.random(days) >= missing_fraction
+        day, kwh_left = day[keep], kwh_left[keep]
+    if blank_fraction:
+        kwh_left[rng.random(day.size) < blank_fraction] = np.nan
+    return day, kwh_left
+
+
+def write_meter_csv(path, day, kwh_left):
+    """Menulis riwayat ke CSV (kWh dibulatkan 2 desimal, NaN ditulis kosong)."""
+    with open(path, 'w') as f:
+        f.write(CSV_HEADER)
+        f.writelines(f"{d},\n" if k != k else f"{d},{k:.2f}\n"
+                     for d, k in zip(day.tolist(), kwh_left.tolist()))
+
+
+def write_meter_fleet(directory, meters, days, seed=0, **options):
+    """
+    Menulis `meters` file CSV (meter_00000.csv, ...) ke `directory`.
+    Setiap meter mendapat seed turunan sendiri sehingga hasil dapat direproduksi.
+    Mengembalikan daftar jalur file.
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for i, child in enumerate(np.random.SeedSequence(seed).spawn(meters)):
+        path = os.path.join(directory, f"meter_{i:05d}.csv")
+        write_meter_csv(path, *generate_meter(days, seed=child, **options))
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('directory')
+    parser.add_argument('--meters', type=int, default=1)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--daily-usage', type=float, default=0.3)
+    parser.add_argument('--noise', type=float, default=0.05)
+    parser.add_argument('--topups', type=int, default=0)
+    parser.add_argument('--topup-kwh', type=float, default=50.0)
+    parser.add_argument('--missing', type=float, default=0.0, help="Porsi baris yang hilang")
+    parser.add_argument('--blank', type=float, default=0.0, help="Porsi baris dengan kWh kosong")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    paths = write_meter_fleet(args.directory, args.meters, args.days, seed=args.seed,
+                              daily_usage=args.daily_usage, noise=args.noise, topups=args.topups,
+                              topup_kwh=args.topup_kwh, missing_fraction=args.missing,
+                              blank_fraction=args.blank)
+    print(f"{len(paths)} meter ditulis ke {args.directory}")
+
+
+if __name__ == '__main__':
+    main()
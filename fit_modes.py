@@ -0,0 +1,31 @@
+from regression_engine import StreamingLinearRegression, fit_recent
+from topup_segments import fit_topup_aware
+from robust_regression import fit_robust
+
+
+def fit_arrays(day, kwh, window=None, halflife=None, topup_aware=False, robust=None, min_jump=None):
+    """
+    Memilih mode pelatihan untuk array (day, kWh):
+    - `topup_aware`: gradien gabungan antar segmen top-up (lihat `topup_segments`);
+      `min_jump` (kWh) adalah ambang top-up, default diturunkan dari derau data
+    - `window`/`halflife` (hari): hanya mencerminkan pemakaian terkini
+    - `robust` ('huber' atau 'theil-sen'): tahan terhadap pembacaan yang salah
+    - selain itu: regresi OLS biasa atas seluruh riwayat
+
+    Paling banyak satu mode boleh dipilih; kombinasi mode menghasilkan ValueError.
+    """
+    modes = {'window': window is not None, 'halflife': halflife is not None,
+             'topup_aware': bool(topup_aware), 'robust': robust is not None}
+    chosen = [name for name, selected in modes.items() if selected]
+    if len(chosen) > 1:
+        raise ValueError(f"Mode pelatihan tidak dapat digabung: {', '.join(chosen)}.")
+    if min_jump is not None and not topup_aware:
+        raise ValueError("'min_jump' hanya berlaku untuk mode topup_aware.")
+
+    if topup_aware:
+        return fit_topup_aware(day, kwh, min_jump)
+    if window is not None or halflife is not None:
+        return fit_recent(day, kwh, window=window, halflife=halflife)
+    if robust is not None:
+        return fit_robust(day, kwh, robust)
+    return StreamingLinearRegression().fit(day, kwh)
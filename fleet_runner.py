@@ -0,0 +1,175 @@
+"""
+Prediksi banyak meter (satu file CSV per meter) yang tersebar ke beberapa proses.
+
+Daftar file dibagi menjadi potongan kecil yang diambil pekerja yang sedang
+menganggur, sehingga file yang lambat (CSV berantakan, riwayat panjang) tidak
+membuat pekerja lain menunggu. Jumlah potongan yang sedang dikerjakan dibatasi
+agar memori tetap kecil untuk armada yang sangat besar. Pekerja hanya
+mengembalikan array ringkas (n, slope, intercept) per file, bukan DataFrame
+atau objek model, dan kesalahan satu file tidak menghentikan proses lainnya.
+
+Jalankan:
+    python fleet_runner.py data/meters/ --capacity 100 --target-day 30 --output hasil.csv
+"""
+import argparse
+import glob
+import os
+import sys
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+import numpy as np
+from model_cache import load_model
+from forecast_result import forecast_batch
+from tariff import TARIFF_RATE
+
+# Kolom array ringkas yang dikirim pekerja untuk setiap file
+_STATS = ('n_samples', 'slope', 'intercept')
+
+
+def fit_meter_files(paths, window=None, halflife=None, topup_aware=False, robust=None, min_jump=None):
+    """
+    Melatih model untuk setiap file di satu proses.
+
+    Mengembalikan (stats, errors): array float64 berbentuk (len(paths), 3) berisi
+    (n_samples, slope, intercept), NaN untuk file yang gagal, dan daftar
+    (posisi, pesan) kesalahan.
+    """
+    stats = np.full((len(paths), len(_STATS)), np.nan)
+    errors = []
+    for i, path in enumerate(paths):
+        try:
+            model = load_model(path, window=window, halflife=halflife, topup_aware=topup_aware,
+                               robust=robust, min_jump=min_jump)
+            stats[i] = model.n_samples_, model.slope_, model.intercept_
+        except Exception as e:
+            errors.append((i, f"{type(e).__name__}: {e}"))
+    return stats, errors
+
+
+def _fit_chunk(start, paths, options):
+    stats, errors = fit_meter_files(paths, **options)
+    return start, stats, errors
+
+
+def run_fleet(paths, initial_capacity, target_day, tariff_rate=TARIFF_RATE, window=None,
+              halflife=None, topup_aware=False, robust=None, min_jump=None, max_workers=None,
+              chunksize=8, max_in_flight=None):
+    """
+    Menghitung prediksi untuk banyak file CSV meter secara paralel.
+
+    `paths` berupa daftar file CSV atau jalur direktori. `initial_capacity` dan
+    `target_day` boleh skalar atau array sepanjang jumlah file. Potongan berisi
+    `chunksize` file; paling banyak `max_in_flight` potongan (default 2x jumlah
+    pekerja) dikirim ke pool pada satu waktu.
+
+    Jika sebuah proses pekerja berhenti mendadak (mis. kehabisan memori), pool
+    dibuat ulang dan file dari potongan yang terdampak dicoba lagi satu per satu;
+    file yang kembali menghentikan pekerja ditandai gagal.
+
+    Mengembalikan DataFrame dengan satu baris per file (urutan sama dengan `paths`)
+    dan kolom 'error' (None jika berhasil).
+    """
+    if isinstance(paths, (str, os.PathLike)):
+        paths = sorted(glob.glob(os.path.join(paths, '*.csv')))
+    paths = list(paths)
+    if not paths:
+        raise ValueError("Tidak ada file CSV untuk diproses.")
+
+    options = {'window': window, 'halflife': halflife, 'topup_aware': topup_aware, 'robust': robust,
+               'min_jump': min_jump}
+    stats = np.full((len(paths), len(_STATS)), np.nan)
+    errors = {}
+
+    if max_workers == 1:
+        stats[:], chunk_errors = fit_meter_files(paths, **options)
+        errors.update(chunk_errors)
+    else:
+        _run_pool(paths, options, stats, errors, max_workers, chunksize, max_in_flight)
+
+    return _build_results(paths, stats, errors, initial_capacity, target_day, tariff_rate)
+
+
+def _run_pool(paths, options, stats, errors, max_workers, chunksize, max_in_flight):
+    workers = max_workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or 2 * workers
+    chunks = deque((start, min(start + chunksize, len(paths))) for start in range(0, len(paths), chunksize))
+    suspects = deque()
+
+    while chunks or suspects:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            if chunks:
+                for start, end in _drain(executor, chunks, max_in_flight, paths, options, stats, errors):
+                    suspects.extend((i, i + 1) for i in range(start, end))
+            else:
+                # File dari potongan yang terdampak dicoba sendiri-sendiri, satu per satu,
+                # sehingga file penyebab pekerja berhenti dapat dikenali dengan pasti
+                for start, _ in _drain(executor, suspects, 1, paths, options, stats, errors):
+                    errors[start] = "Proses pekerja berhenti saat memproses file ini."
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _drain(executor, queue, max_in_flight, paths, options, stats, errors):
+    """
+    Mengirim potongan dari `queue` ke pool (paling banyak `max_in_flight` sekaligus)
+    dan menyimpan hasilnya. Berhenti jika pool rusak; mengembalikan potongan yang hilang.
+    """
+    in_flight = {}
+    lost = []
+    while (queue and not lost) or in_flight:
+        # Antrean terbatas: pekerja yang menganggur langsung mengambil potongan berikutnya
+        while queue and not lost and len(in_flight) < max_in_flight:
+            start, end = queue.popleft()
+            in_flight[executor.submit(_fit_chunk, start, paths[start:end], options)] = (start, end)
+        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in done:
+            start, end = in_flight.pop(future)
+            try:
+                _, chunk_stats, chunk_errors = future.result()
+            except BrokenProcessPool:
+                lost.append((start, end))
+                continue
+            stats[start:end] = chunk_stats
+            errors.update((start + i, message) for i, message in chunk_errors)
+    return lost
+
+
+def _build_results(paths, stats, errors, initial_capacity, target_day, tariff_rate):
+    import pandas as pd
+
+    n_samples, slope, intercept = stats.T
+    batch = forecast_batch(slope, intercept, target_day, initial_capacity, tariff_rate)
+
+    results = pd.DataFrame(batch)
+    results.insert(0, 'meter_id', [os.path.splitext(os.path.basename(path))[0] for path in paths])
+    results.insert(1, 'n_samples', pd.Series(n_samples).astype('Int64'))
+    results['error'] = [errors.get(i) for i in range(len(paths))]
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prediksi banyak meter secara paralel.")
+    parser.add_argument('input_dir', help="Direktori berisi file CSV per meter")
+    parser.add_argument('--capacity', type=float, required=True, help="Kapasitas hari ke-1 (kWh)")
+    parser.add_argument('--target-day', type=int, required=True)
+    parser.add_argument('--tariff', type=float, default=TARIFF_RATE)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunksize', type=int, default=8, help="Jumlah file per potongan tugas")
+    parser.add_argument('--output', metavar='PATH', help="Simpan hasil ke CSV (default: stdout)")
+    args = parser.parse_args()
+
+    results = run_fleet(args.input_dir, args.capacity, args.target_day, tariff_rate=args.tariff,
+                        max_workers=args.workers, chunksize=args.chunksize)
+    results.to_csv(args.output if args.output else sys.stdout, index=False)
+
+    failed = results[results['error'].notna()]
+    for meter_id, error in zip(failed['meter_id'], failed['error']):
+        print(f"[ERROR] {meter_id}: {error}", file=sys.stderr)
+    if len(failed):
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
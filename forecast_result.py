@@ -0,0 +1,98 @@
+import math
+import numpy as np
+from tariff import TARIFF_RATE
+
+# Kolom hasil prediksi; dipakai bersama oleh `ForecastResult` dan array batch
+FORECAST_FIELDS = ('slope', 'intercept', 'target_day', 'predicted_kWh', 'day_at_zero_exact',
+                   'daily_usage_rate', 'remaining_kWh', 'total_usage', 'estimated_cost',
+                   'day_at_zero_rounded')
+FORECAST_DTYPE = np.dtype([(name, np.float64) for name in FORECAST_FIELDS])
+
+
+class ForecastResult:
+    """
+    Hasil prediksi satu meter untuk satu hari target, dihitung langsung dari
+    slope dan intercept (float biasa) tanpa DataFrame maupun array sementara.
+
+    - 'predicted_kWh' dan 'day_at_zero_exact' berasal dari garis historis
+    - 'remaining_kWh' dan 'day_at_zero_rounded' berasal dari garis estimasi yang
+      melewati (1, initial_capacity); 'total_usage' dan 'estimated_cost' dari pemakaian harian
+
+    Nilai yang tidak terdefinisi (mis. hari habis saat slope nol, atau nilai
+    yang membutuhkan kapasitas awal padahal tidak diberikan) bernilai None.
+    """
+
+    __slots__ = FORECAST_FIELDS
+
+    def __init__(self, slope, intercept, target_day, predicted_kWh, day_at_zero_exact,
+                 daily_usage_rate, remaining_kWh, total_usage, estimated_cost, day_at_zero_rounded):
+        self.slope = slope
+        self.intercept = intercept
+        self.target_day = target_day
+        self.predicted_kWh = predicted_kWh
+        self.day_at_zero_exact = day_at_zero_exact
+        self.daily_usage_rate = daily_usage_rate
+        self.remaining_kWh = remaining_kWh
+        self.total_usage = total_usage
+        self.estimated_cost = estimated_cost
+        self.day_at_zero_rounded = day_at_zero_rounded
+
+    @classmethod
+    def from_line(cls, slope, intercept, target_day, initial_capacity=None, tariff_rate=TARIFF_RATE):
+        """Menghitung semua nilai hasil dari slope dan intercept garis historis."""
+        daily_usage_rate = -slope
+        total_usage = max(0, daily_usage_rate * target_day)
+        remaining_kwh = day_at_zero_rounded = None
+        if initial_capacity is not None:
+            remaining_kwh = initial_capacity - daily_usage_rate * (target_day - 1)
+            if daily_usage_rate != 0:
+                day_at_zero_rounded = math.floor(initial_capacity / daily_usage_rate)
+        return cls(slope, intercept, target_day, intercept + slope * target_day,
+                   -intercept / slope if slope != 0 else None, daily_usage_rate,
+                   remaining_kwh, total_usage, total_usage * tariff_rate, day_at_zero_rounded)
+
+    @classmethod
+    def from_model(cls, model, target_day, initial_capacity=None, tariff_rate=TARIFF_RATE):
+        """Seperti `from_line`, untuk model dengan atribut `slope_` dan `intercept_`."""
+        return cls.from_line(float(model.slope_), float(model.intercept_), target_day,
+                             initial_capacity, tariff_rate)
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in FORECAST_FIELDS}
+
+    def __eq__(self, other):
+        if not isinstance(other, ForecastResult):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in FORECAST_FIELDS)
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in FORECAST_FIELDS)
+        return f"ForecastResult({fields})"
+
+
+def forecast_batch(slope, intercept, target_day, initial_capacity=np.nan, tariff_rate=TARIFF_RATE):
+    """
+    Versi batch dari `ForecastResult.from_line`: argumen boleh skalar atau array yang
+    dapat di-broadcast. Mengembalikan satu array terstruktur `FORECAST_DTYPE`
+    (satu blok memori untuk seluruh batch); nilai tidak terdefinisi bernilai NaN.
+    """
+    slope, intercept, target_day, initial_capacity = np.broadcast_arrays(
+        np.asarray(slope, dtype=np.float64), np.asarray(intercept, dtype=np.float64),
+        np.asarray(target_day, dtype=np.float64), np.asarray(initial_capacity, dtype=np.float64))
+
+    out = np.empty(slope.shape, dtype=FORECAST_DTYPE)
+    out['slope'] = slope
+    out['intercept'] = intercept
+    out['target_day'] = target_day
+    out['predicted_kWh'] = intercept + slope * target_day
+    out['daily_usage_rate'] = -slope
+    rate = out['daily_usage_rate']
+    out['remaining_kWh'] = initial_capacity - rate * (target_day - 1)
+    np.maximum(0, rate * target_day, out=out['total_usage'])
+    out['estimated_cost'] = out['total_usage'] * tariff_rate
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out['day_at_zero_exact'] = np.where(slope != 0, -intercept / slope, np.nan)
+        day_at_zero = initial_capacity / rate
+    out['day_at_zero_rounded'] = np.where(np.isfinite(day_at_zero), np.floor(day_at_zero), np.nan)
+    return out
@@ -0,0 +1,302 @@
+"""
+Layanan HTTP lokal untuk prediksi pemakaian listrik dengan model yang tetap "hangat".
+
+Model setiap meter yang terdaftar dilatih sekali dan disimpan di memori, sehingga
+permintaan prediksi tidak perlu memulai Python, membaca CSV, atau melatih ulang.
+
+Endpoint (JSON):
+    GET  /health                 status layanan
+    GET  /meters                 daftar meter terdaftar
+    POST /meters                 {"meter_id": "...", "csv_path": "..."} daftar/muat ulang meter
+    POST /predict                {"queries": [{"meter_id", "initial_capacity", "target_day"}, ...]}
+    GET  /stats                  jumlah permintaan dan latensi p50/p99 (ms)
+
+Jalankan:
+    python forecast_service.py --port 8080 --meter rumah=data/electricity_usage.csv
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import time
+from collections import deque
+import numpy as np
+from model_cache import load_model
+from forecast_result import forecast_batch
+from tariff import TARIFF_RATE
+
+MAX_BODY_BYTES = 16 * 1024 * 1024
+# Endpoint yang dikenal; latensi hanya dicatat untuk jalur ini
+ROUTES = ('/health', '/meters', '/predict', '/stats')
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+            413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+class HTTPError(Exception):
+    """Kesalahan yang dikembalikan ke klien sebagai respons JSON."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class LatencyRecorder:
+    """Menyimpan latensi permintaan terakhir untuk menghitung persentil."""
+
+    def __init__(self, window=10000):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+
+    def record(self, seconds):
+        self.samples.append(seconds)
+        self.count += 1
+
+    def summary(self):
+        if not self.samples:
+            return {'count': self.count, 'p50_ms': None, 'p99_ms': None}
+        p50, p99 = np.percentile(np.fromiter(self.samples, dtype=np.float64), [50, 99]) * 1000
+        return {'count': self.count, 'p50_ms': round(float(p50), 3), 'p99_ms': round(float(p99), 3)}
+
+
+class ForecastService:
+    """
+    Kumpulan model meter yang dilatih sekali dan dipakai untuk menjawab
+    permintaan prediksi secara batch. Pemuatan CSV berjalan di executor
+    agar event loop tidak terblokir.
+    """
+
+    def __init__(self, tariff_rate=TARIFF_RATE, executor=None):
+        self.tariff_rate = tariff_rate
+        self.executor = executor
+        self.models = {}
+        self.sources = {}
+        self.latency = {}
+
+    async def register(self, meter_id, csv_path):
+        """Memuat (atau memuat ulang) model meter dari CSV di executor."""
+        loop = asyncio.get_running_loop()
+        model = await loop.run_in_executor(self.executor, load_model, csv_path)
+        self.models[meter_id] = model
+        self.sources[meter_id] = os.path.abspath(csv_path)
+        return self.describe(meter_id)
+
+    def describe(self, meter_id):
+        model = self.models[meter_id]
+        return {'meter_id': meter_id, 'csv_path': self.sources[meter_id],
+                'n_samples': model.n_samples_, 'slope': model.slope_, 'intercept': model.intercept_}
+
+    def predict(self, queries):
+        """
+        Menjawab banyak query sekaligus. Perhitungan biaya dilakukan tervektorisasi
+        untuk seluruh batch. Nilai yang tidak berhingga (mis. overflow untuk hari
+        target yang sangat besar) dikembalikan sebagai null.
+        """
+        if not isinstance(queries, list) or not queries:
+            raise HTTPError(400, "'queries' harus berupa daftar yang tidak kosong.")
+        meter_ids = []
+        capacities = np.empty(len(queries), dtype=np.float64)
+        target_days = np.empty(len(queries), dtype=np.float64)
+        for i, query in enumerate(queries):
+            meter_id, capacities[i], target_days[i] = _validate_query(i, query)
+            meter_ids.append(meter_id)
+
+        unknown = sorted(set(meter_ids) - self.models.keys())
+        if unknown:
+            raise HTTPError(404, f"Meter belum terdaftar: {', '.join(map(str, unknown))}")
+
+        slopes = np.array([self.models[m].slope_ for m in meter_ids])
+        intercepts = np.array([self.models[m].intercept_ for m in meter_ids])
+        batch = forecast_batch(slopes, intercepts, target_days, capacities, self.tariff_rate)
+
+        # Satu konversi .tolist() untuk seluruh batch, bukan akses elemen NumPy per nilai
+        results = []
+        for meter_id, capacity, row in zip(meter_ids, capacities.tolist(), batch.tolist()):
+            (_, _, target_day, predicted_kwh, day_at_zero_exact, daily_usage_rate,
+             remaining_kwh, total_usage, estimated_cost, day_at_zero_rounded) = row
+            results.append({
+                'meter_id': meter_id,
+                'initial_capacity': capacity,
+                'target_day': int(target_day),
+                'daily_usage_rate': _finite_or_none(daily_usage_rate),
+                'predicted_kWh': _finite_or_none(predicted_kwh),
+                'day_at_zero_exact': _finite_or_none(day_at_zero_exact),
+                'remaining_kWh': _finite_or_none(remaining_kwh),
+                'total_usage': _finite_or_none(total_usage),
+                'estimated_cost': _finite_or_none(estimated_cost),
+                'day_at_zero_rounded': None if math.isnan(day_at_zero_rounded) else int(day_at_zero_rounded),
+            })
+        return results
+
+    def stats(self):
+        return {'meters': len(self.models),
+                'endpoints': {name: rec.summary() for name, rec in self.latency.items()}}
+
+    # --- Routing HTTP ---
+    async def dispatch(self, method, path, body):
+        if path == '/health' and method == 'GET':
+            return {'status': 'ok'}
+        if path == '/meters' and method == 'GET':
+            return {'meters': [self.describe(m) for m in sorted(self.models)]}
+        if path == '/meters' and method == 'POST':
+            payload = _parse_json(body)
+            try:
+                meter_id, csv_path = str(payload['meter_id']), payload['csv_path']
+            except KeyError as e:
+                raise HTTPError(400, f"Field wajib tidak ada: {e}")
+            if not isinstance(csv_path, str):
+                raise HTTPError(400, "'csv_path' harus berupa string.")
+            try:
+                return await self.register(meter_id, csv_path)
+            except FileNotFoundError:
+                raise HTTPError(404, f"File '{csv_path}' tidak ditemukan.")
+            except OSError as e:
+                raise HTTPError(400, f"File '{csv_path}' tidak dapat dibaca: {e.strerror or e}")
+            except ValueError as e:
+                raise HTTPError(400, str(e))
+        if path == '/predict' and method == 'POST':
+            payload = _parse_json(body)
+            return {'results': self.predict(payload.get('queries'))}
+        if path == '/stats' and method == 'GET':
+            return self.stats()
+        if path in ROUTES:
+            raise HTTPError(405, f"Metode {method} tidak didukung untuk {path}.")
+        raise HTTPError(404, f"Endpoint {path} tidak ditemukan.")
+
+    async def handle_connection(self, reader, writer):
+        """Melayani satu koneksi (mendukung keep-alive HTTP/1.1)."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                start = time.perf_counter()
+                path = target.split('?', 1)[0]
+                keep_alive = (version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close')
+                try:
+                    try:
+                        length = _content_length(headers)
+                        if length > MAX_BODY_BYTES:
+                            raise HTTPError(413, "Isi permintaan terlalu besar.")
+                    except HTTPError:
+                        # Isi permintaan tidak dibaca: koneksi tidak dapat dipakai lagi
+                        keep_alive = False
+                        raise
+                    body = await reader.readexactly(length) if length else b''
+                    status, payload = 200, await self.dispatch(method, path, body)
+                except HTTPError as e:
+                    status, payload = e.status, {'error': str(e)}
+                except Exception as e:
+                    status, payload = 500, {'error': f"Terjadi kesalahan: {e}"}
+
+                _write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if path in ROUTES:
+                    self.latency.setdefault(path, LatencyRecorder()).record(time.perf_counter() - start)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=8080):
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        async with server:
+            await server.serve_forever()
+
+
+def _finite_or_none(value):
+    return float(value) if math.isfinite(value) else None
+
+
+def _validate_query(index, query):
+    """
+    Memeriksa satu query prediksi: 'meter_id' berupa string, 'initial_capacity'
+    angka berhingga dan 'target_day' bilangan bulat. Mengembalikan
+    (meter_id, initial_capacity, target_day).
+    """
+    if not isinstance(query, dict):
+        raise HTTPError(400, f"Query ke-{index} harus berupa objek JSON.")
+    try:
+        meter_id, capacity, target_day = query['meter_id'], query['initial_capacity'], query['target_day']
+    except KeyError as e:
+        raise HTTPError(400, f"Query ke-{index}: field wajib tidak ada: {e}")
+    if not isinstance(meter_id, str):
+        raise HTTPError(400, f"Query ke-{index}: 'meter_id' harus berupa string.")
+    for name, value in (('initial_capacity', capacity), ('target_day', target_day)):
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+            raise HTTPError(400, f"Query ke-{index}: '{name}' harus berupa angka berhingga.")
+    if target_day != int(target_day):
+        raise HTTPError(400, f"Query ke-{index}: 'target_day' harus berupa bilangan bulat.")
+    return meter_id, capacity, target_day
+
+
+def _content_length(headers):
+    value = headers.get('content-length', '0')
+    try:
+        length = int(value)
+    except ValueError:
+        raise HTTPError(400, f"Content-Length tidak valid: {value!r}")
+    if length < 0:
+        raise HTTPError(400, f"Content-Length tidak valid: {value!r}")
+    return length
+
+
+def _parse_json(body):
+    try:
+        payload = json.loads(body or b'{}')
+    except json.JSONDecodeError as e:
+        raise HTTPError(400, f"JSON tidak valid: {e}")
+    if not isinstance(payload, dict):
+        raise HTTPError(400, "Isi permintaan harus berupa objek JSON.")
+    return payload
+
+
+def _write_response(writer, status, payload, keep_alive):
+    body = json.dumps(payload).encode('utf-8')
+    head = (f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    writer.write(head.encode('latin-1') + body)
+
+
+async def _run(args):
+    service = ForecastService(tariff_rate=args.tariff)
+    for spec in args.meter:
+        meter_id, _, csv_path = spec.partition('=')
+        await service.register(meter_id, csv_path)
+        print(f"Meter '{meter_id}' dimuat dari {csv_path}")
+    print(f"Layanan berjalan di http://{args.host}:{args.port}")
+    await service.serve(args.host, args.port)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Layanan HTTP lokal untuk prediksi pemakaian listrik.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--tariff', type=float, default=TARIFF_RATE)
+    parser.add_argument('--meter', action='append', default=[], metavar='ID=CSV',
+                        help="Daftarkan meter saat mulai (boleh diulang)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(_run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -1,56 +1,75 @@
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-from sklearn.linear_model import LinearRegression
+# Pustaka berat (pandas, matplotlib) diimpor di dalam fungsi yang membutuhkannya
+# agar mode non-interaktif dapat dimulai dengan cepat.
+from model_cache import ModelCache, load_model
+from regression_engine import StreamingLinearRegression
+from tariff import TARIFF_RATE, calculate_cost_and_usage_batch
+from forecast_result import ForecastResult
+import pipeline_profiler
+from pipeline_profiler import stage
 import math
+import sys
+import csv
+import json
+import argparse
 
-# Tarif listrik PLN R1/1300VA per kWh
-TARIFF_RATE = 1444.70
+# Cache data CSV dan model terlatih (LRU)
+MODEL_CACHE = ModelCache(maxsize=32)
 
-def get_regression_model_and_predictions(csv_file_path, day_to_predict):
+def get_regression_model_and_predictions(csv_file_path, day_to_predict, chunksize=None,
+                                         window=None, halflife=None, topup_aware=False, robust=None,
+                                         min_jump=None):
     """
     Memuat data dari CSV, melatih model regresi, dan melakukan prediksi.
     Gradien garis ditentukan HANYA dari data historis.
+
+    Jika `chunksize` diberikan, CSV dibaca per potongan dengan memori konstan
+    (untuk log yang sangat besar) dan df_csv yang dikembalikan bernilai None.
+    Jika `window` atau `halflife` (hari) diberikan, gradien hanya mencerminkan
+    pemakaian terkini (jendela geser atau bobot eksponensial). Jika `topup_aware`,
+    lompatan akibat pengisian ulang (top-up, kenaikan lebih dari `min_jump` kWh;
+    default dari derau data) tidak mempengaruhi gradien. Jika `robust`
+    ('huber' atau 'theil-sen'), pembacaan yang salah tidak menarik gradien.
     """
     try:
-        df_csv = pd.read_csv(csv_file_path)
-        if 'usage_per_day' in df_csv.columns:
-            df_csv = df_csv.drop(columns=['usage_per_day'])
-        df_csv = df_csv.dropna()
-
-        if df_csv.empty:
-            raise ValueError("File CSV tidak memiliki data yang valid untuk analisis.")
-
-        # Siapkan data untuk model regresi (hanya dari CSV)
-        X = df_csv[['day']]
-        y = df_csv['electricity_kWh_left']
+        if window is not None or halflife is not None or topup_aware or robust is not None:
+            # Mode khusus: dilatih sekali dari data di cache, lalu disimpan per mode
+            df_csv, model = MODEL_CACHE.get_model(csv_file_path, window=window, halflife=halflife,
+                                                  topup_aware=topup_aware, robust=robust,
+                                                  min_jump=min_jump)
+        elif chunksize is not None:
+            # Mode streaming: model dilatih per potongan tanpa menyimpan data
+            from usage_loader import fit_usage_csv
+            df_csv, model = None, fit_usage_csv(csv_file_path, chunksize=chunksize)
+        else:
+            # Data dan model diambil dari cache (dimuat ulang hanya jika file berubah)
+            df_csv, model = MODEL_CACHE.get(csv_file_path)
 
-        # Buat dan latih model regresi linear
-        model = LinearRegression()
-        model.fit(X, y)
+        # Prediksi sisa kWh, pemakaian harian dan hari habis (kWh = 0) dari float biasa
+        with stage('predict', rows=1):
+            result = ForecastResult.from_model(model, day_to_predict)
+        predicted_y = result.predicted_kWh
+        daily_usage_rate = result.daily_usage_rate
+        day_at_zero_exact = result.day_at_zero_exact
 
-        # Prediksi sisa kWh untuk hari target
-        predicted_X = pd.DataFrame([day_to_predict], columns=['day'])
-        predicted_y = model.predict(predicted_X)[0]
-
-        # Hitung pemakaian harian (slope dari model)
-        daily_usage_rate = -model.coef_[0]
-
-        # Hitung hari saat listrik habis (kWh = 0)
-        day_at_zero_exact = None
-        if model.coef_[0] != 0:
-            day_at_zero_exact = (0 - model.intercept_) / model.coef_[0]
-        
         return model, df_csv, predicted_y, daily_usage_rate, day_at_zero_exact
 
     except FileNotFoundError:
-        print(f"\n[ERROR] File '{csv_file_path}' tidak ditemukan.")
+        print(f"\n[ERROR] File '{csv_file_path}' tidak ditemukan.", file=sys.stderr)
         raise
     except Exception as e:
-        print(f"\n[ERROR] Terjadi kesalahan: {e}")
+        print(f"\n[ERROR] Terjadi kesalahan: {e}", file=sys.stderr)
         raise
 
-def calculate_cost_and_usage(initial_capacity, target_day, daily_usage_rate):
+def forecast_csv(csv_file_path, target_day, initial_capacity, tariff_rate=TARIFF_RATE):
+    """
+    Prediksi ringkas satu meter sebagai `ForecastResult` (slope, intercept, sisa kWh,
+    hari habis, biaya) tanpa mengembalikan DataFrame data historis.
+    """
+    _, model = MODEL_CACHE.get(csv_file_path)
+    with stage('predict', rows=1):
+        return ForecastResult.from_model(model, target_day, initial_capacity, tariff_rate)
+
+def calculate_cost_and_usage(initial_capacity, target_day, daily_usage_rate, tariff_rate=TARIFF_RATE):
     """
     Menghitung total pemakaian listrik, sisa kWh, dan estimasi biaya.
     """
@@ -61,7 +80,7 @@ def calculate_cost_and_usage(initial_capacity, target_day, daily_usage_rate):
     total_usage = daily_usage_rate * target_day
     total_usage = max(0, total_usage)
     
-    estimated_cost = total_usage * TARIFF_RATE
+    estimated_cost = total_usage * tariff_rate
 
     # Perhitungan hari habis dari input pengguna
     day_at_zero_from_user_input = initial_capacity / daily_usage_rate
@@ -69,74 +88,51 @@ def calculate_cost_and_usage(initial_capacity, target_day, daily_usage_rate):
     
     return remaining_kwh_from_user_input, total_usage, estimated_cost, day_at_zero_rounded
 
-def create_visual_graph(initial_capacity, target_day, csv_file_path):
+def create_visual_graph(initial_capacity, target_day, csv_file_path, output_path=None,
+                        window=None, halflife=None, topup_aware=False, robust=None, min_jump=None):
     """
     Membuat dan menampilkan grafik regresi linear di jendela Matplotlib terpisah.
+    Jika `output_path` diberikan, grafik dirender tanpa layar (Agg) dan disimpan ke file.
+    Kesalahan diteruskan ke pemanggil.
     """
-    try:
-        # Dapatkan model dan prediksi dari fungsi utama
-        model, df_full, predicted_y_historical, daily_usage_rate, day_at_zero_exact_historical = \
-            get_regression_model_and_predictions(csv_file_path, target_day)
-        
-        # --- PERHITUNGAN UNTUK GARIS ESTIMASI DARI INPUT PENGGUNA ---
-        slope_from_historical_model = model.coef_[0]
-        c_new = initial_capacity - slope_from_historical_model * 1
-        predicted_y_from_user_line = slope_from_historical_model * target_day + c_new
-        day_at_zero_exact_user_line = -c_new / slope_from_historical_model
-        
-        # --- Visualisasi dengan Matplotlib ---
-        fig, ax = plt.subplots(figsize=(12, 8))
+    # Matplotlib hanya dimuat saat grafik benar-benar dibuat
+    from report_renderer import draw_forecast_chart
 
-        # Plot data asli dari CSV
-        ax.scatter(df_full['day'], df_full['electricity_kWh_left'], s=100, color='blue', label='Data Asli (Historis)')
-        
-        # Plot titik awal dari input pengguna
-        ax.scatter([1], [initial_capacity], s=150, color='orange', zorder=5, label='Input Kapasitas Awal (Hari ke-1)')
-        ax.annotate(f'{initial_capacity:.2f} kWh', (1, initial_capacity),
-                     textcoords="offset points", xytext=(0, 10), ha='center',
-                     bbox=dict(boxstyle="round,pad=0.3", fc='orange', alpha=0.5))
-
-        # Garis Regresi Historis (untuk referensi)
-        max_x_plot_historical = df_full['day'].max() + 5
-        line_x_historical = np.linspace(df_full['day'].min(), max_x_plot_historical, 100)
-        line_y_historical = model.predict(pd.DataFrame(line_x_historical, columns=['day']))
-        ax.plot(line_x_historical, line_y_historical, color='gray', linestyle=':', alpha=0.5, label='Garis Regresi Historis')
-
-        # Garis Estimasi (dari Input Pengguna)
-        max_x_user_line = max(target_day, day_at_zero_exact_user_line) * 1.05 if day_at_zero_exact_user_line is not None else target_day + 5
-        x_vals_user_line = np.linspace(1, max_x_user_line, 100)
-        y_vals_user_line = slope_from_historical_model * x_vals_user_line + c_new
-        ax.plot(x_vals_user_line, y_vals_user_line, color='red', linestyle='--', label='Garis Estimasi (dari Input)')
-
-        # Titik prediksi pada Hari target (dari garis estimasi baru)
-        ax.scatter(target_day, predicted_y_from_user_line, s=150, color='green', zorder=5, label=f'Prediksi Hari ke-{target_day}')
-        ax.annotate(f'{predicted_y_from_user_line:.2f} kWh', (target_day, predicted_y_from_user_line),
-                     textcoords="offset points", xytext=(-15, -20), ha='center',
-                     bbox=dict(boxstyle="round,pad=0.3", fc='yellow', alpha=0.5))
-
-        # Titik saat listrik habis (dari garis estimasi baru)
-        if day_at_zero_exact_user_line is not None and day_at_zero_exact_user_line >= 0:
-            ax.scatter(day_at_zero_exact_user_line, 0, s=150, color='purple', zorder=5, label=f'Hari ke-{math.floor(day_at_zero_exact_user_line)} (0 kWh)')
-            ax.annotate(f'Mencapai 0 kWh: Hari ke-{math.floor(day_at_zero_exact_user_line)}', (day_at_zero_exact_user_line, 0),
-                         textcoords="offset points", xytext=(0, 10), ha='center',
-                         bbox=dict(boxstyle="round,pad=0.3", fc='cyan', alpha=0.5))
-        
-        ax.set_title('Prediksi Kapasitas Listrik dengan Regresi Linear')
-        ax.set_xlabel('Hari ke-')
-        ax.set_ylabel('Kapasitas Listrik (kWh)')
-        ax.legend()
-        ax.grid(True)
-        ax.axhline(0, color='black', linewidth=0.5, linestyle='-')
+    # Dapatkan model dan prediksi dari fungsi utama
+    model, df_full, predicted_y_historical, daily_usage_rate, day_at_zero_exact_historical = \
+        get_regression_model_and_predictions(csv_file_path, target_day, window=window, halflife=halflife,
+                                             topup_aware=topup_aware, robust=robust, min_jump=min_jump)
+
+    # --- Visualisasi dengan Matplotlib ---
+    with stage('figure_setup'):
+        if output_path is not None:
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            fig = Figure(figsize=(12, 8))
+            FigureCanvasAgg(fig)
+            ax = fig.add_subplot()
+        else:
+            import matplotlib.pyplot as plt
+            fig, ax = plt.subplots(figsize=(12, 8))
+
+    with stage('draw_chart', rows=len(df_full)):
+        draw_forecast_chart(ax, initial_capacity, target_day, model, df_full)
         fig.tight_layout()
+
+    if output_path is not None:
+        with stage('savefig'):
+            fig.savefig(output_path)
+    else:
         plt.show()
 
-    except Exception as e:
-        print(f"[ERROR] Tidak dapat membuat grafik: {e}")
 
+# Kolom keluaran mode non-interaktif (JSON-lines/CSV)
+RESULT_FIELDS = ['initial_capacity', 'target_day', 'daily_usage_rate', 'remaining_kWh',
+                 'total_usage', 'estimated_cost', 'day_at_zero_rounded']
 
-def main():
+def interactive_main():
     """
-    Fungsi utama untuk menjalankan program dalam mode CLI.
+    Fungsi utama untuk menjalankan program dalam mode CLI interaktif.
     """
     print("\n=============================================")
     print("ANALISIS DAN PREDIKSI PEMAKAIAN LISTRIK (CLI)")
@@ -148,30 +144,233 @@ def main():
         target_day = int(input("Masukkan Hari Prediksi: "))
         csv_file_path = input("Masukkan jalur file data historis (cth: data/electricity_usage.csv): ")
 
-        # Lakukan analisis regresi
-        model, df_full, predicted_y_historical, daily_usage_rate, day_at_zero_exact_historical = \
-            get_regression_model_and_predictions(csv_file_path, target_day)
-
-        # Lakukan perhitungan biaya dan sisa listrik
-        remaining_kwh, total_usage, estimated_cost, day_at_zero_rounded = \
-            calculate_cost_and_usage(initial_capacity, target_day, daily_usage_rate)
+        # Lakukan analisis regresi serta perhitungan biaya dan sisa listrik
+        result = forecast_csv(csv_file_path, target_day, initial_capacity)
 
         # Tampilkan hasil
         print("\n--- HASIL ANALISIS ---")
-        print(f"Pemakaian Listrik per Hari (estimasi): {daily_usage_rate:.2f} kWh")
-        print(f"Sisa Listrik pada Hari ke-{target_day}: {remaining_kwh:.2f} kWh")
-        print(f"Estimasi Biaya ({target_day} hari): Rp {estimated_cost:,.2f}")
-        print(f"Listrik diprediksi habis pada hari ke-{day_at_zero_rounded}")
+        print(f"Pemakaian Listrik per Hari (estimasi): {result.daily_usage_rate:.2f} kWh")
+        print(f"Sisa Listrik pada Hari ke-{target_day}: {result.remaining_kWh:.2f} kWh")
+        print(f"Estimasi Biaya ({target_day} hari): Rp {result.estimated_cost:,.2f}")
+        print(f"Listrik diprediksi habis pada hari ke-{result.day_at_zero_rounded}")
         
         # Opsi untuk menampilkan grafik
         show_graph = input("\nApakah Anda ingin melihat grafik prediksi? (y/n): ")
         if show_graph.lower() == 'y':
-            create_visual_graph(initial_capacity, target_day, csv_file_path)
+            try:
+                create_visual_graph(initial_capacity, target_day, csv_file_path)
+            except Exception as e:
+                print(f"[ERROR] Tidak dapat membuat grafik: {e}")
 
     except ValueError:
         print("\n[ERROR] Masukan tidak valid. Pastikan Anda memasukkan angka yang benar.")
     except Exception as e:
         print(f"\n[ERROR] Terjadi kesalahan: {e}")
 
+def build_arg_parser():
+    """Parser argumen untuk mode non-interaktif."""
+    parser = argparse.ArgumentParser(
+        description="Analisis dan prediksi pemakaian listrik (mode non-interaktif). "
+                    "Tanpa argumen, program berjalan dalam mode interaktif.")
+    parser.add_argument('--csv', required=True, help="Jalur file data historis (CSV)")
+    parser.add_argument('--capacity', type=float, help="Kapasitas listrik hari ke-1 (kWh)")
+    parser.add_argument('--target-day', type=int, help="Hari prediksi")
+    parser.add_argument('--tariff', type=float, default=TARIFF_RATE, help="Tarif per kWh (default: R1/1300VA)")
+    parser.add_argument('--format', choices=['text', 'json', 'csv'], default='text', help="Format keluaran")
+    parser.add_argument('--queries', metavar='FILE',
+                        help="Baca banyak pasangan 'kapasitas,hari' dari FILE ('-' untuk stdin)")
+    parser.add_argument('--chunksize', type=int, default=None,
+                        help="Latih model dari CSV per potongan (memori konstan)")
+    recent = parser.add_mutually_exclusive_group()
+    recent.add_argument('--window', type=float, default=None,
+                        help="Hitung pemakaian dari N hari terakhir saja")
+    recent.add_argument('--halflife', type=float, default=None,
+                        help="Bobot eksponensial dengan waktu paruh (hari)")
+    recent.add_argument('--topup-aware', action='store_true',
+                        help="Abaikan lompatan kWh akibat pengisian ulang (top-up)")
+    recent.add_argument('--robust', choices=['huber', 'theil-sen'], default=None,
+                        help="Regresi robust yang tahan terhadap pembacaan salah")
+    parser.add_argument('--min-jump', type=float, default=None, metavar='KWH',
+                        help="Kenaikan kWh minimum yang dianggap top-up (default: dari derau data)")
+    parser.add_argument('--confidence', type=float, default=None, metavar='LEVEL',
+                        help="Tambahkan interval prediksi analitik, mis. 0.95 (hanya query tunggal)")
+    parser.add_argument('--profile', action='store_true',
+                        help="Cetak waktu, jumlah baris dan alokasi per tahap ke stderr")
+    parser.add_argument('--profile-dir', metavar='DIR',
+                        help="Simpan juga profil cProfile dan snapshot tracemalloc per tahap")
+    parser.add_argument('--graph', metavar='PATH', help="Simpan grafik ke file (PNG/SVG) tanpa layar")
+    return parser
+
+def iter_query_batches(stream, batch_size=65536):
+    """
+    Membaca baris 'kapasitas,hari' (atau dipisah spasi) dari stream per batch.
+    Baris kosong, komentar '#' dan header dilewati; baris tidak valid dilaporkan ke stderr.
+    """
+    capacities, days = [], []
+    for line_number, line in enumerate(stream, start=1):
+        fields = line.replace(',', ' ').split()
+        if not fields or fields[0].startswith('#'):
+            continue
+        try:
+            capacity, target_day = float(fields[0]), int(fields[1])
+        except (ValueError, IndexError):
+            if line_number > 1:
+                print(f"[ERROR] Baris {line_number} tidak valid: {line.strip()}", file=sys.stderr)
+            continue
+        capacities.append(capacity)
+        days.append(target_day)
+        if len(capacities) == batch_size:
+            yield capacities, days
+            capacities, days = [], []
+    if capacities:
+        yield capacities, days
+
+def write_results(out, output_format, capacities, days, daily_usage_rate, tariff_rate, header=False,
+                  extra=None):
+    """
+    Menghitung hasil untuk satu batch query secara tervektorisasi lalu menuliskannya.
+    `extra` (opsional) berisi kolom tambahan yang sama untuk setiap baris, mis. interval prediksi.
+    """
+    extra = extra or {}
+    remaining_kwh, total_usage, estimated_cost, day_at_zero_rounded = \
+        calculate_cost_and_usage_batch(capacities, days, daily_usage_rate, tariff_rate)
+
+    rows = zip(capacities, days, remaining_kwh.tolist(), total_usage.tolist(),
+               estimated_cost.tolist(), day_at_zero_rounded.tolist())
+    if output_format == 'json':
+        for capacity, target_day, remaining, usage, cost, zero_day in rows:
+            record = dict(zip(RESULT_FIELDS, (
+                capacity, target_day, daily_usage_rate, remaining, usage, cost,
+                None if math.isnan(zero_day) else int(zero_day))))
+            record.update(extra)
+            out.write(json.dumps(record) + "\n")
+    elif output_format == 'csv':
+        writer = csv.writer(out, lineterminator="\n")
+        if header:
+            writer.writerow(RESULT_FIELDS + list(extra))
+        writer.writerows(
+            (capacity, target_day, daily_usage_rate, remaining, usage, cost,
+             '' if math.isnan(zero_day) else int(zero_day), *extra.values())
+            for capacity, target_day, remaining, usage, cost, zero_day in rows)
+    else:
+        for capacity, target_day, remaining, usage, cost, zero_day in rows:
+            zero_text = '-' if math.isnan(zero_day) else int(zero_day)
+            out.write(f"Kapasitas {capacity:.2f} kWh, Hari ke-{target_day}: sisa {remaining:.2f} kWh, "
+                      f"biaya Rp {cost:,.2f}, habis pada hari ke-{zero_text}\n")
+            for name, value in extra.items():
+                out.write(f"  {name}: {'-' if value is None else format(value, '.2f')}\n")
+
+def interval_fields(model, initial_capacity, target_day, confidence):
+    """
+    Batas bawah/atas interval prediksi sebagai kolom tambahan hasil.
+    Batas yang tidak berhingga (NaN/inf) bernilai None: null di JSON, kosong di CSV.
+    """
+    if not 0 < confidence < 1:
+        raise ValueError("--confidence harus di antara 0 dan 1.")
+    if not isinstance(model, StreamingLinearRegression):
+        raise ValueError("--confidence tidak didukung untuk --window/--halflife/--topup-aware/--robust.")
+    from prediction_intervals import analytic_intervals
+
+    intervals = analytic_intervals(model, target_day, initial_capacity, confidence)
+    fields = {}
+    for name in ('remaining_kWh', 'day_at_zero_rounded'):
+        low, high = intervals[name]
+        fields[f"{name}_low"] = low if math.isfinite(low) else None
+        fields[f"{name}_high"] = high if math.isfinite(high) else None
+    return fields
+
+def run_non_interactive(args, stdin=sys.stdin, out=sys.stdout):
+    """
+    Menjalankan prediksi berdasarkan argumen. Model dilatih sekali, lalu semua
+    query dijawab dari hasil pelatihan yang sama.
+    """
+    if args.queries is None and (args.capacity is None or args.target_day is None):
+        raise ValueError("--capacity dan --target-day wajib diisi jika --queries tidak dipakai.")
+    if args.queries is not None and args.confidence is not None:
+        raise ValueError("--confidence hanya untuk query tunggal (tanpa --queries).")
+
+    # Hanya koefisien yang dibutuhkan: model dilatih tanpa DataFrame
+    special_mode = (args.window is not None or args.halflife is not None or args.topup_aware
+                    or args.robust is not None)
+    if args.chunksize is not None and not special_mode:
+        from usage_loader import fit_usage_csv
+        model = fit_usage_csv(args.csv, chunksize=args.chunksize)
+    elif args.graph and args.queries is None:
+        # Grafik membutuhkan DataFrame: model diambil dari cache yang sama dengan grafik
+        _, model = MODEL_CACHE.get_model(args.csv, window=args.window, halflife=args.halflife,
+                                         topup_aware=args.topup_aware, robust=args.robust,
+                                         min_jump=args.min_jump)
+    else:
+        model = load_model(args.csv, window=args.window, halflife=args.halflife,
+                           topup_aware=args.topup_aware, robust=args.robust, min_jump=args.min_jump)
+    daily_usage_rate = -float(model.coef_[0])
+
+    if args.queries is None:
+        extra = None
+        if args.confidence is not None:
+            extra = interval_fields(model, args.capacity, args.target_day, args.confidence)
+        with stage('write_results', rows=1):
+            write_results(out, args.format, [args.capacity], [args.target_day],
+                          daily_usage_rate, args.tariff, header=True, extra=extra)
+        if args.graph:
+            try:
+                create_visual_graph(args.capacity, args.target_day, args.csv, output_path=args.graph,
+                                    window=args.window, halflife=args.halflife,
+                                    topup_aware=args.topup_aware, robust=args.robust,
+                                    min_jump=args.min_jump)
+            except Exception as e:
+                raise ValueError(f"Tidak dapat membuat grafik: {e}") from e
+        return
+
+    stream = stdin if args.queries == '-' else open(args.queries)
+    try:
+        header = True
+        for capacities, days in iter_query_batches(stream):
+            with stage('write_results', rows=len(capacities)):
+                write_results(out, args.format, capacities, days, daily_usage_rate, args.tariff, header=header)
+            header = False
+    finally:
+        if stream is not stdin:
+            stream.close()
+
+def main(argv=None):
+    """
+    Titik masuk program: mode interaktif tanpa argumen, mode non-interaktif dengan argumen.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        if pipeline_profiler.enable_from_env():
+            try:
+                interactive_main()
+            finally:
+                pipeline_profiler.print_summary()
+        else:
+            interactive_main()
+        return 0
+
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+    if args.chunksize is not None and (args.window is not None or args.halflife is not None
+                                       or args.topup_aware or args.robust is not None):
+        parser.error("--chunksize tidak dapat digabung dengan --window/--halflife/--topup-aware/--robust.")
+    if args.min_jump is not None and not args.topup_aware:
+        parser.error("--min-jump hanya berlaku bersama --topup-aware.")
+    if args.graph is not None and args.queries is not None:
+        parser.error("--graph hanya untuk query tunggal (tanpa --queries).")
+    profiling = args.profile or args.profile_dir is not None
+    if profiling:
+        pipeline_profiler.enable(trace_memory=args.profile_dir is not None, dump_dir=args.profile_dir)
+    else:
+        profiling = pipeline_profiler.enable_from_env()
+    try:
+        run_non_interactive(args)
+    except (ValueError, OSError) as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        return 1
+    finally:
+        if profiling:
+            pipeline_profiler.print_summary()
+    return 0
+
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -1,201 +1,431 @@
 import tkinter as tk
-from tkinter import messagebox, filedialog
-import pandas as pd
+from tkinter import messagebox, filedialog, ttk
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from sklearn.linear_model import LinearRegression
+from functools import partial
+from model_cache import ModelCache, load_and_fit
+from forecast_result import ForecastResult
+from tariff import TARIFF_RATE
+import pipeline_profiler
+from pipeline_profiler import stage
 import math
 
-# Tarif listrik PLN R1/1300VA per kWh
-TARIFF_RATE = 1444.70
+# Cache data CSV dan model terlatih (LRU)
+MODEL_CACHE = ModelCache(maxsize=32)
+
+# Jumlah baris CSV per potongan saat dimuat di latar belakang; pembatalan
+# diperiksa setelah setiap potongan
+LOAD_CHUNKSIZE = 200_000
+
+# Pilihan metode regresi di GUI dan nilai `robust` yang sesuai
+REGRESSION_METHODS = {
+    "OLS (biasa)": None,
+    "Huber (robust)": 'huber',
+    "Theil-Sen (robust)": 'theil-sen',
+}
 
 # --- Fungsi Logika Inti ---
-def get_regression_model_and_predictions(csv_file_path, day_to_predict):
+def get_model(csv_file_path, robust=None, cancel_event=None):
+    """
+    Data dan model diambil dari cache (dimuat ulang hanya jika file berubah).
+    Model robust dilatih sekali dari data yang sudah ada di cache, lalu ikut disimpan.
+
+    Jika `cancel_event` diberikan, CSV dibaca per potongan dan pembatalan
+    diperiksa setelah setiap potongan serta sebelum pelatihan model robust.
+    """
+    loader = None
+    if cancel_event is not None:
+        loader = partial(load_and_fit, chunksize=LOAD_CHUNKSIZE,
+                         on_chunk=partial(check_cancelled, cancel_event))
+    before_fit = None if cancel_event is None else partial(check_cancelled, cancel_event)
+    return MODEL_CACHE.get_model(csv_file_path, robust=robust, loader=loader, before_fit=before_fit)
+
+def get_regression_model_and_predictions(csv_file_path, day_to_predict, robust=None, cancel_event=None):
     """
     Memuat data dari CSV, melatih model regresi, dan melakukan prediksi.
     Gradien garis ditentukan HANYA dari data historis.
+
+    Fungsi ini dijalankan di thread pekerja, sehingga tidak menampilkan dialog;
+    kesalahan diteruskan ke pemanggil dan ditampilkan di thread utama Tk.
     """
-    try:
-        df_csv = pd.read_csv(csv_file_path)
-        if 'usage_per_day' in df_csv.columns:
-            df_csv = df_csv.drop(columns=['usage_per_day'])
-        df_csv = df_csv.dropna()
-
-        if df_csv.empty:
-            raise ValueError("File CSV tidak memiliki data yang valid untuk analisis.")
-
-        # Siapkan data untuk model regresi (hanya dari CSV)
-        X = df_csv[['day']]
-        y = df_csv['electricity_kWh_left']
-
-        # Buat dan latih model regresi linear
-        model = LinearRegression()
-        model.fit(X, y)
-
-        # Prediksi sisa kWh untuk hari target
-        predicted_X = pd.DataFrame([day_to_predict], columns=['day'])
-        predicted_y = model.predict(predicted_X)[0]
-
-        # Hitung pemakaian harian (slope dari model)
-        daily_usage_rate = -model.coef_[0]
-
-        # Hitung hari saat listrik habis (kWh = 0)
-        day_at_zero_exact = None
-        if model.coef_[0] != 0:
-            day_at_zero_exact = (0 - model.intercept_) / model.coef_[0]
-        
-        return model, df_csv, predicted_y, daily_usage_rate, day_at_zero_exact
-
-    except FileNotFoundError:
-        messagebox.showerror("Error", f"File '{csv_file_path}' tidak ditemukan.")
-        raise
-    except Exception as e:
-        messagebox.showerror("Error", f"Terjadi kesalahan: {e}")
-        raise
+    df_csv, model = get_model(csv_file_path, robust, cancel_event)
+
+    # Prediksi sisa kWh, pemakaian harian dan hari habis (kWh = 0) dari float biasa
+    with stage('predict', rows=1):
+        result = ForecastResult.from_model(model, day_to_predict)
+    predicted_y = result.predicted_kWh
+    daily_usage_rate = result.daily_usage_rate
+    day_at_zero_exact = result.day_at_zero_exact
+
+    return model, df_csv, predicted_y, daily_usage_rate, day_at_zero_exact
+
+# --- Pekerja Latar Belakang ---
+class JobCancelled(Exception):
+    """Dilempar oleh pekerja saat tugas dibatalkan atau digantikan tugas baru."""
+
+# Satu pekerja saja: klik baru menggantikan tugas lama, bukan mengantre. Tugas lama
+# berhenti di titik pemeriksaan berikutnya (setelah satu potongan CSV atau satu tahap),
+# sehingga tugas baru hanya menunggu paling lama satu potongan
+executor = ThreadPoolExecutor(max_workers=1)
+current_job = {'id': 0, 'future': None, 'cancel_event': None}
+POLL_INTERVAL_MS = 50
+
+def check_cancelled(cancel_event):
+    """Titik pemeriksaan pembatalan di antara tahap dan potongan pemuatan CSV."""
+    if cancel_event.is_set():
+        raise JobCancelled()
+
+def submit_job(description, work, on_done):
+    """
+    Menjalankan `work(cancel_event)` di thread pekerja, lalu memanggil
+    `on_done(hasil)` di thread utama Tk melalui `root.after`.
+    Tugas yang sedang berjalan dibatalkan dan hasilnya dibuang.
+    """
+    cancel_current_job(update_status=False)
+
+    current_job['id'] += 1
+    job_id = current_job['id']
+    cancel_event = threading.Event()
+    future = executor.submit(work, cancel_event)
+    current_job['future'] = future
+    current_job['cancel_event'] = cancel_event
+
+    status_label.config(text=f"{description}...")
+    cancel_button.config(state=tk.NORMAL)
+    progress_bar.start(10)
+
+    def poll():
+        if job_id != current_job['id']:
+            return  # Sudah digantikan atau dibatalkan
+        if not future.done():
+            root.after(POLL_INTERVAL_MS, poll)
+            return
 
-def calculate_estimation_values():
+        finish_job()
+        try:
+            result = future.result()
+        except JobCancelled:
+            status_label.config(text="Dibatalkan.")
+            return
+        except FileNotFoundError as e:
+            status_label.config(text="Gagal.")
+            messagebox.showerror("Error", f"File '{e.filename}' tidak ditemukan.")
+            return
+        except Exception as e:
+            status_label.config(text="Gagal.")
+            messagebox.showerror("Error", f"Terjadi kesalahan: {e}")
+            return
+
+        status_label.config(text="Selesai.")
+        try:
+            on_done(result)
+        except Exception as e:
+            messagebox.showerror("Error", f"Terjadi kesalahan: {e}")
+
+    root.after(POLL_INTERVAL_MS, poll)
+
+def finish_job():
+    """Mengembalikan indikator progres ke keadaan diam."""
+    progress_bar.stop()
+    cancel_button.config(state=tk.DISABLED)
+    current_job['future'] = None
+    current_job['cancel_event'] = None
+
+def cancel_current_job(update_status=True):
+    """Membatalkan tugas yang sedang berjalan (jika ada)."""
+    future = current_job['future']
+    if future is None:
+        return
+    current_job['cancel_event'].set()
+    future.cancel()
+    current_job['id'] += 1
+    finish_job()
+    if update_status:
+        status_label.config(text="Dibatalkan.")
+
+def read_inputs():
     """
-    Mengambil input dari pengguna, melakukan perhitungan, dan menampilkan hasilnya di GUI.
+    Membaca dan memvalidasi input pengguna.
+    Mengembalikan (initial_capacity, target_day, csv_path, robust) atau None jika tidak valid.
     """
     try:
         initial_capacity = float(entry_initial_capacity.get())
         target_day = int(entry_target_day.get())
-        
-        if initial_capacity < 0 or target_day < 1:
-            messagebox.showerror("Input Invalid", "Kapasitas awal tidak boleh negatif dan hari prediksi harus lebih dari 0.")
-            return
-
-        csv_path = entry_csv_path.get()
-        
-        # Dapatkan model dan prediksi dari fungsi yang diperbaiki
-        model, df_full, predicted_y_historical, daily_usage_rate, day_at_zero_exact_historical = \
-            get_regression_model_and_predictions(csv_path, target_day)
-
-        # Hitung sisa listrik menggunakan input pengguna dan rata-rata pemakaian harian
-        # Kita menggunakan (target_day - 1) karena initial_capacity adalah untuk Hari ke-1, bukan Hari ke-0
-        remaining_kwh_from_user_input = initial_capacity - (daily_usage_rate * (target_day - 1))
-        
-        # Total pemakaian dihitung berdasarkan rata-rata harian (ini sudah benar)
-        total_usage = daily_usage_rate * target_day
-        total_usage = max(0, total_usage)
-        
-        estimated_cost = total_usage * TARIFF_RATE
-
-        # Perhitungan hari habis dari input pengguna
-        day_at_zero_from_user_input = initial_capacity / daily_usage_rate
-        day_at_zero_rounded = math.floor(day_at_zero_from_user_input)
-        
-        # Menampilkan hasil
-        usage_per_day_label.config(text=f"Pemakaian Listrik per Hari (estimasi): {daily_usage_rate:.2f} kWh")
-        result_label.config(text=f"Sisa Listrik pada Hari ke-{target_day}: {remaining_kwh_from_user_input:.2f} kWh")
-        cost_label.config(text=f"Estimasi Biaya ({target_day} hari): Rp {estimated_cost:,.2f}")
-        empty_label.config(text=f"Listrik diprediksi habis pada hari ke-{day_at_zero_rounded}")
-        
     except ValueError:
         messagebox.showerror("Input Invalid", "Mohon masukkan angka yang valid.")
-    except FileNotFoundError:
-        pass # Error ditangani oleh fungsi get_regression_model_and_predictions
-    except Exception as e:
-        messagebox.showerror("Error", f"Terjadi kesalahan: {e}")
+        return None
 
-def generate_graph():
+    if initial_capacity < 0 or target_day < 1:
+        messagebox.showerror("Input Invalid", "Kapasitas awal tidak boleh negatif dan hari prediksi harus lebih dari 0.")
+        return None
+
+    return initial_capacity, target_day, entry_csv_path.get(), REGRESSION_METHODS[method_var.get()]
+
+# --- Callback Tombol ---
+def calculate_estimation_values():
     """
-    Membuat dan menampilkan grafik regresi linear di jendela Matplotlib terpisah.
+    Mengambil input dari pengguna, melakukan perhitungan di latar belakang,
+    dan menampilkan hasilnya di GUI.
+    """
+    inputs = read_inputs()
+    if inputs is None:
+        return
+    initial_capacity, target_day, csv_path, robust = inputs
+
+    def work(cancel_event):
+        # Model diambil dari cache; DataFrame data historis tidak dibutuhkan di sini
+        _, model = get_model(csv_path, robust, cancel_event)
+        check_cancelled(cancel_event)
+
+        # Sisa listrik dihitung dari (target_day - 1) karena initial_capacity adalah untuk
+        # Hari ke-1, bukan Hari ke-0; biaya dari total pemakaian rata-rata harian
+        with stage('predict', rows=1):
+            return ForecastResult.from_model(model, target_day, initial_capacity, TARIFF_RATE)
+
+    def show_results(result):
+        usage_per_day_label.config(text=f"Pemakaian Listrik per Hari (estimasi): {result.daily_usage_rate:.2f} kWh")
+        result_label.config(text=f"Sisa Listrik pada Hari ke-{target_day}: {result.remaining_kWh:.2f} kWh")
+        cost_label.config(text=f"Estimasi Biaya ({target_day} hari): Rp {result.estimated_cost:,.2f}")
+        empty_label.config(text=f"Listrik diprediksi habis pada hari ke-{result.day_at_zero_rounded}")
+
+    submit_job("Menghitung estimasi", work, show_results)
+
+def prepare_graph_data(initial_capacity, target_day, csv_path, cancel_event, robust=None):
+    """
+    Menyiapkan semua data yang dibutuhkan grafik (dijalankan di thread pekerja).
     Ditambahkan garis estimasi sejajar yang melewati titik input pengguna.
     """
-    try:
-        initial_capacity = float(entry_initial_capacity.get())
-        target_day = int(entry_target_day.get())
-        csv_path = entry_csv_path.get()
+    # Dapatkan model dan prediksi dari fungsi yang diperbaiki
+    model, df_full, predicted_y, daily_usage_rate, day_at_zero_exact_historical = \
+        get_regression_model_and_predictions(csv_path, target_day, robust, cancel_event)
+    check_cancelled(cancel_event)
+
+    # --- PERHITUNGAN BARU UNTUK GARIS ESTIMASI DARI INPUT PENGGUNA ---
+    # Gradien diambil dari model historis
+    slope_from_historical_model = model.coef_[0]
+
+    # Hitung y-intercept baru agar garis melewati (1, initial_capacity)
+    # initial_capacity = slope_from_historical_model * 1 + c_new
+    c_new = initial_capacity - slope_from_historical_model * 1
+
+    # Prediksi y untuk target_day menggunakan garis estimasi baru ini
+    predicted_y_from_user_line = slope_from_historical_model * target_day + c_new
+
+    # Hitung hari saat listrik habis untuk garis estimasi baru ini
+    day_at_zero_exact_user_line = None
+    if slope_from_historical_model != 0:
+        day_at_zero_exact_user_line = -c_new / slope_from_historical_model
+    # --- AKHIR PERHITUNGAN BARU ---
+
+    # Buat rentang hari untuk garis regresi utama (dari data historis)
+    # Akan digambar di background, tidak langsung dari titik oranye
+    max_x_plot_historical = df_full['day'].max() + 5
+    if day_at_zero_exact_historical is not None and day_at_zero_exact_historical > max_x_plot_historical:
+        max_x_plot_historical = day_at_zero_exact_historical * 1.05
+    if target_day > max_x_plot_historical:
+        max_x_plot_historical = target_day * 1.05
+
+    # Garis Regresi Historis (digambar di background, tidak terpengaruh input_initial_capacity)
+    line_x_historical = np.linspace(df_full['day'].min(), max_x_plot_historical, 100)
+    line_y_historical = model.predict(line_x_historical)
+
+    # Rentang garis estimasi dari input pengguna
+    max_x_user_line = max(target_day, day_at_zero_exact_user_line) * 1.05 if day_at_zero_exact_user_line is not None else target_day + 5
+    x_vals_user_line = np.linspace(1, max_x_user_line, 100) # Mulai dari Hari ke-1
+    y_vals_user_line = slope_from_historical_model * x_vals_user_line + c_new
+
+    return {
+        'initial_capacity': initial_capacity,
+        'target_day': target_day,
+        'history_day': df_full['day'].to_numpy(),
+        'history_kwh': df_full['electricity_kWh_left'].to_numpy(),
+        'line_x_historical': line_x_historical,
+        'line_y_historical': line_y_historical,
+        'x_vals_user_line': x_vals_user_line,
+        'y_vals_user_line': y_vals_user_line,
+        'predicted_y_from_user_line': predicted_y_from_user_line,
+        'day_at_zero_exact_user_line': day_at_zero_exact_user_line,
+    }
+
+class EmbeddedForecastPlot:
+    """
+    Grafik prediksi yang tertanam di jendela utama dengan satu Figure persisten.
 
-        if initial_capacity < 0 or target_day < 1:
-            messagebox.showerror("Input Invalid", "Kapasitas awal tidak boleh negatif dan hari prediksi harus lebih dari 0.")
-            return
+    Artist dibuat sekali; setiap pembaruan hanya mengganti datanya (offset scatter,
+    `set_data` garis, posisi/teks anotasi). Jika batas sumbu dan legenda tidak
+    berubah, hanya artist dinamis yang digambar ulang dengan blitting.
+    """
 
-        # Dapatkan model dan prediksi dari fungsi yang diperbaiki
-        model, df_full, predicted_y, daily_usage_rate, day_at_zero_exact_historical = \
-            get_regression_model_and_predictions(csv_path, target_day)
-        
-        # --- PERHITUNGAN BARU UNTUK GARIS ESTIMASI DARI INPUT PENGGUNA ---
-        # Gradien diambil dari model historis
-        slope_from_historical_model = model.coef_[0]
-
-        # Hitung y-intercept baru agar garis melewati (1, initial_capacity)
-        # initial_capacity = slope_from_historical_model * 1 + c_new
-        c_new = initial_capacity - slope_from_historical_model * 1
-
-        # Prediksi y untuk target_day menggunakan garis estimasi baru ini
-        predicted_y_from_user_line = slope_from_historical_model * target_day + c_new
-
-        # Hitung hari saat listrik habis untuk garis estimasi baru ini
-        day_at_zero_exact_user_line = None
-        if slope_from_historical_model != 0:
-            day_at_zero_exact_user_line = -c_new / slope_from_historical_model
-        # --- AKHIR PERHITUNGAN BARU ---
-
-        # --- Visualisasi dengan Matplotlib ---
-        fig, ax = plt.subplots(figsize=(12, 8))
-
-        # Plot data asli dari CSV
-        ax.scatter(df_full['day'], df_full['electricity_kWh_left'], s=100, color='blue', label='Data Asli (Historis)')
-        
-        # Plot titik awal dari input pengguna
-        ax.scatter([1], [initial_capacity], s=150, color='orange', zorder=5, label='Input Kapasitas Awal (Hari ke-1)')
-        ax.annotate(f'{initial_capacity:.2f} kWh', (1, initial_capacity),
-                     textcoords="offset points", xytext=(0, 10), ha='center',
-                     bbox=dict(boxstyle="round,pad=0.3", fc='orange', alpha=0.5))
+    def __init__(self, master):
+        self.figure = Figure(figsize=(8, 5))
+        self.ax = self.figure.add_subplot()
+        self.canvas = FigureCanvasTkAgg(self.figure, master=master)
+        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.background = None
+        self.legend_labels = None
+        self.static_data = None
+
+        ax = self.ax
+        empty = np.empty((0, 2))
+
+        # Artist statis (bagian dari latar belakang yang di-cache)
+        self.history_points = ax.scatter(empty[:, 0], empty[:, 1], s=100, color='blue', label='Data Asli (Historis)')
+        self.history_line, = ax.plot([], [], color='gray', linestyle=':', alpha=0.5, label='Garis Regresi Historis')
+        ax.axhline(0, color='black', linewidth=0.5, linestyle='-')
+
+        # Artist dinamis (bergantung pada input pengguna, digambar ulang dengan blitting)
+        self.initial_point = ax.scatter(empty[:, 0], empty[:, 1], s=150, color='orange', zorder=5, label='Input Kapasitas Awal (Hari ke-1)')
+        self.initial_annotation = ax.annotate('', (1, 0), textcoords="offset points", xytext=(0, 10), ha='center',
+                                              bbox=dict(boxstyle="round,pad=0.3", fc='orange', alpha=0.5))
+        self.user_line, = ax.plot([], [], color='red', linestyle='--', label='Garis Estimasi (dari Input)')
+        self.target_point = ax.scatter(empty[:, 0], empty[:, 1], s=150, color='green', zorder=5, label='Prediksi Hari ke-')
+        self.target_annotation = ax.annotate('', (0, 0), textcoords="offset points", xytext=(-15, -20), ha='center',
+                                             bbox=dict(boxstyle="round,pad=0.3", fc='yellow', alpha=0.5))
+        self.zero_point = ax.scatter(empty[:, 0], empty[:, 1], s=150, color='purple', zorder=5, label='0 kWh')
+        self.zero_annotation = ax.annotate('', (0, 0), textcoords="offset points", xytext=(0, 10), ha='center',
+                                           bbox=dict(boxstyle="round,pad=0.3", fc='cyan', alpha=0.5))
+        self.dynamic_artists = [self.initial_point, self.initial_annotation, self.user_line,
+                                self.target_point, self.target_annotation,
+                                self.zero_point, self.zero_annotation]
+        for artist in self.dynamic_artists:
+            artist.set_animated(True)
+            artist.set_visible(False)
+
+        ax.set_title('Prediksi Kapasitas Listrik dengan Regresi Linear')
+        ax.set_xlabel('Hari ke-')
+        ax.set_ylabel('Kapasitas Listrik (kWh)')
+        ax.grid(True)
+        self.figure.tight_layout()
 
+        self.canvas.mpl_connect('draw_event', self._on_draw)
 
-        # Buat rentang hari untuk garis regresi utama (dari data historis)
-        # Akan digambar di background, tidak langsung dari titik oranye
-        max_x_plot_historical = df_full['day'].max() + 5
-        if day_at_zero_exact_historical is not None and day_at_zero_exact_historical > max_x_plot_historical:
-            max_x_plot_historical = day_at_zero_exact_historical * 1.05
-        if target_day > max_x_plot_historical:
-            max_x_plot_historical = target_day * 1.05
+    def _on_draw(self, event):
+        # Simpan latar belakang setiap kali kanvas digambar penuh (mis. saat resize)
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_dynamic_artists()
 
-        # Garis Regresi Historis (digambar di background, tidak terpengaruh input_initial_capacity)
-        line_x_historical = np.linspace(df_full['day'].min(), max_x_plot_historical, 100)
-        line_y_historical = model.predict(pd.DataFrame(line_x_historical, columns=['day']))
-        ax.plot(line_x_historical, line_y_historical, color='gray', linestyle=':', alpha=0.5, label='Garis Regresi Historis')
+    def _draw_dynamic_artists(self):
+        for artist in self.dynamic_artists:
+            self.figure.draw_artist(artist)
 
+    def update(self, data):
+        """Memperbarui data semua artist dan menggambar ulang secepat mungkin."""
+        initial_capacity = data['initial_capacity']
+        target_day = data['target_day']
+        predicted_y_from_user_line = data['predicted_y_from_user_line']
+        day_at_zero_exact_user_line = data['day_at_zero_exact_user_line']
 
-        # --- GARIS ESTIMASI BARU DARI INPUT PENGGUNA ---
-        # Rentang garis estimasi dari input pengguna
-        max_x_user_line = max(target_day, day_at_zero_exact_user_line) * 1.05 if day_at_zero_exact_user_line is not None else target_day + 5
-        x_vals_user_line = np.linspace(1, max_x_user_line, 100) # Mulai dari Hari ke-1
-        y_vals_user_line = slope_from_historical_model * x_vals_user_line + c_new
-        ax.plot(x_vals_user_line, y_vals_user_line, color='red', linestyle='--', label='Garis Estimasi (dari Input)')
+        static_changed = self._update_static(data)
+
+        # Plot titik awal dari input pengguna
+        self.initial_point.set_offsets([[1, initial_capacity]])
+        self.initial_annotation.xy = (1, initial_capacity)
+        self.initial_annotation.set_text(f'{initial_capacity:.2f} kWh')
+
+        # Garis Estimasi (dari Input Pengguna)
+        self.user_line.set_data(data['x_vals_user_line'], data['y_vals_user_line'])
 
         # Titik prediksi pada Hari target (dari garis estimasi baru)
-        ax.scatter(target_day, predicted_y_from_user_line, s=150, color='green', zorder=5, label=f'Prediksi Hari ke-{target_day}')
-        ax.annotate(f'{predicted_y_from_user_line:.2f} kWh', (target_day, predicted_y_from_user_line),
-                     textcoords="offset points", xytext=(-15, -20), ha='center',
-                     bbox=dict(boxstyle="round,pad=0.3", fc='yellow', alpha=0.5))
+        self.target_point.set_offsets([[target_day, predicted_y_from_user_line]])
+        self.target_point.set_label(f'Prediksi Hari ke-{target_day}')
+        self.target_annotation.xy = (target_day, predicted_y_from_user_line)
+        self.target_annotation.set_text(f'{predicted_y_from_user_line:.2f} kWh')
 
         # Titik saat listrik habis (dari garis estimasi baru)
-        if day_at_zero_exact_user_line is not None and day_at_zero_exact_user_line >= 0:
-            ax.scatter(day_at_zero_exact_user_line, 0, s=150, color='purple', zorder=5, label=f'Hari ke-{math.floor(day_at_zero_exact_user_line)} (0 kWh)')
-            ax.annotate(f'Mencapai 0 kWh: Hari ke-{math.floor(day_at_zero_exact_user_line)}', (day_at_zero_exact_user_line, 0),
-                         textcoords="offset points", xytext=(0, 10), ha='center',
-                         bbox=dict(boxstyle="round,pad=0.3", fc='cyan', alpha=0.5))
-        
-        ax.set_title('Prediksi Kapasitas Listrik dengan Regresi Linear')
-        ax.set_xlabel('Hari ke-')
-        ax.set_ylabel('Kapasitas Listrik (kWh)')
-        ax.legend()
-        ax.grid(True)
-        ax.axhline(0, color='black', linewidth=0.5, linestyle='-')
-        fig.tight_layout()
-        plt.show()
+        show_zero = day_at_zero_exact_user_line is not None and day_at_zero_exact_user_line >= 0
+        if show_zero:
+            zero_day = math.floor(day_at_zero_exact_user_line)
+            self.zero_point.set_offsets([[day_at_zero_exact_user_line, 0]])
+            self.zero_point.set_label(f'Hari ke-{zero_day} (0 kWh)')
+            self.zero_annotation.xy = (day_at_zero_exact_user_line, 0)
+            self.zero_annotation.set_text(f'Mencapai 0 kWh: Hari ke-{zero_day}')
+
+        for artist in self.dynamic_artists:
+            artist.set_visible(True)
+        self.zero_point.set_visible(show_zero)
+        self.zero_annotation.set_visible(show_zero)
+
+        # Gambar penuh hanya jika data historis, batas sumbu atau legenda berubah
+        # (semuanya bagian dari latar belakang yang di-cache); selain itu blitting
+        limits_changed = self._update_limits(data, show_zero)
+        legend_changed = self._update_legend(show_zero)
+        if static_changed or limits_changed or legend_changed or self.background is None:
+            with stage('canvas_draw'):
+                self.canvas.draw()
+        else:
+            with stage('canvas_blit'):
+                self.canvas.restore_region(self.background)
+                self._draw_dynamic_artists()
+                self.canvas.blit(self.figure.bbox)
+
+    def _update_static(self, data):
+        """Mengganti data artist statis; True jika berbeda dari gambar penuh terakhir."""
+        keys = ('history_day', 'history_kwh', 'line_x_historical', 'line_y_historical')
+        if self.static_data is not None and all(
+                np.array_equal(self.static_data[key], data[key]) for key in keys):
+            return False
+        self.history_points.set_offsets(np.column_stack([data['history_day'], data['history_kwh']]))
+        self.history_line.set_data(data['line_x_historical'], data['line_y_historical'])
+        self.static_data = {key: np.array(data[key]) for key in keys}
+        return True
+
+    def _update_limits(self, data, show_zero):
+        xs = [data['history_day'], data['line_x_historical'], data['x_vals_user_line'], [1, data['target_day']]]
+        ys = [data['history_kwh'], data['line_y_historical'], data['y_vals_user_line'],
+              [0, data['initial_capacity'], data['predicted_y_from_user_line']]]
+        if show_zero:
+            xs.append([data['day_at_zero_exact_user_line']])
+        x = np.concatenate([np.ravel(v) for v in xs])
+        y = np.concatenate([np.ravel(v) for v in ys])
+
+        xlim = self._padded(x.min(), x.max())
+        ylim = self._padded(y.min(), y.max())
+        if np.allclose(xlim, self.ax.get_xlim()) and np.allclose(ylim, self.ax.get_ylim()):
+            return False
+        self.ax.set_xlim(xlim)
+        self.ax.set_ylim(ylim)
+        return True
+
+    @staticmethod
+    def _padded(low, high, margin=0.05):
+        span = high - low if high > low else 1.0
+        return low - span * margin, high + span * margin
+
+    def _update_legend(self, show_zero):
+        handles = [self.history_points, self.initial_point, self.history_line,
+                   self.user_line, self.target_point]
+        if show_zero:
+            handles.append(self.zero_point)
+        labels = [h.get_label() for h in handles]
+        if labels == self.legend_labels:
+            return False
+        self.ax.legend(handles, labels)
+        self.legend_labels = labels
+        return True
+
+def draw_graph(data):
+    """
+    Memperbarui grafik yang tertanam di jendela utama. Dijalankan di thread utama Tk.
+    """
+    with stage('figure_update', rows=len(data['history_day'])):
+        forecast_plot.update(data)
 
-    except FileNotFoundError:
-        pass # Error sudah ditangani di fungsi get_regression_model_and_predictions
-    except ValueError:
-        messagebox.showerror("Input Invalid", "Mohon masukkan angka yang valid untuk kapasitas dan hari.")
-    except Exception as e:
-        messagebox.showerror("Error", f"Terjadi kesalahan saat membuat grafik: {e}")
+def generate_graph():
+    """
+    Menyiapkan data grafik di latar belakang, lalu memperbarui grafik tertanam di thread utama.
+    """
+    inputs = read_inputs()
+    if inputs is None:
+        return
+    initial_capacity, target_day, csv_path, robust = inputs
+
+    submit_job("Menyiapkan grafik",
+               lambda cancel_event: prepare_graph_data(initial_capacity, target_day, csv_path, cancel_event,
+                                                       robust),
+               draw_graph)
 
 def browse_csv_file():
     """Membuka dialog untuk memilih file CSV."""
@@ -210,7 +440,7 @@ def browse_csv_file():
 # --- Pengaturan GUI Utama ---
 root = tk.Tk()
 root.title("Estimasi Pemakaian Listrik")
-root.geometry("600x600") # Ukuran jendela disesuaikan
+root.geometry("900x1000") # Ukuran jendela disesuaikan (termasuk grafik)
 root.resizable(True, True)
 
 # Bingkai untuk input
@@ -237,6 +467,13 @@ entry_csv_path.grid(row=2, column=1, sticky="ew")
 browse_button = tk.Button(input_frame, text="Browse", command=browse_csv_file)
 browse_button.grid(row=2, column=2, sticky="ew")
 
+# Pilihan metode regresi (robust tahan terhadap pembacaan yang salah)
+tk.Label(input_frame, text="Metode Regresi:").grid(row=3, column=0, sticky="w", pady=5)
+method_var = tk.StringVar(value=next(iter(REGRESSION_METHODS)))
+method_menu = ttk.Combobox(input_frame, textvariable=method_var, values=list(REGRESSION_METHODS),
+                           state="readonly")
+method_menu.grid(row=3, column=1, sticky="ew")
+
 input_frame.grid_columnconfigure(1, weight=1) # Agar kolom input melebar
 
 # Tombol untuk memulai perhitungan
@@ -247,6 +484,16 @@ calculate_button.pack(pady=5, padx=10, fill="x")
 graph_button = tk.Button(root, text="Generate Grafik", command=generate_graph)
 graph_button.pack(pady=5, padx=10, fill="x")
 
+# Indikator progres dan tombol batal untuk tugas latar belakang
+progress_frame = tk.Frame(root)
+progress_frame.pack(pady=5, padx=10, fill="x")
+progress_bar = ttk.Progressbar(progress_frame, mode="indeterminate")
+progress_bar.pack(side="left", fill="x", expand=True)
+cancel_button = tk.Button(progress_frame, text="Batal", state=tk.DISABLED, command=cancel_current_job)
+cancel_button.pack(side="left", padx=(5, 0))
+status_label = tk.Label(root, text="", anchor="w")
+status_label.pack(padx=10, fill="x")
+
 # Bingkai untuk output
 output_frame = tk.LabelFrame(root, text="Hasil Analisis", padx=10, pady=10)
 output_frame.pack(pady=10, padx=10, fill="x")
@@ -264,5 +511,16 @@ cost_label.pack(pady=2, fill="x")
 empty_label = tk.Label(output_frame, text="", font=("Helvetica", 11), anchor="w")
 empty_label.pack(pady=2, fill="x")
 
+# Bingkai untuk grafik yang tertanam (satu Figure dipakai ulang)
+graph_frame = tk.LabelFrame(root, text="Grafik Prediksi", padx=5, pady=5)
+graph_frame.pack(pady=10, padx=10, fill="both", expand=True)
+forecast_plot = EmbeddedForecastPlot(graph_frame)
+
+# Instrumentasi per tahap aktif jika KWH_PROFILE diatur (lihat pipeline_profiler)
+profiling = pipeline_profiler.enable_from_env()
+
 # Jalankan program
-root.mainloop()
\ No newline at end of file
+root.mainloop()
+executor.shutdown(wait=False, cancel_futures=True)
+if profiling:
+    pipeline_profiler.print_summary()
\ No newline at end of file
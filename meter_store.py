@@ -0,0 +1,225 @@
+import csv
+import os
+from collections import Counter
+import numpy as np
+from regression_engine import StreamingLinearRegression
+from usage_store import load_usage_arrays
+
+# Akhiran file log penghapusan yang belum diterapkan ke CSV
+REMOVED_SUFFIX = '.removed'
+
+
+def _reading_key(day, kwh_left):
+    # Dibulatkan agar cocok dengan nilai yang dibaca kembali dari teks CSV
+    return float(day), round(float(kwh_left), 9)
+
+
+def _format_day(day):
+    # Hari bulat ditulis tanpa '.0' agar format CSV tetap sama dengan data asli
+    day = float(day)
+    return str(int(day)) if day.is_integer() else repr(day)
+
+
+def _line_key(line, day_col, kwh_col):
+    # Kunci pembacaan dari satu baris mentah CSV, atau None jika baris tidak valid
+    fields = next(csv.reader([line]), [])
+    try:
+        return _reading_key(fields[day_col], fields[kwh_col])
+    except (IndexError, ValueError):
+        return None
+
+
+def _ends_with_newline(path):
+    with open(path, 'rb') as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b'\n'
+
+
+class MeterStore:
+    """
+    Penyimpanan pembacaan meter dengan pembaruan model inkremental.
+
+    Setiap meter memiliki satu file CSV (format data/electricity_usage.csv) dan satu
+    model regresi di memori. Pembacaan baru ditambahkan ke akhir CSV dan ke model
+    dalam O(1) per pembacaan, sehingga slope, intercept dan hari habis selalu
+    mutakhir tanpa melatih ulang seluruh riwayat.
+
+    Penghapusan/koreksi pembacaan juga O(1) pada model (downdate). Pembacaan yang
+    dihapus dicatat di log penghapusan (`<meter>.csv.removed`) agar tetap berlaku
+    setelah program dimulai ulang; baris di CSV baru ditulis ulang saat `flush()`
+    dipanggil. Hanya pembacaan yang benar-benar ada yang dapat dihapus: indeks
+    pembacaan meter dibangun sekali pada penghapusan pertama.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.models = {}
+        self._removed = {}
+        self._readings = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def csv_path(self, meter_id):
+        return os.path.join(self.directory, f"{meter_id}.csv")
+
+    def removed_log_path(self, meter_id):
+        return self.csv_path(meter_id) + REMOVED_SUFFIX
+
+    def model(self, meter_id):
+        """
+        Model meter; dimuat dari CSV sekali saat pertama kali dibutuhkan.
+        Meter tanpa CSV atau tanpa pembacaan valid dimulai dengan model kosong.
+        """
+        model = self.models.get(meter_id)
+        if model is None:
+            path = self.csv_path(meter_id)
+            model = StreamingLinearRegression()
+            if os.path.exists(path):
+                day, kwh = load_usage_arrays(path)
+                if day.size:
+                    model.fit(day, kwh)
+            self.models[meter_id] = model
+            if os.path.exists(self.removed_log_path(meter_id)):
+                self._replay_removed(meter_id, model)
+        return model
+
+    def _replay_removed(self, meter_id, model):
+        """Menerapkan ulang penghapusan yang tercatat di log tetapi belum di-flush."""
+        readings = self._reading_index(meter_id)
+        pending = Counter()
+        with open(self.removed_log_path(meter_id)) as f:
+            for line in f:
+                day, _, kwh = line.strip().partition(',')
+                key = _reading_key(day, kwh)
+                # Entri yang barisnya sudah tidak ada di CSV (mis. flush terputus) diabaikan
+                if readings[key] > 0:
+                    readings[key] -= 1
+                    pending[key] += 1
+                    model.remove(*key)
+        self._removed[meter_id] = pending
+
+    def _reading_index(self, meter_id):
+        """Jumlah kemunculan setiap pembacaan di CSV (dibangun sekali per meter)."""
+        readings = self._readings.get(meter_id)
+        if readings is None:
+            from usage_loader import read_usage_arrays
+
+            readings = Counter()
+            path = self.csv_path(meter_id)
+            if os.path.exists(path):
+                day, kwh = read_usage_arrays(path)
+                readings.update(map(_reading_key, day.tolist(), kwh.tolist()))
+            self._readings[meter_id] = readings
+        return readings
+
+    # --- Penambahan data ---
+    def append(self, meter_id, day, kwh_left):
+        """Menambahkan satu pembacaan baru dan memperbarui model dalam O(1)."""
+        model = self.model(meter_id)
+        self._append_rows(meter_id, [(day, kwh_left)])
+        model.add(day, kwh_left)
+        if meter_id in self._readings:
+            self._readings[meter_id][_reading_key(day, kwh_left)] += 1
+        return self.forecast(meter_id)
+
+    def append_many(self, meter_id, days, kwh_left):
+        """Menambahkan banyak pembacaan sekaligus (biaya sebanding dengan data baru)."""
+        days = np.asarray(days)
+        kwh_left = np.asarray(kwh_left, dtype=np.float64)
+        model = self.model(meter_id)
+        self._append_rows(meter_id, zip(days.tolist(), kwh_left.tolist()))
+        model.partial_fit(days, kwh_left)
+        if meter_id in self._readings:
+            self._readings[meter_id].update(map(_reading_key, days.tolist(), kwh_left.tolist()))
+        return self.forecast(meter_id)
+
+    def _append_rows(self, meter_id, rows):
+        path = self.csv_path(meter_id)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        needs_newline = size > 0 and not _ends_with_newline(path)
+        with open(path, 'a') as f:
+            if size == 0:
+                f.write("day,electricity_kWh_left,usage_per_day\n")
+            elif needs_newline:
+                f.write("\n")
+            # Nilai dikonversi ke float/teks biasa agar skalar NumPy tidak ditulis sebagai repr-nya
+            f.writelines(f"{_format_day(day)},{float(kwh)!r}\n" for day, kwh in rows)
+
+    # --- Penghapusan dan koreksi ---
+    def remove(self, meter_id, day, kwh_left):
+        """
+        Menghapus satu pembacaan dari model (downdate O(1)) dan mencatatnya di log
+        penghapusan. ValueError jika pembacaan tersebut tidak ada.
+        """
+        model = self.model(meter_id)
+        key = _reading_key(day, kwh_left)
+        readings = self._reading_index(meter_id)
+        if readings[key] <= 0:
+            raise ValueError(f"Pembacaan hari {day} dengan {kwh_left} kWh tidak ada pada meter '{meter_id}'.")
+
+        with open(self.removed_log_path(meter_id), 'a') as f:
+            f.write(f"{_format_day(key[0])},{key[1]!r}\n")
+        readings[key] -= 1
+        model.remove(*key)
+        self._removed.setdefault(meter_id, Counter())[key] += 1
+        return self.forecast(meter_id)
+
+    def correct(self, meter_id, day, old_kwh_left, new_kwh_left):
+        """Mengganti nilai kWh sebuah pembacaan yang salah."""
+        self.remove(meter_id, day, old_kwh_left)
+        return self.append(meter_id, day, new_kwh_left)
+
+    def flush(self, meter_id=None):
+        """
+        Menulis ulang CSV untuk membuang baris yang telah dihapus, lalu menghapus
+        log penghapusannya. Hanya baris yang cocok dengan penghapusan yang dibuang;
+        baris lain (termasuk kolom tambahan dan baris yang tidak valid) disalin apa
+        adanya. Bersama pembangunan indeks pembacaan, ini satu-satunya operasi yang
+        sebanding dengan panjang riwayat.
+        """
+        from usage_loader import DAY_COLUMN, KWH_COLUMN
+
+        if meter_id is not None:
+            meter_ids = [meter_id]
+        else:
+            logged = [name[:-len('.csv' + REMOVED_SUFFIX)] for name in os.listdir(self.directory)
+                      if name.endswith('.csv' + REMOVED_SUFFIX)]
+            meter_ids = sorted(set(self._removed) | set(logged))
+        for mid in meter_ids:
+            # Meter yang belum dimuat: log penghapusannya diterapkan ulang dulu
+            self.model(mid)
+            pending = self._removed.pop(mid, None)
+            if not pending:
+                continue
+            path = self.csv_path(mid)
+            tmp_path = f"{path}.tmp"
+            with open(path, newline='') as src, open(tmp_path, 'w', newline='') as dst:
+                header = src.readline()
+                dst.write(header)
+                columns = [name.strip() for name in next(csv.reader([header]))]
+                day_col, kwh_col = columns.index(DAY_COLUMN), columns.index(KWH_COLUMN)
+                for line in src:
+                    key = _line_key(line, day_col, kwh_col)
+                    if key is not None and pending.get(key):
+                        pending[key] -= 1
+                        continue
+                    dst.write(line)
+            os.replace(tmp_path, path)
+            os.remove(self.removed_log_path(mid))
+
+    # --- Hasil ---
+    def forecast(self, meter_id):
+        """Slope, intercept, pemakaian harian dan hari habis (day_at_zero_exact) terkini."""
+        model = self.model(meter_id)
+        if model.n_samples_ == 0:
+            return {'meter_id': meter_id, 'n_samples': 0, 'slope': None, 'intercept': None,
+                    'daily_usage_rate': None, 'day_at_zero_exact': None}
+        slope = model.slope_
+        intercept = model.intercept_
+        return {
+            'meter_id': meter_id,
+            'n_samples': model.n_samples_,
+            'slope': slope,
+            'intercept': intercept,
+            'daily_usage_rate': -slope,
+            'day_at_zero_exact': (0 - intercept) / slope if slope != 0 else None,
+        }
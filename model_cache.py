@@ -0,0 +1,140 @@
+import os
+from collections import OrderedDict
+from regression_engine import StreamingLinearRegression
+from usage_store import load_usage_arrays
+from fit_modes import fit_arrays
+from pipeline_profiler import stage
+
+
+def load_and_fit(csv_file_path, chunksize=None, on_chunk=None):
+    """
+    Membaca CSV data historis dan melatih model regresi dari data tersebut.
+    `chunksize`/`on_chunk` diteruskan ke `load_usage_arrays` (pembacaan per potongan).
+    Mengembalikan tuple (df_csv, model).
+    """
+    # DataFrame (pandas) hanya dibutuhkan di sini, bukan saat modul diimpor
+    from usage_loader import usage_frame
+
+    # Dibaca dari cache biner (memory-mapped) bila masih sesuai dengan CSV
+    day, kwh = load_usage_arrays(csv_file_path, chunksize=chunksize, on_chunk=on_chunk)
+    if day.size == 0:
+        raise ValueError("File CSV tidak memiliki data yang valid untuk analisis.")
+
+    with stage('fit', rows=day.size):
+        model = StreamingLinearRegression()
+        model.fit(day, kwh)
+    with stage('build_frame', rows=day.size):
+        df_csv = usage_frame(day, kwh)
+    return df_csv, model
+
+
+def load_model(csv_file_path, window=None, halflife=None, topup_aware=False, robust=None,
+               min_jump=None):
+    """
+    Melatih model regresi dari CSV tanpa membuat DataFrame (tidak memuat pandas
+    jika cache biner masih berlaku). Cocok untuk jalur yang tidak menggambar grafik.
+    Mode pelatihan dipilih seperti pada `fit_modes.fit_arrays`.
+    """
+    day, kwh = load_usage_arrays(csv_file_path)
+    if day.size == 0:
+        raise ValueError("File CSV tidak memiliki data yang valid untuk analisis.")
+    with stage('fit', rows=day.size):
+        return fit_arrays(day, kwh, window=window, halflife=halflife, topup_aware=topup_aware,
+                          robust=robust, min_jump=min_jump)
+
+
+class ModelCache:
+    """
+    Cache LRU untuk data CSV yang sudah diparsing beserta model yang sudah dilatih.
+
+    Kunci cache adalah jalur absolut file ditambah waktu modifikasi dan ukurannya,
+    sehingga file yang berubah otomatis dimuat ulang. Prediksi untuk `target_day`
+    yang berbeda pada file yang sama tidak memerlukan I/O maupun pelatihan ulang,
+    juga untuk mode pelatihan khusus (lihat `get_model`).
+
+    Data dan model yang dikembalikan dipakai bersama; jangan diubah oleh pemanggil.
+    """
+
+    def __init__(self, maxsize=32, loader=load_and_fit):
+        if maxsize < 1:
+            raise ValueError("Ukuran cache minimal 1.")
+        self.maxsize = maxsize
+        self.loader = loader
+        self.hits = 0
+        self.misses = 0
+        self.mode_fits = 0
+        # Nilai per kunci: [(df_csv, model), {opsi_mode: model_mode}]
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def _key(csv_file_path):
+        path = os.path.abspath(csv_file_path)
+        stat = os.stat(path)
+        return path, stat.st_mtime_ns, stat.st_size
+
+    def _slot(self, csv_file_path, loader):
+        key = self._key(csv_file_path)
+        slot = self._entries.get(key)
+        if slot is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return slot
+
+        self.misses += 1
+        slot = [(loader or self.loader)(csv_file_path), {}]
+        # Buang versi lama dari file yang sama sebelum menyimpan versi baru
+        for old_key in [k for k in self._entries if k[0] == key[0]]:
+            del self._entries[old_key]
+        self._entries[key] = slot
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return slot
+
+    def get(self, csv_file_path, loader=None):
+        """
+        Mengembalikan (df_csv, model) dari cache, atau memuatnya jika belum ada.
+        `loader` menggantikan pemuat bawaan cache untuk pemanggilan ini saja.
+        """
+        return self._slot(csv_file_path, loader)[0]
+
+    def get_model(self, csv_file_path, window=None, halflife=None, topup_aware=False, robust=None,
+                  min_jump=None, loader=None, before_fit=None):
+        """
+        Seperti `get`, tetapi model dilatih dengan mode pada `fit_modes.fit_arrays`.
+        Model per mode disimpan bersama data file tersebut, sehingga hanya dilatih
+        sekali per versi file. `before_fit` (tanpa argumen) dipanggil tepat sebelum
+        model mode dilatih, mis. untuk memeriksa pembatalan.
+        Mengembalikan (df_csv, model).
+        """
+        slot = self._slot(csv_file_path, loader)
+        df_csv, model = slot[0]
+        options = (window, halflife, bool(topup_aware), robust, min_jump)
+        if options == (None, None, False, None, None):
+            return df_csv, model
+
+        fitted = slot[1].get(options)
+        if fitted is None:
+            if before_fit is not None:
+                before_fit()
+            with stage('fit', rows=len(df_csv)):
+                fitted = fit_arrays(df_csv['day'].to_numpy(), df_csv['electricity_kWh_left'].to_numpy(),
+                                    window=window, halflife=halflife, topup_aware=topup_aware,
+                                    robust=robust, min_jump=min_jump)
+            self.mode_fits += 1
+            slot[1][options] = fitted
+        return df_csv, fitted
+
+    def clear(self):
+        """Mengosongkan cache dan mereset penghitung hit/miss/pelatihan mode."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.mode_fits = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """Ringkasan penggunaan cache."""
+        return {'hits': self.hits, 'misses': self.misses, 'mode_fits': self.mode_fits,
+                'size': len(self._entries), 'maxsize': self.maxsize}
@@ -0,0 +1,234 @@
+"""
+Instrumentasi opsional per tahap jalur prediksi (baca CSV, pembersihan, pelatihan,
+prediksi, pembuatan grafik).
+
+Nonaktif secara default: `stage()` hanya mengembalikan konteks kosong bersama
+sehingga biayanya satu pemanggilan fungsi. Setelah `enable()`, setiap tahap
+mencatat waktu, jumlah baris dan (opsional) byte yang dialokasikan, memperbarui
+penghitung per tahap, dan memanggil hook yang terdaftar.
+
+Contoh:
+    import pipeline_profiler
+    pipeline_profiler.add_hook(lambda record: print(record))
+    pipeline_profiler.enable(trace_memory=True)
+    ...
+    print(pipeline_profiler.counters())
+
+Variabel lingkungan `KWH_PROFILE=1` (ringkasan) atau `KWH_PROFILE=<direktori>`
+(ringkasan + dump cProfile/tracemalloc) mengaktifkannya lewat `enable_from_env()`.
+"""
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+_enabled = False
+_trace_memory = False
+_dump_dir = None
+_hooks = []
+_counters = {}
+_lock = threading.Lock()
+_local = threading.local()
+_dump_seq = 0
+
+
+class StageRecord:
+    """Hasil pengukuran satu tahap; `rows` dan `bytes` bernilai None jika tidak diketahui."""
+
+    __slots__ = ('name', 'seconds', 'rows', 'bytes', 'depth')
+
+    def __init__(self, name, rows=None, depth=0):
+        self.name = name
+        self.seconds = 0.0
+        self.rows = rows
+        self.bytes = None
+        self.depth = depth
+
+    def __repr__(self):
+        return (f"StageRecord({self.name!r}, seconds={self.seconds:.6f}, "
+                f"rows={self.rows}, bytes={self.bytes})")
+
+
+class _NullStage:
+    """Konteks kosong saat instrumentasi nonaktif; atribut yang diisi pemanggil diabaikan."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    def __init__(self, name, rows):
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        self.stack = stack
+        self.record = StageRecord(name, rows, depth=len(stack))
+        self.profiler = None
+
+    def __enter__(self):
+        if _trace_memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            if self.stack:
+                # Puncak tahap induk sejauh ini disimpan sebelum puncak direset
+                parent = self.stack[-1]
+                parent.child_peak = max(parent.child_peak, peak)
+            tracemalloc.reset_peak()
+            self.start_bytes = current
+        self.child_peak = 0
+        self.stack.append(self)
+        if _dump_dir is not None and self.record.depth == 0:
+            import cProfile
+
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        self.start = time.perf_counter()
+        return self.record
+
+    def __exit__(self, *exc):
+        record = self.record
+        record.seconds = time.perf_counter() - self.start
+        if self.profiler is not None:
+            self.profiler.disable()
+        self.stack.pop()
+        if _trace_memory and tracemalloc.is_tracing() and hasattr(self, 'start_bytes'):
+            peak = max(tracemalloc.get_traced_memory()[1], self.child_peak)
+            record.bytes = max(peak - self.start_bytes, 0)
+            if self.stack:
+                parent = self.stack[-1]
+                parent.child_peak = max(parent.child_peak, peak)
+        if self.profiler is not None:
+            _dump(record.name, self.profiler)
+        _publish(record)
+        return False
+
+
+def stage(name, rows=None):
+    """
+    Konteks untuk mengukur satu tahap:
+
+        with stage('read_csv') as record:
+            ...
+            record.rows = n
+
+    Mengembalikan konteks kosong (tanpa biaya pengukuran) jika instrumentasi nonaktif.
+    """
+    if not _enabled:
+        return _NULL_STAGE
+    return _Stage(name, rows)
+
+
+def _publish(record):
+    with _lock:
+        total = _counters.get(record.name)
+        if total is None:
+            total = _counters[record.name] = {'calls': 0, 'seconds': 0.0, 'rows': 0, 'bytes': 0}
+        total['calls'] += 1
+        total['seconds'] += record.seconds
+        total['rows'] += record.rows or 0
+        total['bytes'] += record.bytes or 0
+        hooks = list(_hooks)
+    for hook in hooks:
+        hook(record)
+
+
+def _dump(name, profiler):
+    """Menyimpan profil cProfile (dan snapshot tracemalloc bila aktif) satu tahap terluar."""
+    global _dump_seq
+    with _lock:
+        _dump_seq += 1
+        prefix = os.path.join(_dump_dir, f"{name}-{os.getpid()}-{_dump_seq:04d}")
+    profiler.dump_stats(f"{prefix}.prof")
+    if _trace_memory and tracemalloc.is_tracing():
+        tracemalloc.take_snapshot().dump(f"{prefix}.tracemalloc")
+
+
+# --- Pengaturan ---
+def enable(trace_memory=False, dump_dir=None):
+    """
+    Mengaktifkan instrumentasi.
+
+    - `trace_memory`: ukur byte yang dialokasikan per tahap (tracemalloc; memperlambat)
+    - `dump_dir`    : simpan profil cProfile (.prof) setiap tahap terluar, serta snapshot
+                      tracemalloc (.tracemalloc) jika `trace_memory` aktif
+    """
+    global _enabled, _trace_memory, _dump_dir
+    if dump_dir is not None:
+        os.makedirs(dump_dir, exist_ok=True)
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _trace_memory = trace_memory
+    _dump_dir = dump_dir
+    _enabled = True
+
+
+def disable():
+    """Menonaktifkan instrumentasi (penghitung yang sudah terkumpul tetap tersimpan)."""
+    global _enabled, _trace_memory, _dump_dir
+    if _trace_memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _enabled = False
+    _trace_memory = False
+    _dump_dir = None
+
+
+def is_enabled():
+    return _enabled
+
+
+def enable_from_env(variable='KWH_PROFILE'):
+    """
+    Mengaktifkan instrumentasi dari variabel lingkungan: '1' untuk penghitung saja,
+    nilai lain dianggap direktori dump (dengan pengukuran memori).
+    Mengembalikan True jika instrumentasi diaktifkan.
+    """
+    value = os.environ.get(variable, '')
+    if not value or value == '0':
+        return False
+    if value == '1':
+        enable()
+    else:
+        enable(trace_memory=True, dump_dir=value)
+    return True
+
+
+# --- Hook dan penghitung ---
+def add_hook(callback):
+    """Mendaftarkan `callback(record)` yang dipanggil setiap kali satu tahap selesai."""
+    with _lock:
+        _hooks.append(callback)
+    return callback
+
+
+def remove_hook(callback):
+    with _lock:
+        _hooks.remove(callback)
+
+
+def counters():
+    """Salinan total per tahap: {nama: {'calls', 'seconds', 'rows', 'bytes'}}."""
+    with _lock:
+        return {name: dict(total) for name, total in _counters.items()}
+
+
+def reset_counters():
+    with _lock:
+        _counters.clear()
+
+
+def print_summary(out=sys.stderr):
+    """Menuliskan ringkasan penghitung per tahap, diurutkan dari waktu total terbesar."""
+    totals = sorted(counters().items(), key=lambda item: item[1]['seconds'], reverse=True)
+    out.write(f"{'tahap':<20} {'panggilan':>9} {'total ms':>10} {'baris':>12} {'byte':>12}\n")
+    for name, total in totals:
+        out.write(f"{name:<20} {total['calls']:>9} {total['seconds'] * 1000:>10.3f} "
+                  f"{total['rows']:>12,} {total['bytes']:>12,}\n")
@@ -0,0 +1,149 @@
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from regression_engine import StreamingLinearRegression, _as_1d
+
+
+def _t_quantile(confidence, dof):
+    """Kuantil distribusi t dua sisi (scipy hanya dimuat saat dibutuhkan)."""
+    from scipy.stats import t
+
+    return float(t.ppf(0.5 + confidence / 2, dof))
+
+
+def _fieller_zero_crossing(mean_y, slope, sxx, n, k):
+    """
+    Rentang hari di mana 0 kWh masih berada di dalam interval prediksi garis historis.
+    Menyelesaikan (ȳ + b·d)² = k·(1 + 1/n + d²/Sxx) untuk d = x - x̄.
+    Mengembalikan (bawah, atas) relatif terhadap x̄, atau (nan, nan) jika tidak terbatas.
+    """
+    a = slope * slope - k / sxx
+    b = 2 * mean_y * slope
+    c = mean_y * mean_y - k * (1 + 1 / n)
+    disc = b * b - 4 * a * c
+    if a <= 0 or disc < 0:
+        return math.nan, math.nan
+    root = math.sqrt(disc)
+    return (-b - root) / (2 * a), (-b + root) / (2 * a)
+
+
+def analytic_intervals(model, target_day, initial_capacity=None, confidence=0.95):
+    """
+    Interval prediksi OLS analitik dari statistik cukup model.
+
+    Mengembalikan dict berisi (bawah, atas) untuk:
+    - 'predicted_kWh'     : sisa kWh garis historis pada `target_day`
+    - 'day_at_zero_exact' : hari habis garis historis (interval Fieller)
+    - 'daily_usage_rate'  : pemakaian harian (dari galat baku slope)
+    dan, jika `initial_capacity` diberikan:
+    - 'remaining_kWh'         : sisa kWh dari garis estimasi input pengguna
+    - 'day_at_zero_rounded'   : hari habis dari input pengguna
+    Batas yang tidak terdefinisi atau tidak terbatas bernilai NaN atau inf.
+    """
+    if not isinstance(model, StreamingLinearRegression):
+        raise TypeError("Interval analitik membutuhkan StreamingLinearRegression (statistik cukup).")
+    n = model.n_samples_
+    if n < 3 or model.sxx_ <= 0:
+        raise ValueError("Interval prediksi membutuhkan minimal 3 data dengan 'day' yang bervariasi.")
+
+    slope = model.slope_
+    residual_ss = max(model.syy_ - model.sxy_ * model.sxy_ / model.sxx_, 0.0)
+    s2 = residual_ss / (n - 2)
+    t = _t_quantile(confidence, n - 2)
+    se_slope = math.sqrt(s2 / model.sxx_)
+
+    dx = target_day - model.mean_x_
+    predicted = model.intercept_ + slope * target_day
+    half = t * math.sqrt(s2 * (1 + 1 / n + dx * dx / model.sxx_))
+
+    low, high = _fieller_zero_crossing(model.mean_y_, slope, model.sxx_, n, t * t * s2)
+    rate = float(-slope)
+    result = {
+        'confidence': confidence,
+        'predicted_kWh': (float(predicted - half), float(predicted + half)),
+        'day_at_zero_exact': (float(model.mean_x_ + low), float(model.mean_x_ + high)),
+        'daily_usage_rate': (rate - t * se_slope, rate + t * se_slope),
+    }
+
+    if initial_capacity is not None:
+        # Garis estimasi pengguna melewati (1, initial_capacity) dengan slope historis
+        steps = target_day - 1
+        remaining = initial_capacity - rate * steps
+        half_remaining = t * math.sqrt(se_slope * se_slope * steps * steps + s2)
+        rate_low, rate_high = result['daily_usage_rate']
+        result['remaining_kWh'] = (remaining - half_remaining, remaining + half_remaining)
+        result['day_at_zero_rounded'] = (
+            math.floor(initial_capacity / rate_high) if rate_high > 0 else math.nan,
+            math.floor(initial_capacity / rate_low) if rate_low > 0 else math.inf,
+        )
+    return result
+
+
+def _bootstrap_chunk(x, y, n_replicates, seed, target_day, initial_capacity):
+    # Resampling pasangan (day, kWh): satu matriks (replikasi x n) sekaligus
+    rng = np.random.default_rng(seed)
+    idx = rng.integers(0, x.size, size=(n_replicates, x.size))
+    xb = x[idx]
+    yb = y[idx]
+    mean_x = xb.mean(axis=1, keepdims=True)
+    mean_y = yb.mean(axis=1, keepdims=True)
+    dx = xb - mean_x
+    sxx = np.einsum('ij,ij->i', dx, dx)
+    sxy = np.einsum('ij,ij->i', dx, yb - mean_y)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        slope = np.where(sxx > 0, sxy / sxx, np.nan)
+        intercept = mean_y[:, 0] - slope * mean_x[:, 0]
+
+        # Galat pengamatan baru: satu residual acak per replikasi (dikoreksi derajat bebas)
+        pick = rng.integers(0, x.size, size=n_replicates)
+        rows = np.arange(n_replicates)
+        residual = yb[rows, pick] - (intercept + slope * xb[rows, pick])
+        noise = residual * math.sqrt(x.size / (x.size - 2))
+
+        out = {
+            'slope': slope,
+            'predicted_kWh': intercept + slope * target_day + noise,
+            'day_at_zero_exact': -(intercept + noise) / slope,
+        }
+        if initial_capacity is not None:
+            out['remaining_kWh'] = initial_capacity + slope * (target_day - 1) + noise
+            out['day_at_zero_rounded'] = np.floor(initial_capacity / -slope)
+    return out
+
+
+def bootstrap_intervals(day, kwh_left, target_day, initial_capacity=None, n_boot=2000,
+                        confidence=0.95, seed=None, n_jobs=1, max_cells=4_000_000):
+    """
+    Interval bootstrap (persentil) untuk sisa kWh dan hari habis.
+
+    Semua replikasi diambil sebagai matriks NumPy per potongan (maks. `max_cells`
+    elemen), dan potongan dapat dijalankan paralel di `n_jobs` thread (operasi
+    NumPy melepas GIL). Hasil dapat direproduksi dengan `seed`.
+    """
+    x = _as_1d(day)
+    y = _as_1d(kwh_left)
+    if x.size < 3:
+        raise ValueError("Bootstrap membutuhkan minimal 3 data.")
+
+    per_chunk = max(1, min(n_boot, max_cells // x.size))
+    sizes = [min(per_chunk, n_boot - start) for start in range(0, n_boot, per_chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = [(x, y, size, s, target_day, initial_capacity) for size, s in zip(sizes, seeds)]
+
+    if n_jobs == 1 or len(jobs) == 1:
+        parts = [_bootstrap_chunk(*job) for job in jobs]
+    else:
+        workers = os.cpu_count() if n_jobs in (None, -1) else n_jobs
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            parts = list(executor.map(lambda job: _bootstrap_chunk(*job), jobs))
+
+    alpha = (1 - confidence) / 2
+    result = {'confidence': confidence, 'n_boot': n_boot}
+    for name in parts[0]:
+        values = np.concatenate([part[name] for part in parts])
+        low, high = np.nanquantile(values, [alpha, 1 - alpha])
+        if name == 'slope':
+            name, (low, high) = 'daily_usage_rate', (-high, -low)
+        result[name] = (float(low), float(high))
+    return result
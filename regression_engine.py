@@ -0,0 +1,369 @@
+import numpy as np
+
+
+def _as_1d(values):
+    """
+    Mengubah input (list, array, Series, atau DataFrame satu kolom) menjadi array 1D float64.
+    """
+    arr = np.asarray(values, dtype=np.float64)
+    if arr.ndim == 2:
+        if arr.shape[1] != 1:
+            raise ValueError("Model hanya mendukung satu fitur ('day').")
+        arr = arr[:, 0]
+    return arr.reshape(-1)
+
+
+class StreamingLinearRegression:
+    """
+    Regresi linear OLS satu fitur berbasis statistik cukup (sufficient statistics).
+
+    Model menyimpan statistik berjalan (n, rata-rata x, rata-rata y, Sxx, Sxy, Syy).
+    Nilai ini setara dengan (n, Σx, Σy, Σxy, Σx²) tetapi disimpan dalam bentuk
+    terpusat agar stabil secara numerik. Fit bersifat O(1) setelah data masuk,
+    dan data baru dapat ditambahkan secara inkremental.
+
+    Antarmuka `fit`, `predict`, `coef_` dan `intercept_` mengikuti
+    `sklearn.linear_model.LinearRegression` sehingga kode plot dan biaya tidak berubah.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Mengosongkan seluruh statistik model."""
+        self.n_samples_ = 0
+        self.mean_x_ = 0.0
+        self.mean_y_ = 0.0
+        self.sxx_ = 0.0
+        self.sxy_ = 0.0
+        self.syy_ = 0.0
+        return self
+
+    # --- Pemasukan data ---
+    def fit(self, X, y):
+        """Melatih ulang model dari awal menggunakan seluruh data X dan y."""
+        self.reset()
+        return self.partial_fit(X, y)
+
+    def partial_fit(self, X, y):
+        """
+        Menambahkan satu batch data ke statistik model (tanpa membuang data lama).
+        """
+        x = _as_1d(X)
+        y = _as_1d(y)
+        if x.size != y.size:
+            raise ValueError("Jumlah data 'day' dan 'electricity_kWh_left' tidak sama.")
+        if x.size == 0:
+            return self
+
+        mean_x = x.mean()
+        mean_y = y.mean()
+        dx = x - mean_x
+        dy = y - mean_y
+        self._merge_stats(x.size, mean_x, mean_y, dx @ dx, dx @ dy, dy @ dy)
+        return self
+
+    def add(self, x, y):
+        """Menambahkan satu pembacaan (x, y) dalam O(1) (update Welford)."""
+        x = float(x)
+        y = float(y)
+        self.n_samples_ += 1
+        dx = x - self.mean_x_
+        dy = y - self.mean_y_
+        self.mean_x_ += dx / self.n_samples_
+        self.mean_y_ += dy / self.n_samples_
+        self.sxx_ += dx * (x - self.mean_x_)
+        self.sxy_ += dx * (y - self.mean_y_)
+        self.syy_ += dy * (y - self.mean_y_)
+        return self
+
+    def remove(self, x, y):
+        """
+        Menghapus satu pembacaan (x, y) yang sebelumnya dimasukkan, dalam O(1)
+        (kebalikan dari `add`). Pembacaan harus benar-benar ada di data model.
+        """
+        if self.n_samples_ == 0:
+            raise ValueError("Model tidak memiliki data untuk dihapus.")
+        if self.n_samples_ == 1:
+            return self.reset()
+        x = float(x)
+        y = float(y)
+        n_new = self.n_samples_ - 1
+        mean_x_old = (self.n_samples_ * self.mean_x_ - x) / n_new
+        mean_y_old = (self.n_samples_ * self.mean_y_ - y) / n_new
+        self.sxx_ -= (x - mean_x_old) * (x - self.mean_x_)
+        self.sxy_ -= (x - mean_x_old) * (y - self.mean_y_)
+        self.syy_ -= (y - mean_y_old) * (y - self.mean_y_)
+        self.mean_x_ = mean_x_old
+        self.mean_y_ = mean_y_old
+        self.n_samples_ = n_new
+        # Koreksi galat pembulatan kecil agar jumlah kuadrat tidak negatif
+        self.sxx_ = max(self.sxx_, 0.0)
+        self.syy_ = max(self.syy_, 0.0)
+        return self
+
+    def merge(self, other):
+        """Menggabungkan statistik model lain (mis. hasil chunk lain) ke model ini."""
+        self._merge_stats(other.n_samples_, other.mean_x_, other.mean_y_,
+                          other.sxx_, other.sxy_, other.syy_)
+        return self
+
+    def _merge_stats(self, n_b, mean_x_b, mean_y_b, sxx_b, sxy_b, syy_b):
+        # Penggabungan statistik terpusat dua kelompok data (Chan et al.)
+        if n_b == 0:
+            return
+        n_a = self.n_samples_
+        n = n_a + n_b
+        delta_x = mean_x_b - self.mean_x_
+        delta_y = mean_y_b - self.mean_y_
+        factor = n_a * n_b / n
+
+        self.mean_x_ += delta_x * n_b / n
+        self.mean_y_ += delta_y * n_b / n
+        self.sxx_ += sxx_b + delta_x * delta_x * factor
+        self.sxy_ += sxy_b + delta_x * delta_y * factor
+        self.syy_ += syy_b + delta_y * delta_y * factor
+        self.n_samples_ = n
+
+    # --- Hasil model ---
+    @property
+    def slope_(self):
+        """Gradien garis regresi (0 jika variasi 'day' nol, sama seperti sklearn)."""
+        if self.n_samples_ == 0:
+            raise ValueError("Model belum dilatih dengan data apa pun.")
+        if self.sxx_ == 0:
+            return 0.0
+        return self.sxy_ / self.sxx_
+
+    @property
+    def coef_(self):
+        return np.array([self.slope_])
+
+    @property
+    def intercept_(self):
+        return self.mean_y_ - self.slope_ * self.mean_x_
+
+    def predict(self, X):
+        """Memprediksi sisa kWh untuk satu atau beberapa nilai 'day'."""
+        return self.intercept_ + self.slope_ * _as_1d(X)
+
+
+def fit_grouped(group_codes, X, y, n_groups=None):
+    """
+    Melatih banyak regresi satu fitur sekaligus dalam satu pass NumPy tervektorisasi.
+
+    `group_codes` berisi indeks kelompok (0..n_groups-1) untuk setiap baris, misalnya
+    hasil `pd.factorize` dari kolom id meter. Statistik cukup tiap kelompok dihitung
+    dengan `np.bincount` (dua pass: rata-rata, lalu jumlah terpusat).
+
+    Mengembalikan tuple (n, slope, intercept) berupa array dengan panjang n_groups.
+    Kelompok tanpa data menghasilkan NaN; kelompok dengan variasi 'day' nol
+    menghasilkan slope 0 (sama seperti `StreamingLinearRegression`).
+    """
+    codes = np.asarray(group_codes, dtype=np.intp).reshape(-1)
+    x = _as_1d(X)
+    y = _as_1d(y)
+    if not (codes.size == x.size == y.size):
+        raise ValueError("Panjang kode kelompok, 'day' dan 'electricity_kWh_left' harus sama.")
+    if n_groups is None:
+        n_groups = int(codes.max()) + 1 if codes.size else 0
+
+    n = np.bincount(codes, minlength=n_groups).astype(np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_x = np.bincount(codes, weights=x, minlength=n_groups) / n
+        mean_y = np.bincount(codes, weights=y, minlength=n_groups) / n
+
+    dx = x - mean_x[codes]
+    dy = y - mean_y[codes]
+    sxx = np.bincount(codes, weights=dx * dx, minlength=n_groups)
+    sxy = np.bincount(codes, weights=dx * dy, minlength=n_groups)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        slope = np.where(sxx != 0, sxy / np.where(sxx != 0, sxx, 1.0), 0.0)
+    slope[n == 0] = np.nan
+    intercept = mean_y - slope * mean_x
+    return n.astype(np.int64), slope, intercept
+
+
+def fit_chunks(chunks, model=None):
+    """
+    Melatih model dari iterable berisi potongan (X, y) dengan memori konstan.
+    Setiap potongan digabung ke statistik model lalu dapat dibuang.
+    """
+    model = model if model is not None else StreamingLinearRegression()
+    for X, y in chunks:
+        model.partial_fit(X, y)
+    return model
+
+
+def fit_readings(readings, model=None, buffer_size=65536):
+    """
+    Melatih model dari generator pembacaan tunggal (day, kWh) dengan memori konstan.
+    Pembacaan dikumpulkan per `buffer_size` agar penggabungan tetap tervektorisasi.
+    """
+    model = model if model is not None else StreamingLinearRegression()
+    buffer = np.empty((buffer_size, 2), dtype=np.float64)
+    filled = 0
+    for x, y in readings:
+        buffer[filled] = (x, y)
+        filled += 1
+        if filled == buffer_size:
+            model.partial_fit(buffer[:, 0], buffer[:, 1])
+            filled = 0
+    if filled:
+        model.partial_fit(buffer[:filled, 0], buffer[:filled, 1])
+    return model
+
+
+class FittedLine:
+    """
+    Garis regresi yang sudah jadi (slope dan intercept tetap), dengan antarmuka
+    `coef_`/`intercept_`/`predict` yang sama seperti `StreamingLinearRegression`.
+    Dipakai untuk hasil mode jendela geser dan berbobot eksponensial.
+    """
+
+    def __init__(self, slope, intercept, n_samples):
+        self.slope_ = float(slope)
+        self.intercept_ = float(intercept)
+        self.n_samples_ = int(n_samples)
+
+    @property
+    def coef_(self):
+        return np.array([self.slope_])
+
+    def predict(self, X):
+        return self.intercept_ + self.slope_ * _as_1d(X)
+
+
+def _sorted_by_day(X, y):
+    x = _as_1d(X)
+    y = _as_1d(y)
+    if x.size != y.size:
+        raise ValueError("Jumlah data 'day' dan 'electricity_kWh_left' tidak sama.")
+    order = None
+    if x.size > 1 and np.any(np.diff(x) < 0):
+        order = np.argsort(x, kind='stable')
+        x, y = x[order], y[order]
+    return x, y, order
+
+
+def _restore_order(order, *arrays):
+    if order is None:
+        return arrays
+    restored = []
+    for arr in arrays:
+        out = np.empty_like(arr)
+        out[order] = arr
+        restored.append(out)
+    return tuple(restored)
+
+
+def _line_from_sums(w, sx, sy, sxx, sxy, cx, cy):
+    # Slope/intercept dari jumlah (berbobot) data terpusat di (cx, cy)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_u = sx / w
+        mean_v = sy / w
+        var_u = sxx - sx * mean_u
+        cov_uv = sxy - sx * mean_v
+        slope = np.where(var_u > 1e-12 * np.maximum(sxx, 1.0), cov_uv / np.where(var_u != 0, var_u, 1.0), 0.0)
+    intercept = cy + mean_v - slope * (mean_u + cx)
+    return slope, intercept
+
+
+def rolling_fit(X, y, window):
+    """
+    Regresi jendela geser: untuk setiap baris i, model dilatih hanya dari pembacaan
+    dengan day dalam (day_i - window, day_i] ("N hari terakhir"), termasuk semua
+    pembacaan lain pada hari yang sama dengan day_i.
+
+    Semua posisi jendela dihitung sekaligus dari jumlah kumulatif (prefix sum)
+    statistik cukup, tanpa melatih ulang per jendela.
+    Mengembalikan (n, slope, intercept) sejajar dengan urutan baris masukan.
+    """
+    if window <= 0:
+        raise ValueError("Ukuran jendela harus lebih dari 0 hari.")
+    x, y, order = _sorted_by_day(X, y)
+    cx, cy = x.mean(), y.mean()
+    u, v = x - cx, y - cy
+
+    # Prefix sum dengan nol di depan: jumlah baris [a, b) = P[b] - P[a]
+    stats = np.column_stack([np.ones_like(u), u, v, u * u, u * v])
+    prefix = np.vstack([np.zeros((1, 5)), np.cumsum(stats, axis=0)])
+    end = np.searchsorted(x, x, side='right')
+    start = np.searchsorted(x, x - window, side='right')
+    w, sx, sy, sxx, sxy = (prefix[end] - prefix[start]).T
+
+    slope, intercept = _line_from_sums(w, sx, sy, sxx, sxy, cx, cy)
+    n, slope, intercept = _restore_order(order, w.astype(np.int64), slope, intercept)
+    return n, slope, intercept
+
+
+def ewm_fit(X, y, halflife=None, alpha=None):
+    """
+    Regresi berbobot eksponensial: pembacaan yang berumur t hari (relatif terhadap
+    baris i) diberi bobot (1 - alpha)^t, atau 0.5^(t / halflife).
+
+    Jumlah berbobot dihitung untuk semua posisi dalam satu pass tervektorisasi per
+    blok (cumsum dengan faktor skala), sehingga biayanya O(n). Pembacaan pada hari
+    yang sama dengan day_i ikut dihitung dengan bobot penuh.
+    Mengembalikan (bobot_efektif, slope, intercept) sejajar dengan urutan baris masukan.
+    """
+    if (halflife is None) == (alpha is None):
+        raise ValueError("Isi tepat salah satu dari 'halflife' atau 'alpha'.")
+    if halflife is not None:
+        if halflife <= 0:
+            raise ValueError("'halflife' harus lebih dari 0.")
+        log_decay = np.log(0.5) / halflife
+    else:
+        if not 0 < alpha <= 1:
+            raise ValueError("'alpha' harus di antara 0 (eksklusif) dan 1.")
+        log_decay = np.log1p(-alpha) if alpha < 1 else -np.inf
+
+    x, y, order = _sorted_by_day(X, y)
+    cx, cy = x.mean(), y.mean()
+    u, v = x - cx, y - cy
+    stats = np.column_stack([np.ones_like(u), u, v, u * u, u * v])
+    sums = np.empty_like(stats)
+
+    if np.isinf(log_decay):
+        sums[:] = stats
+    else:
+        # Dalam satu blok, S_t = exp(k (x_t - x0)) * cumsum(exp(-k (x_j - x0)) z_j);
+        # blok dipotong agar faktor skala tidak overflow.
+        max_span = 600.0 / -log_decay
+        carry = np.zeros(5)
+        carry_x = x[0] if x.size else 0.0
+        start = 0
+        while start < x.size:
+            x0 = x[start]
+            end = max(start + 1, int(np.searchsorted(x, x0 + max_span, side='right')))
+            rel = x[start:end] - x0
+            block = np.cumsum(stats[start:end] * np.exp(-log_decay * rel)[:, None], axis=0)
+            block += carry * np.exp(log_decay * (x0 - carry_x))
+            block *= np.exp(log_decay * rel)[:, None]
+            sums[start:end] = block
+            carry, carry_x = block[-1], x[end - 1]
+            start = end
+
+    # Baris dengan hari yang sama memakai jumlah sampai baris terakhir hari tersebut
+    w, sx, sy, sxx, sxy = sums[np.searchsorted(x, x, side='right') - 1].T
+    slope, intercept = _line_from_sums(w, sx, sy, sxx, sxy, cx, cy)
+    return _restore_order(order, w, slope, intercept)
+
+
+def fit_recent(X, y, window=None, halflife=None):
+    """
+    Melatih garis regresi yang mencerminkan pemakaian terkini: jendela `window`
+    hari terakhir, atau bobot eksponensial dengan `halflife` hari.
+    Mengembalikan `FittedLine` pada posisi data terakhir.
+    """
+    if window is not None:
+        n, slope, intercept = rolling_fit(X, y, window)
+    elif halflife is not None:
+        n, slope, intercept = ewm_fit(X, y, halflife=halflife)
+    else:
+        raise ValueError("Isi 'window' atau 'halflife'.")
+    # Baris terakhir dengan hari terbesar (hasilnya sama untuk semua baris hari itu)
+    x = _as_1d(X)
+    last = x.size - 1 - int(np.argmax(x[::-1]))
+    return FittedLine(slope[last], intercept[last], n[last])
@@ -0,0 +1,173 @@
+import os
+import glob
+import argparse
+import math
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from model_cache import load_and_fit
+
+# Figure dan Axes yang dipakai ulang oleh setiap proses pekerja
+_worker_figure = None
+_worker_axes = None
+
+
+def draw_forecast_chart(ax, initial_capacity, target_day, model, df_full):
+    """
+    Menggambar grafik prediksi (data historis, garis regresi historis, garis estimasi
+    dari input pengguna, titik prediksi dan titik 0 kWh) pada Axes yang diberikan.
+    Tidak bergantung pada pyplot sehingga dapat dipakai tanpa layar (backend Agg).
+    """
+    # --- PERHITUNGAN UNTUK GARIS ESTIMASI DARI INPUT PENGGUNA ---
+    slope_from_historical_model = model.coef_[0]
+    c_new = initial_capacity - slope_from_historical_model * 1
+    predicted_y_from_user_line = slope_from_historical_model * target_day + c_new
+    day_at_zero_exact_user_line = None
+    if slope_from_historical_model != 0:
+        day_at_zero_exact_user_line = -c_new / slope_from_historical_model
+
+    # Plot data asli dari CSV
+    ax.scatter(df_full['day'], df_full['electricity_kWh_left'], s=100, color='blue', label='Data Asli (Historis)')
+
+    # Plot titik awal dari input pengguna
+    ax.scatter([1], [initial_capacity], s=150, color='orange', zorder=5, label='Input Kapasitas Awal (Hari ke-1)')
+    ax.annotate(f'{initial_capacity:.2f} kWh', (1, initial_capacity),
+                textcoords="offset points", xytext=(0, 10), ha='center',
+                bbox=dict(boxstyle="round,pad=0.3", fc='orange', alpha=0.5))
+
+    # Garis Regresi Historis (untuk referensi)
+    max_x_plot_historical = df_full['day'].max() + 5
+    line_x_historical = np.linspace(df_full['day'].min(), max_x_plot_historical, 100)
+    line_y_historical = model.predict(line_x_historical)
+    ax.plot(line_x_historical, line_y_historical, color='gray', linestyle=':', alpha=0.5, label='Garis Regresi Historis')
+
+    # Garis Estimasi (dari Input Pengguna)
+    max_x_user_line = max(target_day, day_at_zero_exact_user_line) * 1.05 if day_at_zero_exact_user_line is not None else target_day + 5
+    x_vals_user_line = np.linspace(1, max_x_user_line, 100)
+    y_vals_user_line = slope_from_historical_model * x_vals_user_line + c_new
+    ax.plot(x_vals_user_line, y_vals_user_line, color='red', linestyle='--', label='Garis Estimasi (dari Input)')
+
+    # Titik prediksi pada Hari target (dari garis estimasi baru)
+    ax.scatter(target_day, predicted_y_from_user_line, s=150, color='green', zorder=5, label=f'Prediksi Hari ke-{target_day}')
+    ax.annotate(f'{predicted_y_from_user_line:.2f} kWh', (target_day, predicted_y_from_user_line),
+                textcoords="offset points", xytext=(-15, -20), ha='center',
+                bbox=dict(boxstyle="round,pad=0.3", fc='yellow', alpha=0.5))
+
+    # Titik saat listrik habis (dari garis estimasi baru)
+    if day_at_zero_exact_user_line is not None and day_at_zero_exact_user_line >= 0:
+        ax.scatter(day_at_zero_exact_user_line, 0, s=150, color='purple', zorder=5, label=f'Hari ke-{math.floor(day_at_zero_exact_user_line)} (0 kWh)')
+        ax.annotate(f'Mencapai 0 kWh: Hari ke-{math.floor(day_at_zero_exact_user_line)}', (day_at_zero_exact_user_line, 0),
+                    textcoords="offset points", xytext=(0, 10), ha='center',
+                    bbox=dict(boxstyle="round,pad=0.3", fc='cyan', alpha=0.5))
+
+    ax.set_title('Prediksi Kapasitas Listrik dengan Regresi Linear')
+    ax.set_xlabel('Hari ke-')
+    ax.set_ylabel('Kapasitas Listrik (kWh)')
+    ax.legend()
+    ax.grid(True)
+    ax.axhline(0, color='black', linewidth=0.5, linestyle='-')
+
+
+def _get_worker_axes():
+    """Membuat Figure/Axes Agg sekali per proses, lalu memakainya ulang."""
+    global _worker_figure, _worker_axes
+    if _worker_figure is None:
+        _worker_figure = Figure(figsize=(12, 8))
+        FigureCanvasAgg(_worker_figure)
+        _worker_axes = _worker_figure.add_subplot()
+    else:
+        _worker_axes.clear()
+    return _worker_figure, _worker_axes
+
+
+def render_forecast_chart(csv_file_path, output_path, target_day, initial_capacity=None, dpi=100):
+    """
+    Merender grafik prediksi satu meter ke file (format dari ekstensi, mis. .png/.svg).
+    Jika `initial_capacity` None, kapasitas hari ke-1 diambil dari garis regresi.
+    """
+    df_full, model = load_and_fit(csv_file_path)
+    if initial_capacity is None:
+        initial_capacity = float(model.predict([1])[0])
+
+    fig, ax = _get_worker_axes()
+    draw_forecast_chart(ax, initial_capacity, target_day, model, df_full)
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=dpi)
+    return output_path
+
+
+def _render_job(job):
+    csv_file_path, output_path, target_day, initial_capacity, dpi = job
+    try:
+        return csv_file_path, render_forecast_chart(csv_file_path, output_path, target_day, initial_capacity, dpi), None
+    except Exception as e:
+        return csv_file_path, None, f"{type(e).__name__}: {e}"
+
+
+def render_reports(csv_paths, output_dir, target_day, initial_capacity=None, fmt='png',
+                   dpi=100, max_workers=None, chunksize=16):
+    """
+    Merender grafik prediksi untuk banyak meter tanpa layar, tersebar ke beberapa proses.
+
+    `csv_paths` berupa daftar file CSV atau jalur direktori. `initial_capacity` boleh
+    None, skalar, atau dict {id_meter: kapasitas}. File ditulis ke `output_dir`
+    segera setelah selesai dirender.
+
+    Menghasilkan (generator) tuple (csv_path, output_path, error) sesuai urutan selesai;
+    `error` bernilai None jika berhasil.
+    """
+    if isinstance(csv_paths, (str, os.PathLike)):
+        csv_paths = sorted(glob.glob(os.path.join(csv_paths, '*.csv')))
+    os.makedirs(output_dir, exist_ok=True)
+
+    jobs = []
+    for path in csv_paths:
+        meter_id = os.path.splitext(os.path.basename(path))[0]
+        capacity = initial_capacity.get(meter_id) if isinstance(initial_capacity, dict) else initial_capacity
+        output_path = os.path.join(output_dir, f"{meter_id}.{fmt}")
+        jobs.append((path, output_path, target_day, capacity, dpi))
+
+    if max_workers == 1:
+        for job in jobs:
+            yield _render_job(job)
+        return
+
+    # Tugas dikelompokkan per `chunksize` agar overhead antar-proses kecil
+    batches = [jobs[i:i + chunksize] for i in range(0, len(jobs), chunksize)]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_render_batch, batch) for batch in batches]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+def _render_batch(jobs):
+    return [_render_job(job) for job in jobs]
+
+
+def main():
+    """Render laporan grafik malam hari dari baris perintah."""
+    parser = argparse.ArgumentParser(description="Render grafik prediksi banyak meter tanpa layar.")
+    parser.add_argument('input_dir', help="Direktori berisi file CSV per meter")
+    parser.add_argument('output_dir', help="Direktori tujuan file grafik")
+    parser.add_argument('--target-day', type=int, required=True)
+    parser.add_argument('--capacity', type=float, default=None,
+                        help="Kapasitas hari ke-1 (default: dari garis regresi tiap meter)")
+    parser.add_argument('--format', choices=['png', 'svg'], default='png')
+    parser.add_argument('--dpi', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    failed = 0
+    for csv_path, output_path, error in render_reports(
+            args.input_dir, args.output_dir, args.target_day, args.capacity,
+            fmt=args.format, dpi=args.dpi, max_workers=args.workers):
+        if error is not None:
+            failed += 1
+            print(f"[ERROR] {csv_path}: {error}")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
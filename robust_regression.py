@@ -0,0 +1,100 @@
+import numpy as np
+from regression_engine import FittedLine, _as_1d
+
+# Konstanta skala MAD agar konsisten dengan simpangan baku untuk derau normal
+_MAD_SCALE = 1.4826
+
+
+def _validated(X, y):
+    x = _as_1d(X)
+    y = _as_1d(y)
+    if x.size != y.size:
+        raise ValueError("Jumlah data 'day' dan 'electricity_kWh_left' tidak sama.")
+    if x.size < 2:
+        raise ValueError("Regresi robust membutuhkan minimal 2 data.")
+    return x, y
+
+
+def theil_sen_fit(X, y, max_pairs=1_000_000, seed=0):
+    """
+    Regresi Theil–Sen: slope adalah median dari slope semua pasangan titik, sehingga
+    hampir separuh data boleh berupa pencilan tanpa menggeser garis.
+
+    Untuk riwayat pendek (jumlah pasangan <= `max_pairs`) semua pasangan dihitung
+    sekaligus; untuk riwayat panjang diambil `max_pairs` pasangan acak (dapat
+    direproduksi dengan `seed`), sehingga biaya tetap O(max_pairs) berapa pun
+    panjang riwayatnya. Median dipilih dengan `np.median` (partisi, O(m)).
+    Mengembalikan `FittedLine`.
+    """
+    x, y = _validated(X, y)
+    n = x.size
+    if n * (n - 1) // 2 <= max_pairs:
+        i, j = np.triu_indices(n, k=1)
+    else:
+        rng = np.random.default_rng(seed)
+        i = rng.integers(0, n, size=max_pairs)
+        j = rng.integers(0, n, size=max_pairs)
+
+    dx = x[j] - x[i]
+    valid = dx != 0
+    if not valid.any():
+        slope = 0.0
+    else:
+        slope = float(np.median((y[j] - y[i])[valid] / dx[valid]))
+    intercept = float(np.median(y - slope * x))
+    return FittedLine(slope, intercept, n)
+
+
+def huber_fit(X, y, epsilon=1.345, max_iter=50, tol=1e-10):
+    """
+    Regresi Huber dengan IRLS (iteratively reweighted least squares).
+
+    Setiap iterasi hanya membutuhkan jumlah berbobot (Σw, Σwx, Σwy, Σwx², Σwxy)
+    dan satu median untuk skala residual (MAD), jadi O(n) per iterasi. Residual
+    yang lebih besar dari `epsilon` kali skala mendapat bobot `epsilon/|r|`,
+    sehingga pembacaan yang salah tidak menarik garis sekuat pada OLS.
+    Mengembalikan `FittedLine`.
+    """
+    x, y = _validated(X, y)
+    # Data dipusatkan agar jumlah berbobot stabil secara numerik
+    cx, cy = x.mean(), y.mean()
+    u, v = x - cx, y - cy
+    floor = np.finfo(np.float64).eps * max(1.0, float(np.abs(v).max()))
+
+    weights = np.ones_like(u)
+    slope = offset = 0.0
+    for _ in range(max_iter):
+        total = weights.sum()
+        mean_u = weights @ u / total
+        mean_v = weights @ v / total
+        du = u - mean_u
+        sxx = weights @ (du * du)
+        new_slope = (weights @ (du * (v - mean_v))) / sxx if sxx > 0 else 0.0
+        offset = mean_v - new_slope * mean_u
+
+        residual = v - offset - new_slope * u
+        scale = max(_MAD_SCALE * float(np.median(np.abs(residual - np.median(residual)))), floor)
+        ratio = np.abs(residual) / scale
+        weights = np.where(ratio <= epsilon, 1.0, epsilon / np.maximum(ratio, epsilon))
+
+        converged = abs(new_slope - slope) <= tol * (1 + abs(new_slope))
+        slope = new_slope
+        if converged:
+            break
+
+    return FittedLine(slope, cy + offset - slope * cx, x.size)
+
+
+ROBUST_METHODS = {
+    'huber': huber_fit,
+    'theil-sen': theil_sen_fit,
+}
+
+
+def fit_robust(X, y, method):
+    """Melatih garis regresi robust dengan metode 'huber' atau 'theil-sen'."""
+    try:
+        fit = ROBUST_METHODS[method]
+    except KeyError:
+        raise ValueError(f"Metode robust tidak dikenal: {method!r} (pilih {', '.join(ROBUST_METHODS)}).")
+    return fit(X, y)
@@ -0,0 +1,176 @@
+import os
+import numpy as np
+
+# Tarif listrik PLN R1/1300VA per kWh
+TARIFF_RATE = 1444.70
+
+
+def calculate_cost_and_usage_batch(initial_capacity, target_day, daily_usage_rate, tariff_rate=TARIFF_RATE):
+    """
+    Versi tervektorisasi dari `calculate_cost_and_usage`: semua argumen boleh berupa
+    skalar atau array yang dapat di-broadcast.
+    Hari habis bernilai NaN jika pemakaian harian nol.
+    """
+    initial_capacity = np.asarray(initial_capacity, dtype=np.float64)
+    target_day = np.asarray(target_day, dtype=np.float64)
+    daily_usage_rate = np.asarray(daily_usage_rate, dtype=np.float64)
+
+    remaining_kwh = initial_capacity - daily_usage_rate * (target_day - 1)
+    total_usage = np.maximum(0, daily_usage_rate * target_day)
+    estimated_cost = total_usage * tariff_rate
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        day_at_zero = initial_capacity / daily_usage_rate
+    day_at_zero_rounded = np.where(np.isfinite(day_at_zero), np.floor(day_at_zero), np.nan)
+
+    return remaining_kwh, total_usage, estimated_cost, day_at_zero_rounded
+
+
+# Tarif PLN per kWh untuk golongan rumah tangga (non-subsidi); dapat diganti
+# dengan tabel sendiri melalui `load_tariff_table`.
+TARIFF_TABLE = {
+    'R1/900VA': 1352.00,
+    'R1/1300VA': 1444.70,
+    'R1/2200VA': 1444.70,
+    'R2/3500VA': 1699.53,
+    'R3/6600VA': 1699.53,
+}
+
+
+def load_tariff_table(path):
+    """Membaca tabel tarif dari CSV dua kolom: golongan,tarif_per_kWh (header opsional)."""
+    table = {}
+    with open(path) as f:
+        for line in f:
+            name, _, rate = line.strip().partition(',')
+            if not name or name.startswith('#'):
+                continue
+            try:
+                table[name.strip()] = float(rate)
+            except ValueError:
+                if table:
+                    raise ValueError(f"Tarif tidak valid untuk golongan '{name}'.")
+    if not table:
+        raise ValueError(f"File tarif '{path}' tidak berisi data.")
+    return table
+
+
+def evaluate_grid(initial_capacity, target_day, daily_usage_rate, tariffs=None):
+    """
+    Menghitung skenario what-if pada grid kapasitas x hari x golongan tarif sekaligus.
+
+    `initial_capacity` dan `target_day` berupa array 1D; `tariffs` berupa dict
+    {golongan: tarif} (default `TARIFF_TABLE`). Setiap hasil dihitung hanya pada
+    dimensi yang mempengaruhinya, lalu di-broadcast (view, tanpa salinan) ke bentuk
+    penuh (kapasitas, hari, tarif).
+
+    Mengembalikan dict berisi array 'remaining_kWh', 'total_usage', 'estimated_cost',
+    'day_at_zero_rounded' dan sumbu grid 'initial_capacity', 'target_day', 'tariff_class'.
+    """
+    tariffs = TARIFF_TABLE if tariffs is None else tariffs
+    capacity = np.asarray(initial_capacity, dtype=np.float64).reshape(-1)
+    day = np.asarray(target_day, dtype=np.float64).reshape(-1)
+    rates = np.fromiter(tariffs.values(), dtype=np.float64, count=len(tariffs))
+    shape = (capacity.size, day.size, rates.size)
+
+    cap_axis = capacity[:, None, None]
+    day_axis = day[None, :, None]
+    rate_axis = rates[None, None, :]
+
+    remaining_kwh, total_usage, estimated_cost, day_at_zero_rounded = \
+        calculate_cost_and_usage_batch(cap_axis, day_axis, daily_usage_rate, rate_axis)
+
+    return {
+        'initial_capacity': capacity,
+        'target_day': day,
+        'tariff_class': list(tariffs),
+        'remaining_kWh': np.broadcast_to(remaining_kwh, shape),
+        'total_usage': np.broadcast_to(total_usage, shape),
+        'estimated_cost': np.broadcast_to(estimated_cost, shape),
+        'day_at_zero_rounded': np.broadcast_to(day_at_zero_rounded, shape),
+    }
+
+
+GRID_FIELDS = ['initial_capacity', 'target_day', 'tariff_class', 'tariff_rate', 'remaining_kWh',
+               'total_usage', 'estimated_cost', 'day_at_zero_rounded']
+
+
+def iter_grid_chunks(initial_capacity, target_day, daily_usage_rate, tariffs=None, max_cells=1_000_000):
+    """
+    Menghasilkan grid dalam format panjang per potongan (maks. `max_cells` sel),
+    dipotong sepanjang sumbu kapasitas, sehingga grid 10^8 sel tidak pernah
+    dimuat utuh ke memori. Setiap potongan berupa dict kolom array 1D.
+    """
+    tariffs = TARIFF_TABLE if tariffs is None else tariffs
+    capacity = np.asarray(initial_capacity, dtype=np.float64).reshape(-1)
+    day = np.asarray(target_day, dtype=np.float64).reshape(-1)
+    names = np.array(list(tariffs), dtype=object)
+    rates = np.fromiter(tariffs.values(), dtype=np.float64, count=len(tariffs))
+    cells_per_capacity = max(day.size * rates.size, 1)
+    step = max(1, max_cells // cells_per_capacity)
+
+    for start in range(0, capacity.size, step):
+        grid = evaluate_grid(capacity[start:start + step], day, daily_usage_rate, tariffs)
+        shape = grid['remaining_kWh'].shape
+        cap_idx, day_idx, rate_idx = np.indices(shape).reshape(3, -1)
+        yield {
+            'initial_capacity': grid['initial_capacity'][cap_idx],
+            'target_day': day[day_idx],
+            'tariff_class': names[rate_idx],
+            'tariff_rate': rates[rate_idx],
+            'remaining_kWh': grid['remaining_kWh'].reshape(-1),
+            'total_usage': grid['total_usage'].reshape(-1),
+            'estimated_cost': grid['estimated_cost'].reshape(-1),
+            'day_at_zero_rounded': grid['day_at_zero_rounded'].reshape(-1),
+        }
+
+
+def write_grid_csv(path, initial_capacity, target_day, daily_usage_rate, tariffs=None, max_cells=1_000_000):
+    """
+    Menulis grid what-if ke CSV secara bertahap (per potongan `max_cells` sel).
+    Mengembalikan jumlah baris yang ditulis.
+    """
+    row_format = '%.10g,%d,%s,%.10g,%.10g,%.10g,%.10g,%.10g\n'
+    rows = 0
+    with open(path, 'w') as f:
+        f.write(','.join(GRID_FIELDS) + '\n')
+        for chunk in iter_grid_chunks(initial_capacity, target_day, daily_usage_rate, tariffs, max_cells):
+            columns = [chunk[name].tolist() for name in GRID_FIELDS]
+            f.write(''.join(row_format % row for row in zip(*columns)))
+            rows += len(columns[0])
+    return rows
+
+
+def write_grid_npy(directory, initial_capacity, target_day, daily_usage_rate, tariffs=None, max_cells=1_000_000):
+    """
+    Menulis grid what-if sebagai file .npy per kolom hasil (bentuk kapasitas x hari x tarif)
+    melalui memory-map, per potongan kapasitas. Jauh lebih cepat daripada CSV untuk grid besar.
+    Mengembalikan dict {nama_kolom: jalur_file}.
+    """
+    tariffs = TARIFF_TABLE if tariffs is None else tariffs
+    capacity = np.asarray(initial_capacity, dtype=np.float64).reshape(-1)
+    day = np.asarray(target_day, dtype=np.float64).reshape(-1)
+    shape = (capacity.size, day.size, len(tariffs))
+    step = max(1, max_cells // max(day.size * len(tariffs), 1))
+    os.makedirs(directory, exist_ok=True)
+
+    outputs = ['remaining_kWh', 'total_usage', 'estimated_cost', 'day_at_zero_rounded']
+    paths = {name: os.path.join(directory, f"{name}.npy") for name in outputs}
+    arrays = {name: np.lib.format.open_memmap(path, mode='w+', dtype=np.float64, shape=shape)
+              for name, path in paths.items()}
+    for start in range(0, capacity.size, step):
+        grid = evaluate_grid(capacity[start:start + step], day, daily_usage_rate, tariffs)
+        for name in outputs:
+            arrays[name][start:start + step] = grid[name]
+    for name in outputs:
+        arrays[name].flush()
+
+    # Sumbu grid disimpan agar hasil dapat dibaca kembali
+    for name, values in (('initial_capacity', capacity), ('target_day', day),
+                         ('tariff_rate', np.fromiter(tariffs.values(), dtype=np.float64))):
+        paths[name] = os.path.join(directory, f"{name}.npy")
+        np.save(paths[name], values)
+    paths['tariff_class'] = os.path.join(directory, 'tariff_class.txt')
+    with open(paths['tariff_class'], 'w') as f:
+        f.write('\n'.join(tariffs) + '\n')
+    return paths
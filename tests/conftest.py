@@ -0,0 +1,19 @@
+import os
+import sys
+import pytest
+
+# Modul proyek berada di root repositori (bukan paket)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def write_usage_csv(tmp_path):
+    """Menulis file CSV pemakaian (format data/electricity_usage.csv) di direktori sementara."""
+    def write(name, day, kwh, extra_lines=()):
+        path = tmp_path / name
+        with open(path, 'w') as f:
+            f.write("day,electricity_kWh_left,usage_per_day\n")
+            f.writelines(f"{d},{float(k)!r},\n" for d, k in zip(day, kwh))
+            f.writelines(extra_lines)
+        return str(path)
+    return write
@@ -0,0 +1,45 @@
+import math
+import numpy as np
+import pytest
+from forecast_result import FORECAST_DTYPE, FORECAST_FIELDS, ForecastResult, forecast_batch
+
+
+def _as_batch_values(result):
+    # None pada ForecastResult sama dengan NaN pada array batch
+    return [math.nan if value is None else value for value in result.as_dict().values()]
+
+
+LINES = [(-1.5, 120.0), (-0.37, 48.2), (0.0, 30.0), (0.8, -5.0)]
+
+
+@pytest.mark.parametrize('initial_capacity', [None, 0.0, 100.0])
+def test_forecast_batch_matches_from_line(initial_capacity):
+    slope, intercept = np.array(LINES).T
+    days = np.array([1.0, 15.0, 60.0])
+    batch = forecast_batch(slope[:, None], intercept[:, None], days[None, :],
+                           np.nan if initial_capacity is None else initial_capacity, tariff_rate=1500.0)
+    assert batch.dtype == FORECAST_DTYPE and batch.shape == (len(LINES), days.size)
+
+    for i, (s, b) in enumerate(LINES):
+        for j, day in enumerate(days):
+            expected = ForecastResult.from_line(s, b, day, initial_capacity, tariff_rate=1500.0)
+            np.testing.assert_allclose(batch[i, j].tolist(), _as_batch_values(expected), rtol=1e-15)
+
+
+def test_forecast_batch_broadcasts_scalars():
+    batch = forecast_batch(-2.0, 100.0, 10)
+    assert batch.shape == ()
+    assert batch['predicted_kWh'] == 80.0
+    assert np.isnan(batch['remaining_kWh']) and np.isnan(batch['day_at_zero_rounded'])
+
+
+def test_from_model_and_dict_round_trip():
+    class Line:
+        slope_ = np.float64(-0.5)
+        intercept_ = np.float64(40.0)
+
+    result = ForecastResult.from_model(Line(), 20, initial_capacity=30)
+    assert list(result.as_dict()) == list(FORECAST_FIELDS)
+    assert result == ForecastResult.from_line(-0.5, 40.0, 20, 30)
+    assert result.day_at_zero_exact == 80.0 and result.day_at_zero_rounded == 60
+    assert type(result.slope) is float
@@ -0,0 +1,52 @@
+import asyncio
+import json
+import pytest
+from forecast_service import ForecastService, HTTPError
+
+
+def _dispatch(service, method, path, payload=None):
+    body = json.dumps(payload).encode() if payload is not None else b''
+    return asyncio.run(service.dispatch(method, path, body))
+
+
+@pytest.fixture
+def service(write_usage_csv):
+    service = ForecastService()
+    path = write_usage_csv('rumah.csv', [1, 2, 3, 4], [20.0, 19.0, 18.0, 17.0])
+    _dispatch(service, 'POST', '/meters', {'meter_id': 'rumah', 'csv_path': path})
+    return service
+
+
+def _query(**overrides):
+    query = {'meter_id': 'rumah', 'initial_capacity': 50, 'target_day': 10}
+    query.update(overrides)
+    return {'queries': [query]}
+
+
+def test_predict_matches_registered_model(service):
+    (result,) = _dispatch(service, 'POST', '/predict', _query())['results']
+    assert result['daily_usage_rate'] == pytest.approx(1.0)
+    assert result['remaining_kWh'] == pytest.approx(41.0)
+    assert result['day_at_zero_rounded'] == 50
+
+
+@pytest.mark.parametrize('overrides', [{'meter_id': ['rumah']}, {'target_day': float('nan')},
+                                       {'target_day': 1.5}, {'initial_capacity': '50'}])
+def test_invalid_queries_are_rejected(service, overrides):
+    with pytest.raises(HTTPError) as error:
+        _dispatch(service, 'POST', '/predict', _query(**overrides))
+    assert error.value.status == 400
+
+
+@pytest.mark.filterwarnings('ignore:overflow encountered')
+def test_overflowing_values_are_null_not_infinity(service):
+    response = _dispatch(service, 'POST', '/predict', _query(target_day=1e308))
+    body = json.dumps(response, allow_nan=False)
+    assert json.loads(body)['results'][0]['estimated_cost'] is None
+
+
+@pytest.mark.parametrize('csv_path, status', [(5, 400), ('.', 400), ('tidak-ada.csv', 404)])
+def test_register_rejects_bad_paths(service, csv_path, status):
+    with pytest.raises(HTTPError) as error:
+        _dispatch(service, 'POST', '/meters', {'meter_id': 'x', 'csv_path': csv_path})
+    assert error.value.status == status
@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+from meter_store import MeterStore
+
+
+def _reference_slope(day, kwh):
+    return LinearRegression().fit([[d] for d in day], kwh).coef_[0]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = MeterStore(str(tmp_path))
+    store.append_many('m', [1, 2, 3, 4, 5], [10.0, 9.0, 8.5, 7.0, 6.0])
+    return store
+
+
+def test_remove_updates_model(store):
+    result = store.remove('m', 3, 8.5)
+    assert result['n_samples'] == 4
+    assert result['slope'] == pytest.approx(_reference_slope([1, 2, 4, 5], [10.0, 9.0, 7.0, 6.0]))
+
+
+def test_remove_rejects_unknown_reading(store):
+    before = store.forecast('m')
+    with pytest.raises(ValueError):
+        store.remove('m', 99, 1234.0)
+    assert store.forecast('m') == before
+
+
+def test_removal_survives_restart_and_flush(store, tmp_path):
+    store.remove('m', 3, 8.5)
+    expected = store.forecast('m')
+
+    restarted = MeterStore(str(tmp_path))
+    assert restarted.forecast('m')['n_samples'] == 4
+    assert restarted.forecast('m')['slope'] == pytest.approx(expected['slope'])
+
+    restarted.flush()
+    reloaded = MeterStore(str(tmp_path))
+    assert reloaded.forecast('m')['n_samples'] == 4
+    assert reloaded.forecast('m')['slope'] == pytest.approx(expected['slope'])
+    with pytest.raises(ValueError):
+        reloaded.remove('m', 3, 8.5)
+
+
+def test_correct_replaces_reading(store, tmp_path):
+    store.correct('m', 4, 7.0, 7.5)
+    store.flush('m')
+    reloaded = MeterStore(str(tmp_path))
+    assert reloaded.forecast('m')['slope'] == pytest.approx(
+        _reference_slope([1, 2, 3, 5, 4], [10.0, 9.0, 8.5, 6.0, 7.5]))
+
+
+def test_numpy_scalars_are_written_as_plain_numbers(store, tmp_path):
+    store.append('m', np.int64(6), np.float64(5.5))
+    store.correct('m', np.float64(6), np.float64(5.5), np.float32(5.25))
+    with open(tmp_path / 'm.csv') as f:
+        assert 'np.' not in f.read()
+    expected = store.forecast('m')
+    reloaded = MeterStore(str(tmp_path)).forecast('m')
+    assert reloaded['n_samples'] == expected['n_samples'] == 6
+    assert reloaded['slope'] == pytest.approx(expected['slope'])
+
+
+def test_meter_with_all_readings_removed_can_be_reopened(tmp_path):
+    store = MeterStore(str(tmp_path))
+    store.append('e', 1, 5.0)
+    store.remove('e', 1, 5.0)
+    store.flush()
+
+    reopened = MeterStore(str(tmp_path))
+    assert reopened.forecast('e')['n_samples'] == 0
+    assert reopened.append('e', 2, 4.0)['n_samples'] == 1
+
+
+def test_flush_keeps_unrelated_rows_verbatim(tmp_path):
+    lines = ["day,electricity_kWh_left,usage_per_day\n", "1,10.0,0.5\n", "2,,\n",
+             "3,abc,1\n", "4,8.0,0.75\n", "5,7.0,1.0\n"]
+    with open(tmp_path / 'u.csv', 'w') as f:
+        f.writelines(lines)
+
+    store = MeterStore(str(tmp_path))
+    store.remove('u', 4, 8.0)
+    store.flush()
+    with open(tmp_path / 'u.csv') as f:
+        assert f.readlines() == lines[:4] + lines[5:]
@@ -0,0 +1,79 @@
+import io
+import os
+import numpy as np
+import pytest
+import fit_modes
+import main_CLI
+from model_cache import ModelCache
+from robust_regression import huber_fit
+
+
+@pytest.fixture
+def usage_csv(write_usage_csv):
+    day = np.arange(1, 41)
+    kwh = 100 - 1.2 * day
+    kwh[10] += 60
+    return write_usage_csv('usage.csv', day, kwh)
+
+
+@pytest.fixture
+def count_fits(monkeypatch):
+    calls = []
+    original = fit_modes.fit_arrays
+
+    def counting(*args, **kwargs):
+        calls.append(kwargs)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr('model_cache.fit_arrays', counting)
+    return calls
+
+
+def test_mode_models_are_fitted_once_per_file_version(usage_csv, count_fits):
+    cache = ModelCache()
+    _, robust = cache.get_model(usage_csv, robust='huber')
+    _, again = cache.get_model(usage_csv, robust='huber')
+    _, windowed = cache.get_model(usage_csv, window=10)
+    _, plain = cache.get_model(usage_csv)
+
+    assert again is robust and len(count_fits) == 2
+    assert plain is cache.get(usage_csv)[1]
+    df_csv, _ = cache.get(usage_csv)
+    expected = huber_fit(df_csv['day'].to_numpy(), df_csv['electricity_kWh_left'].to_numpy())
+    assert robust.slope_ == expected.slope_
+    assert windowed.slope_ == pytest.approx(-1.2)
+    assert cache.stats()['mode_fits'] == 2
+
+    # File berubah: data dimuat ulang dan model mode dilatih ulang
+    with open(usage_csv, 'a') as f:
+        f.write("41,50.0,\n")
+    os.utime(usage_csv, ns=(0, os.stat(usage_csv).st_mtime_ns + 10**9))
+    _, refreshed = cache.get_model(usage_csv, robust='huber')
+    assert refreshed is not robust and len(count_fits) == 3 and len(cache) == 1
+
+
+def test_invalid_mode_combination_is_not_cached(usage_csv):
+    cache = ModelCache()
+    with pytest.raises(ValueError):
+        cache.get_model(usage_csv, min_jump=5.0)
+    with pytest.raises(ValueError):
+        cache.get_model(usage_csv, window=5, robust='huber')
+    assert cache.stats()['mode_fits'] == 0
+
+
+def test_before_fit_runs_only_when_fitting(usage_csv):
+    cache = ModelCache()
+    calls = []
+    cache.get_model(usage_csv, topup_aware=True, before_fit=lambda: calls.append(1))
+    cache.get_model(usage_csv, topup_aware=True, before_fit=lambda: calls.append(1))
+    assert calls == [1]
+
+
+def test_cli_robust_graph_fits_once(usage_csv, count_fits, tmp_path, monkeypatch):
+    monkeypatch.setattr(main_CLI, 'MODEL_CACHE', ModelCache())
+    args = main_CLI.build_arg_parser().parse_args(
+        ['--csv', usage_csv, '--capacity', '100', '--target-day', '30', '--robust', 'huber',
+         '--graph', str(tmp_path / 'chart.png')])
+    main_CLI.run_non_interactive(args, out=io.StringIO())
+    assert os.path.getsize(tmp_path / 'chart.png') > 0
+    assert len(count_fits) == 1
@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+from model_cache import load_model
+from usage_loader import fit_usage_csv
+
+
+def test_chunked_fit_matches_in_memory_fit(write_usage_csv):
+    rng = np.random.default_rng(0)
+    day = np.arange(1, 2001, dtype=float)
+    kwh = 500 - 0.3 * day + rng.normal(0, 2, day.size)
+    path = write_usage_csv('meter.csv', day, kwh, ["2001,,\n", "abc,12.0,\n"])
+
+    reference = LinearRegression().fit(day.reshape(-1, 1), kwh)
+    for model in (load_model(path), fit_usage_csv(path, chunksize=128), fit_usage_csv(path, chunksize=7)):
+        assert model.n_samples_ == day.size
+        assert model.slope_ == pytest.approx(reference.coef_[0], rel=1e-9)
+        assert model.intercept_ == pytest.approx(reference.intercept_, rel=1e-9)
+
+
+def test_fit_without_valid_rows_raises(write_usage_csv):
+    path = write_usage_csv('empty.csv', [], [], ["1,,\n"])
+    with pytest.raises(ValueError):
+        fit_usage_csv(path, chunksize=10)
@@ -0,0 +1,74 @@
+import math
+import numpy as np
+import pytest
+from scipy import stats
+from prediction_intervals import analytic_intervals, bootstrap_intervals
+from regression_engine import StreamingLinearRegression
+
+
+def _history(seed=0):
+    rng = np.random.default_rng(seed)
+    day = np.arange(1, 61, dtype=float)
+    kwh = 120 - 1.5 * day + rng.normal(0, 2.0, day.size)
+    return day, kwh
+
+
+def _reference_prediction_interval(day, kwh, target_day, confidence):
+    # Rumus buku teks: ŷ ± t·s·sqrt(1 + 1/n + (x0 - x̄)²/Sxx)
+    fit = stats.linregress(day, kwh)
+    n = day.size
+    s = math.sqrt(np.sum((kwh - fit.intercept - fit.slope * day) ** 2) / (n - 2))
+    t = stats.t.ppf(0.5 + confidence / 2, n - 2)
+    sxx = np.sum((day - day.mean()) ** 2)
+    centre = fit.intercept + fit.slope * target_day
+    half = t * s * math.sqrt(1 + 1 / n + (target_day - day.mean()) ** 2 / sxx)
+    return fit, t, (centre - half, centre + half)
+
+
+@pytest.mark.parametrize('confidence', [0.8, 0.95])
+def test_analytic_intervals_match_textbook_formulas(confidence):
+    day, kwh = _history()
+    model = StreamingLinearRegression().fit(day, kwh)
+    result = analytic_intervals(model, 70, initial_capacity=100, confidence=confidence)
+    fit, t, predicted = _reference_prediction_interval(day, kwh, 70, confidence)
+
+    np.testing.assert_allclose(result['predicted_kWh'], predicted, rtol=1e-10)
+    rate = (-fit.slope - t * fit.stderr, -fit.slope + t * fit.stderr)
+    np.testing.assert_allclose(result['daily_usage_rate'], rate, rtol=1e-10)
+    assert result['day_at_zero_rounded'] == (math.floor(100 / rate[1]), math.floor(100 / rate[0]))
+
+
+def test_zero_crossing_bounds_touch_the_prediction_band():
+    day, kwh = _history()
+    model = StreamingLinearRegression().fit(day, kwh)
+    low, high = analytic_intervals(model, 70)['day_at_zero_exact']
+    assert low < -model.intercept_ / model.slope_ < high
+    # Pada batas bawah sisi atas pita menyentuh 0, pada batas atas sisi bawahnya
+    assert _reference_prediction_interval(day, kwh, low, 0.95)[2][0] == pytest.approx(0, abs=1e-8)
+    assert _reference_prediction_interval(day, kwh, high, 0.95)[2][1] == pytest.approx(0, abs=1e-8)
+
+
+def test_flat_noisy_history_gives_unbounded_zero_crossing():
+    rng = np.random.default_rng(2)
+    day = np.arange(1, 31, dtype=float)
+    model = StreamingLinearRegression().fit(day, 50 + rng.normal(0, 3.0, day.size))
+    result = analytic_intervals(model, 40, initial_capacity=50)
+    assert all(math.isnan(bound) for bound in result['day_at_zero_exact'])
+    assert result['day_at_zero_rounded'][1] == math.inf
+
+
+def test_analytic_intervals_reject_short_history():
+    with pytest.raises(ValueError):
+        analytic_intervals(StreamingLinearRegression().fit([1, 2], [5, 4]), 10)
+
+
+def test_bootstrap_is_reproducible_and_close_to_analytic():
+    day, kwh = _history()
+    model = StreamingLinearRegression().fit(day, kwh)
+    analytic = analytic_intervals(model, 70, initial_capacity=100)
+    serial = bootstrap_intervals(day, kwh, 70, initial_capacity=100, seed=7, max_cells=20_000)
+    parallel = bootstrap_intervals(day, kwh, 70, initial_capacity=100, seed=7, max_cells=20_000, n_jobs=4)
+    assert serial == parallel
+    for name in ('predicted_kWh', 'daily_usage_rate'):
+        width = analytic[name][1] - analytic[name][0]
+        np.testing.assert_allclose(serial[name], analytic[name], atol=0.25 * width)
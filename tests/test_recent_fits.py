@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+from regression_engine import ewm_fit, fit_recent, rolling_fit
+
+
+def _reference(x, y, sample_weight=None):
+    model = LinearRegression().fit(np.asarray(x, dtype=float).reshape(-1, 1), y, sample_weight=sample_weight)
+    return model.coef_[0], model.intercept_
+
+
+@pytest.fixture
+def readings():
+    rng = np.random.default_rng(0)
+    x = np.sort(rng.integers(1, 200, size=300)).astype(float)  # berisi hari duplikat
+    y = 120 - 0.4 * x + rng.normal(0, 1.5, x.size)
+    return x, y
+
+
+def test_rolling_fit_matches_per_window_fits(readings):
+    x, y = readings
+    window = 30
+    n, slope, intercept = rolling_fit(x, y, window)
+    for i in range(0, x.size, 7):
+        in_window = (x > x[i] - window) & (x <= x[i])
+        assert n[i] == in_window.sum()
+        if np.unique(x[in_window]).size > 1:
+            ref_slope, ref_intercept = _reference(x[in_window], y[in_window])
+            assert slope[i] == pytest.approx(ref_slope, rel=1e-8, abs=1e-10)
+            assert intercept[i] == pytest.approx(ref_intercept, rel=1e-8)
+
+
+def test_ewm_fit_matches_weighted_fits(readings):
+    x, y = readings
+    halflife = 25.0
+    # Urutan masukan diacak: hasil harus tetap sejajar dengan baris masukan
+    order = np.random.default_rng(1).permutation(x.size)
+    w, slope, intercept = ewm_fit(x[order], y[order], halflife=halflife)
+    for j in range(0, x.size, 11):
+        i = order[j]
+        weight = np.where(x <= x[i], 0.5 ** ((x[i] - x) / halflife), 0.0)
+        ref_slope, ref_intercept = _reference(x, y, sample_weight=weight)
+        assert w[j] == pytest.approx(weight.sum(), rel=1e-9)
+        assert slope[j] == pytest.approx(ref_slope, rel=1e-7, abs=1e-10)
+        assert intercept[j] == pytest.approx(ref_intercept, rel=1e-7)
+
+
+@pytest.mark.parametrize('options', [{'window': 100}, {'halflife': 1e12}])
+def test_fit_recent_includes_all_readings_of_last_day(options):
+    x = np.array([1, 2, 3, 4, 4], dtype=float)
+    y = np.array([10, 9, 8, 7, 3], dtype=float)
+    model = fit_recent(x, y, **options)
+    slope, intercept = _reference(x, y)
+    assert model.slope_ == pytest.approx(slope, rel=1e-6)
+    assert model.intercept_ == pytest.approx(intercept, rel=1e-6)
+
+
+def test_rolling_fit_counts_duplicate_days():
+    x = np.array([1, 2, 3, 4, 4], dtype=float)
+    n, _, _ = rolling_fit(x, np.zeros(5), 100)
+    np.testing.assert_array_equal(n, [1, 2, 3, 5, 5])
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+from regression_engine import StreamingLinearRegression, fit_chunks
+
+
+def _reference(x, y):
+    model = LinearRegression().fit(np.asarray(x, dtype=float).reshape(-1, 1), y)
+    return model.coef_[0], model.intercept_
+
+
+@pytest.fixture
+def readings():
+    rng = np.random.default_rng(0)
+    x = np.sort(rng.integers(1, 200, size=300)).astype(float)  # berisi hari duplikat
+    y = 120 - 0.4 * x + rng.normal(0, 1.5, x.size)
+    return x, y
+
+
+def test_fit_matches_sklearn(readings):
+    x, y = readings
+    model = StreamingLinearRegression().fit(x, y)
+    slope, intercept = _reference(x, y)
+    assert model.n_samples_ == x.size
+    assert model.slope_ == pytest.approx(slope, rel=1e-10)
+    assert model.intercept_ == pytest.approx(intercept, rel=1e-10)
+    np.testing.assert_allclose(model.predict([10, 500]), intercept + slope * np.array([10, 500]))
+
+
+def test_add_and_remove_match_refit(readings):
+    x, y = readings
+    model = StreamingLinearRegression()
+    for xi, yi in zip(x, y):
+        model.add(xi, yi)
+    for xi, yi in zip(x[::3], y[::3]):
+        model.remove(xi, yi)
+
+    keep = np.ones(x.size, dtype=bool)
+    keep[::3] = False
+    slope, intercept = _reference(x[keep], y[keep])
+    assert model.n_samples_ == keep.sum()
+    assert model.slope_ == pytest.approx(slope, rel=1e-9)
+    assert model.intercept_ == pytest.approx(intercept, rel=1e-9)
+
+
+def test_merge_and_chunks_match_full_fit(readings):
+    x, y = readings
+    full = StreamingLinearRegression().fit(x, y)
+    merged = StreamingLinearRegression().fit(x[:100], y[:100]).merge(
+        StreamingLinearRegression().fit(x[100:], y[100:]))
+    chunked = fit_chunks((x[i:i + 37], y[i:i + 37]) for i in range(0, x.size, 37))
+    for model in (merged, chunked):
+        assert model.n_samples_ == full.n_samples_
+        assert model.slope_ == pytest.approx(full.slope_, rel=1e-10)
+        assert model.intercept_ == pytest.approx(full.intercept_, rel=1e-10)
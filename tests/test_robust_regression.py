@@ -0,0 +1,67 @@
+import itertools
+import numpy as np
+import pytest
+from scipy.stats import theilslopes
+from sklearn.linear_model import LinearRegression
+from robust_regression import fit_robust, huber_fit, theil_sen_fit
+
+
+def _readings_with_typos(seed=0):
+    # Garis 200 - 0.5·day dengan derau kecil dan beberapa pembacaan yang salah ketik
+    rng = np.random.default_rng(seed)
+    day = np.arange(1, 201, dtype=float)
+    kwh = 200 - 0.5 * day + rng.normal(0, 0.2, day.size)
+    kwh[[180, 190, 195]] += [80.0, 120.0, 150.0]
+    return day, kwh
+
+
+def test_theil_sen_matches_brute_force_pairwise_median():
+    rng = np.random.default_rng(1)
+    day = rng.permutation(np.repeat(np.arange(1, 31, dtype=float), 2))
+    kwh = 90 - 1.3 * day + rng.normal(0, 0.5, day.size)
+    pairs = [(kwh[j] - kwh[i]) / (day[j] - day[i])
+             for i, j in itertools.combinations(range(day.size), 2) if day[j] != day[i]]
+    slope = np.median(pairs)
+
+    line = theil_sen_fit(day, kwh)
+    assert line.slope_ == pytest.approx(slope, rel=1e-12)
+    assert line.intercept_ == pytest.approx(np.median(kwh - slope * day), rel=1e-12)
+    assert line.slope_ == pytest.approx(theilslopes(kwh, day).slope, rel=1e-12)
+
+
+def test_theil_sen_sampled_pairs_stay_close():
+    day, kwh = _readings_with_typos()
+    exact = theil_sen_fit(day, kwh)
+    sampled = theil_sen_fit(day, kwh, max_pairs=5000, seed=3)
+    assert sampled.slope_ == pytest.approx(exact.slope_, abs=0.01)
+    assert theil_sen_fit(day, kwh, max_pairs=5000, seed=3).slope_ == sampled.slope_
+
+
+def test_huber_is_fixed_point_of_weighted_least_squares():
+    day, kwh = _readings_with_typos()
+    line = huber_fit(day, kwh)
+    # Pada konvergensi, WLS dengan bobot Huber dari garis itu sendiri menghasilkan garis yang sama
+    residual = kwh - line.predict(day[:, None])
+    scale = 1.4826 * np.median(np.abs(residual - np.median(residual)))
+    ratio = np.abs(residual) / scale
+    weights = np.where(ratio <= 1.345, 1.0, 1.345 / ratio)
+    reference = LinearRegression().fit(day[:, None], kwh, sample_weight=weights)
+    assert line.slope_ == pytest.approx(reference.coef_[0], rel=1e-6)
+    assert line.intercept_ == pytest.approx(reference.intercept_, rel=1e-6)
+
+
+@pytest.mark.parametrize('method', ['huber', 'theil-sen'])
+def test_robust_fits_ignore_typos(method):
+    day, kwh = _readings_with_typos()
+    ols = LinearRegression().fit(day[:, None], kwh)
+    line = fit_robust(day, kwh, method)
+    assert abs(ols.coef_[0] + 0.5) > 0.03
+    assert line.slope_ == pytest.approx(-0.5, abs=0.01)
+    assert line.intercept_ == pytest.approx(200, abs=1.0)
+
+
+def test_unknown_method_and_short_input_raise():
+    with pytest.raises(ValueError):
+        fit_robust([1, 2, 3], [3, 2, 1], 'lasso')
+    with pytest.raises(ValueError):
+        huber_fit([1], [1])
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from tariff import (TARIFF_TABLE, calculate_cost_and_usage_batch, evaluate_grid, iter_grid_chunks,
+                    write_grid_csv, write_grid_npy)
+
+CAPACITY = np.array([50.0, 75.5, 100.0, 120.0, 200.0])
+DAYS = np.array([1, 7, 30, 90], dtype=float)
+TARIFFS = {'A': 1000.0, 'B': 1444.70, 'C': 1699.53}
+OUTPUTS = ['remaining_kWh', 'total_usage', 'estimated_cost', 'day_at_zero_rounded']
+
+
+def _reference_cell(capacity, day, rate, daily_usage_rate):
+    return dict(zip(OUTPUTS, calculate_cost_and_usage_batch(capacity, day, daily_usage_rate, rate)))
+
+
+@pytest.mark.parametrize('daily_usage_rate', [1.7, 0.0])
+def test_evaluate_grid_matches_per_cell_calculation(daily_usage_rate):
+    grid = evaluate_grid(CAPACITY, DAYS, daily_usage_rate, TARIFFS)
+    assert grid['tariff_class'] == list(TARIFFS)
+    for i, capacity in enumerate(CAPACITY):
+        for j, day in enumerate(DAYS):
+            for k, rate in enumerate(TARIFFS.values()):
+                expected = _reference_cell(capacity, day, rate, daily_usage_rate)
+                for name in OUTPUTS:
+                    np.testing.assert_equal(grid[name][i, j, k], expected[name])
+
+
+def test_evaluate_grid_defaults_to_tariff_table():
+    grid = evaluate_grid(CAPACITY, DAYS, 1.7)
+    assert grid['estimated_cost'].shape == (CAPACITY.size, DAYS.size, len(TARIFF_TABLE))
+
+
+@pytest.mark.parametrize('max_cells', [1, 12, 25, 1_000_000])
+def test_grid_chunks_cover_the_grid_in_long_format(max_cells):
+    chunks = list(iter_grid_chunks(CAPACITY, DAYS, 1.7, TARIFFS, max_cells=max_cells))
+    rows = {name: np.concatenate([chunk[name] for chunk in chunks]) for name in chunks[0]}
+    assert rows['remaining_kWh'].size == CAPACITY.size * DAYS.size * len(TARIFFS)
+
+    for n in range(rows['remaining_kWh'].size):
+        assert TARIFFS[rows['tariff_class'][n]] == rows['tariff_rate'][n]
+        expected = _reference_cell(rows['initial_capacity'][n], rows['target_day'][n],
+                                   rows['tariff_rate'][n], 1.7)
+        for name in OUTPUTS:
+            np.testing.assert_equal(rows[name][n], expected[name])
+
+
+def test_grid_writers_agree_with_evaluate_grid(tmp_path):
+    grid = evaluate_grid(CAPACITY, DAYS, 1.7, TARIFFS)
+
+    rows = write_grid_csv(tmp_path / 'grid.csv', CAPACITY, DAYS, 1.7, TARIFFS, max_cells=10)
+    assert rows == grid['remaining_kWh'].size
+    table = np.genfromtxt(tmp_path / 'grid.csv', delimiter=',', names=True, dtype=None, encoding=None)
+    np.testing.assert_allclose(table['estimated_cost'], grid['estimated_cost'].reshape(-1), rtol=1e-9)
+
+    paths = write_grid_npy(tmp_path / 'npy', CAPACITY, DAYS, 1.7, TARIFFS, max_cells=10)
+    for name in OUTPUTS:
+        np.testing.assert_array_equal(np.load(paths[name]), grid[name])
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+from topup_segments import detect_topups, fit_topup_aware, noise_jump_threshold
+
+
+def _meter_with_topups(noise=0.0, seed=0):
+    # Pemakaian 0.5 kWh/hari; isi ulang ke 100 kWh setiap 200 hari
+    rng = np.random.default_rng(seed)
+    day = np.arange(1, 1001, dtype=float)
+    kwh = 100 - 0.5 * ((day - 1) % 200) + rng.normal(0, noise, day.size)
+    return day, kwh
+
+
+def test_segments_split_at_topups():
+    day, kwh = _meter_with_topups()
+    index = detect_topups(day, kwh)
+    np.testing.assert_array_equal(index.starts, [0, 200, 400, 600, 800])
+    np.testing.assert_array_equal(index.ends, [200, 400, 600, 800, 1000])
+
+
+def test_segment_fits_match_sklearn():
+    day, kwh = _meter_with_topups(noise=0.3)
+    index = detect_topups(day, kwh)
+    n, slope, intercept = index.fit_segments()
+    for k, (start, end) in enumerate(zip(index.starts, index.ends)):
+        reference = LinearRegression().fit(day[start:end, None], kwh[start:end])
+        assert n[k] == end - start
+        assert slope[k] == pytest.approx(reference.coef_[0], rel=1e-9)
+        assert intercept[k] == pytest.approx(reference.intercept_, rel=1e-9)
+
+
+def test_pooled_slope_matches_regression_with_segment_intercepts():
+    day, kwh = _meter_with_topups(noise=0.3)
+    index = detect_topups(day, kwh)
+    # Referensi: satu slope bersama dengan intercept terpisah per segmen (variabel dummy)
+    segment = np.searchsorted(index.starts, np.arange(day.size), side='right') - 1
+    dummies = np.eye(len(index))[segment]
+    reference = LinearRegression(fit_intercept=False).fit(np.column_stack([day, dummies]), kwh)
+    assert index.pooled_slope() == pytest.approx(reference.coef_[0], rel=1e-9)
+
+    line = fit_topup_aware(day, kwh)
+    assert line.slope_ == pytest.approx(reference.coef_[0], rel=1e-9)
+    assert line.intercept_ == pytest.approx(reference.coef_[-1], rel=1e-9)
+
+
+def test_noise_threshold_ignores_upward_noise():
+    day, kwh = _meter_with_topups(noise=0.3)
+    assert len(detect_topups(day, kwh, min_jump=0.0)) > 5
+    assert len(detect_topups(day, kwh)) == 5
+    assert fit_topup_aware(day, kwh).slope_ == pytest.approx(-0.5, abs=0.005)
+    assert noise_jump_threshold(_meter_with_topups()[1]) == 0.0
+
+
+def test_single_point_segment_has_no_line():
+    n, slope, intercept = detect_topups([1, 2, 3, 4], [10, 9, 20, 30], min_jump=0.5).fit_segments()
+    np.testing.assert_array_equal(n, [2, 1, 1])
+    assert slope[0] == pytest.approx(-1.0)
+    assert np.isnan(slope[1:]).all() and np.isnan(intercept[1:]).all()
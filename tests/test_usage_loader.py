@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+from usage_loader import read_usage_arrays
+
+
+@pytest.fixture
+def usage_csv(write_usage_csv):
+    rng = np.random.default_rng(0)
+    day = np.arange(1, 2001, dtype=float)
+    kwh = 500 - 0.3 * day + rng.normal(0, 2, day.size)
+    # Baris kosong dan bukan angka harus dibuang
+    path = write_usage_csv('meter.csv', day, kwh, ["2001,,\n", "abc,12.0,\n"])
+    return path, day, kwh
+
+
+def test_chunked_read_matches_whole_read(usage_csv):
+    path, day, kwh = usage_csv
+    for chunksize in (None, 300):
+        got_day, got_kwh = read_usage_arrays(path, chunksize=chunksize)
+        np.testing.assert_array_equal(got_day, day)
+        # Parser float pandas tidak selalu round-trip hingga bit terakhir
+        np.testing.assert_allclose(got_kwh, kwh, rtol=1e-14)
+
+
+def test_fractional_days_are_not_truncated(write_usage_csv):
+    day = [1, 1.5, 2, 2.5, 3]
+    path = write_usage_csv('meter.csv', day, [11.7 - 1.8 * d for d in day])
+    for chunksize in (None, 2):
+        got_day, _ = read_usage_arrays(path, chunksize=chunksize)
+        assert got_day.dtype == np.float64
+        np.testing.assert_array_equal(got_day, day)
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+from model_cache import load_model
+from usage_store import binary_cache_path, load_usage_arrays
+
+
+def test_binary_cache_round_trip_keeps_fractional_days(write_usage_csv):
+    day = [1, 1.5, 2, 2.5, 3]
+    path = write_usage_csv('meter.csv', day, [11.7 - 1.8 * d for d in day])
+
+    # Pemuatan pertama membuat cache biner, pemuatan kedua membacanya kembali
+    for _ in range(2):
+        model = load_model(path)
+        assert model.slope_ == pytest.approx(-1.8)
+        assert model.intercept_ == pytest.approx(11.7)
+    cached_day, _ = load_usage_arrays(path)
+    assert isinstance(cached_day, np.memmap)
+    np.testing.assert_array_equal(cached_day, day)
+
+
+def test_stale_binary_cache_is_rebuilt(write_usage_csv):
+    path = write_usage_csv('meter.csv', [1, 2, 3], [10.0, 9.0, 8.0])
+    load_usage_arrays(path)
+    with open(binary_cache_path(path), 'r+b') as f:
+        f.write(b'KWHCOL01')  # format lama
+    day, kwh = load_usage_arrays(path)
+    np.testing.assert_array_equal(day, [1, 2, 3])
+    np.testing.assert_array_equal(kwh, [10.0, 9.0, 8.0])
+
+
+def test_modified_csv_invalidates_cache(write_usage_csv):
+    path = write_usage_csv('meter.csv', [1, 2, 3], [10.0, 9.0, 8.0])
+    load_usage_arrays(path)
+    write_usage_csv('meter.csv', [1, 2, 3, 4], [10.0, 9.0, 8.0, 7.0])
+    day, _ = load_usage_arrays(path)
+    np.testing.assert_array_equal(day, [1, 2, 3, 4])
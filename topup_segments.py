@@ -0,0 +1,123 @@
+import numpy as np
+from regression_engine import FittedLine, _line_from_sums
+from robust_regression import _MAD_SCALE
+
+# Ambang lompatan bawaan: kelipatan simpangan derau selisih antar-pembacaan
+TOPUP_NOISE_FACTOR = 5.0
+
+
+class SegmentIndex:
+    """
+    Indeks segmen riwayat meter yang dipisahkan oleh pengisian ulang (top-up).
+
+    Segmen ke-k mencakup baris [starts[k], ends[k]) dari data yang sudah diurutkan
+    berdasarkan 'day'. Statistik tiap segmen dihitung dari prefix sum sehingga tidak
+    perlu melatih model terpisah per segmen.
+    """
+
+    def __init__(self, day, kwh_left, starts, ends):
+        self.day = day
+        self.kwh_left = kwh_left
+        self.starts = starts
+        self.ends = ends
+
+        # Prefix sum statistik (dipusatkan global agar stabil secara numerik)
+        self.center_x = day.mean()
+        self.center_y = kwh_left.mean()
+        u = day - self.center_x
+        v = kwh_left - self.center_y
+        stats = np.column_stack([np.ones_like(u), u, v, u * u, u * v])
+        self._prefix = np.vstack([np.zeros((1, 5)), np.cumsum(stats, axis=0)])
+
+    def __len__(self):
+        return self.starts.size
+
+    def segment_sums(self):
+        """Jumlah (n, Σu, Σv, Σu², Σuv) setiap segmen, masing-masing array sepanjang jumlah segmen."""
+        return (self._prefix[self.ends] - self._prefix[self.starts]).T
+
+    def fit_segments(self):
+        """
+        Slope dan intercept setiap segmen, dihitung seperti `rolling_fit`.
+        Mengembalikan (n, slope, intercept); segmen satu titik tidak mempunyai garis
+        (slope dan intercept NaN), segmen dengan 'day' yang sama semua mendapat slope 0.
+        """
+        n, su, sv, suu, suv = self.segment_sums()
+        slope, intercept = _line_from_sums(n, su, sv, suu, suv, self.center_x, self.center_y)
+        single = n < 2
+        slope = np.where(single, np.nan, slope)
+        intercept = np.where(single, np.nan, intercept)
+        return n.astype(np.int64), slope, intercept
+
+    def pooled_slope(self):
+        """
+        Laju konsumsi gabungan semua segmen: Σ Sxy / Σ Sxx dengan data dipusatkan
+        per segmen, sehingga lompatan top-up tidak mempengaruhi gradien.
+        """
+        n, su, sv, suu, suv = self.segment_sums()
+        sxx = suu - su * su / n
+        sxy = suv - su * sv / n
+        total_sxx = sxx.sum()
+        if total_sxx <= 0:
+            return 0.0
+        return sxy.sum() / total_sxx
+
+    def current_segment_line(self):
+        """
+        Garis prediksi untuk segmen terakhir (saat ini): gradien gabungan semua segmen,
+        melewati rata-rata data segmen terakhir.
+        """
+        slope = self.pooled_slope()
+        n, su, sv, _, _ = (column[-1] for column in self.segment_sums())
+        mean_x = su / n + self.center_x
+        mean_y = sv / n + self.center_y
+        return FittedLine(slope, mean_y - slope * mean_x, n)
+
+
+def noise_jump_threshold(kwh_left, factor=TOPUP_NOISE_FACTOR):
+    """
+    Ambang kenaikan kWh yang dianggap top-up, diturunkan dari derau data:
+    `factor` x MAD (diskalakan) dari selisih antar-pembacaan berurutan. Kenaikan
+    kecil akibat derau pembacaan berada di bawah ambang ini, sedangkan top-up
+    (jarang) tidak mempengaruhi median. Data tanpa derau menghasilkan 0.
+    """
+    diffs = np.diff(np.asarray(kwh_left, dtype=np.float64).reshape(-1))
+    if diffs.size == 0:
+        return 0.0
+    mad = np.median(np.abs(diffs - np.median(diffs)))
+    return factor * _MAD_SCALE * float(mad)
+
+
+def detect_topups(day, kwh_left, min_jump=None):
+    """
+    Mendeteksi top-up dalam satu pemindaian linear: baris di mana sisa kWh naik
+    lebih dari `min_jump` dibanding baris sebelumnya. Jika `min_jump` None,
+    ambang diturunkan dari derau data (lihat `noise_jump_threshold`).
+
+    Mengembalikan `SegmentIndex` (data diurutkan berdasarkan 'day' bila perlu).
+    """
+    day = np.asarray(day, dtype=np.float64).reshape(-1)
+    kwh_left = np.asarray(kwh_left, dtype=np.float64).reshape(-1)
+    if day.size != kwh_left.size:
+        raise ValueError("Jumlah data 'day' dan 'electricity_kWh_left' tidak sama.")
+    if day.size == 0:
+        raise ValueError("Tidak ada data untuk disegmentasi.")
+    if np.any(np.diff(day) < 0):
+        order = np.argsort(day, kind='stable')
+        day, kwh_left = day[order], kwh_left[order]
+
+    if min_jump is None:
+        min_jump = noise_jump_threshold(kwh_left)
+    jumps = np.flatnonzero(np.diff(kwh_left) > min_jump) + 1
+    starts = np.concatenate([[0], jumps])
+    ends = np.concatenate([jumps, [day.size]])
+    return SegmentIndex(day, kwh_left, starts, ends)
+
+
+def fit_topup_aware(day, kwh_left, min_jump=None):
+    """
+    Melatih garis prediksi yang sadar top-up: gradien dari semua segmen
+    (tanpa lompatan top-up), intercept dari segmen saat ini.
+    `min_jump` seperti pada `detect_topups`.
+    """
+    return detect_topups(day, kwh_left, min_jump).current_segment_line()
@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+from regression_engine import fit_chunks
+from pipeline_profiler import stage
+
+# Kolom yang dibutuhkan untuk regresi; kolom lain (mis. 'usage_per_day') tidak dibaca
+DAY_COLUMN = 'day'
+KWH_COLUMN = 'electricity_kWh_left'
+USAGE_COLUMNS = [DAY_COLUMN, KWH_COLUMN]
+
+
+def _clean_chunk(chunk, kwh_dtype):
+    """
+    Mengubah satu potongan tabel menjadi array (day, kWh) yang bersih.
+    Baris dengan nilai kosong atau bukan angka dibuang.
+    """
+    day = chunk[DAY_COLUMN].to_numpy()
+    kwh = chunk[KWH_COLUMN].to_numpy()
+    if day.dtype == object or kwh.dtype == object:
+        # Jalur lambat: hanya untuk potongan yang berisi teks bukan angka
+        day = pd.to_numeric(chunk[DAY_COLUMN], errors='coerce').to_numpy(dtype=np.float64)
+        kwh = pd.to_numeric(chunk[KWH_COLUMN], errors='coerce').to_numpy(dtype=np.float64)
+
+    valid = np.isfinite(day) & np.isfinite(kwh)
+    return day[valid].astype(np.float64, copy=False), kwh[valid].astype(kwh_dtype)
+
+
+def iter_usage_chunks(csv_file_path, chunksize=1_000_000, kwh_dtype=np.float64):
+    """
+    Membaca file CSV pemakaian listrik per potongan dan menghasilkan tuple
+    (day, kWh) berupa array NumPy kontigu (float64 dan `kwh_dtype`).
+    """
+    reader = pd.read_csv(
+        csv_file_path,
+        usecols=USAGE_COLUMNS,
+        dtype={DAY_COLUMN: np.float64, KWH_COLUMN: np.float64},
+        engine='c',
+        chunksize=chunksize,
+        on_bad_lines='skip',
+    )
+    done = 0
+    try:
+        for chunk in reader:
+            yield _clean_chunk(chunk, kwh_dtype)
+            done += 1
+    except ValueError:
+        # Ada teks bukan angka di file: lanjutkan tanpa dtype tetap mulai dari
+        # potongan yang gagal (batas potongan tetap sama)
+        reader.close()
+        reader = pd.read_csv(csv_file_path, usecols=USAGE_COLUMNS, engine='c',
+                             chunksize=chunksize, on_bad_lines='skip')
+        for index, chunk in enumerate(reader):
+            if index >= done:
+                yield _clean_chunk(chunk, kwh_dtype)
+    finally:
+        reader.close()
+
+
+def read_usage_arrays(csv_file_path, chunksize=None, kwh_dtype=np.float64, on_chunk=None):
+    """
+    Membaca kolom 'day' dan 'electricity_kWh_left' dari CSV langsung ke array NumPy.
+
+    Hanya dua kolom tersebut yang diparsing dengan dtype tetap, dan baris yang tidak
+    valid dibuang dalam satu pass. Jika `chunksize` diberikan, file dibaca per
+    potongan agar puncak memori tetap kecil, dan `on_chunk()` (jika ada) dipanggil
+    setelah setiap potongan, mis. untuk menghentikan pembacaan yang dibatalkan.
+
+    Mengembalikan tuple (day, kWh): array float64 dan array `kwh_dtype`.
+    Hari pecahan (mis. 1.5) dipertahankan apa adanya.
+    """
+    if chunksize is None:
+        return _read_whole(csv_file_path, kwh_dtype)
+
+    chunks = []
+    for chunk in iter_usage_chunks(csv_file_path, chunksize=chunksize, kwh_dtype=kwh_dtype):
+        chunks.append(chunk)
+        if on_chunk is not None:
+            on_chunk()
+
+    if not chunks:
+        return np.empty(0, dtype=np.float64), np.empty(0, dtype=kwh_dtype)
+    if len(chunks) == 1:
+        return chunks[0]
+    return (np.concatenate([c[0] for c in chunks]),
+            np.concatenate([c[1] for c in chunks]))
+
+
+def _read_whole(csv_file_path, kwh_dtype):
+    with stage('read_csv') as record:
+        try:
+            table = pd.read_csv(csv_file_path, usecols=USAGE_COLUMNS, engine='c',
+                                dtype={DAY_COLUMN: np.float64, KWH_COLUMN: np.float64},
+                                on_bad_lines='skip')
+        except ValueError:
+            table = pd.read_csv(csv_file_path, usecols=USAGE_COLUMNS, engine='c',
+                                on_bad_lines='skip')
+        record.rows = len(table)
+    with stage('dropna') as record:
+        day, kwh = _clean_chunk(table, kwh_dtype)
+        record.rows = day.size
+    return day, kwh
+
+
+def usage_frame(day, kwh):
+    """Membungkus array (day, kWh) menjadi DataFrame tanpa menyalin data."""
+    return pd.DataFrame({DAY_COLUMN: day, KWH_COLUMN: kwh}, copy=False)
+
+
+def fit_usage_csv(csv_file_path, chunksize=1_000_000):
+    """
+    Melatih model regresi langsung dari CSV per potongan (out-of-core).
+    Memori yang dipakai sebanding dengan `chunksize`, bukan panjang riwayat,
+    dan hasilnya sama dengan pelatihan dari seluruh data sekaligus.
+    """
+    model = fit_chunks(iter_usage_chunks(csv_file_path, chunksize=chunksize))
+    if model.n_samples_ == 0:
+        raise ValueError("File CSV tidak memiliki data yang valid untuk analisis.")
+    return model
@@ -0,0 +1,104 @@
+import os
+import struct
+import numpy as np
+from pipeline_profiler import stage
+
+# Format biner kolumnar untuk riwayat pemakaian:
+#   header 64 byte  : magic, jumlah baris, mtime_ns dan ukuran file CSV sumber
+#   kolom 'day'     : float64 x n (hari pecahan dipertahankan)
+#   kolom kWh       : float64 x n
+BINARY_SUFFIX = '.kwhcol'
+_MAGIC = b'KWHCOL02'
+_HEADER = struct.Struct('<8sQqq')
+_HEADER_SIZE = 64
+
+
+def binary_cache_path(csv_file_path):
+    """Jalur file biner yang berpasangan dengan file CSV."""
+    return csv_file_path + BINARY_SUFFIX
+
+
+def _column_offsets(n_rows):
+    day_offset = _HEADER_SIZE
+    kwh_offset = day_offset + n_rows * 8
+    return day_offset, kwh_offset
+
+
+def write_binary_usage(path, day, kwh, source_stat=None):
+    """
+    Menulis array (day, kWh) ke file biner kolumnar secara atomik.
+    `source_stat` (hasil `os.stat` CSV sumber) disimpan untuk validasi cache.
+    """
+    day = np.ascontiguousarray(day, dtype='<f8')
+    kwh = np.ascontiguousarray(kwh, dtype='<f8')
+    n_rows = day.size
+    mtime_ns = source_stat.st_mtime_ns if source_stat is not None else 0
+    size = source_stat.st_size if source_stat is not None else 0
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, n_rows, mtime_ns, size).ljust(_HEADER_SIZE, b'\0'))
+        f.write(day.tobytes())
+        f.write(kwh.tobytes())
+    os.replace(tmp_path, path)
+
+
+def read_binary_header(path):
+    """Membaca header file biner: (jumlah baris, mtime_ns sumber, ukuran sumber)."""
+    with open(path, 'rb') as f:
+        magic, n_rows, mtime_ns, size = _HEADER.unpack(f.read(_HEADER.size))
+    if magic != _MAGIC:
+        raise ValueError(f"File '{path}' bukan file data pemakaian biner.")
+    return n_rows, mtime_ns, size
+
+
+def open_binary_usage(path):
+    """
+    Membuka file biner sebagai array memory-mapped (tanpa menyalin data).
+    Mengembalikan tuple (day, kWh) read-only.
+    """
+    n_rows, _, _ = read_binary_header(path)
+    if n_rows == 0:
+        return np.empty(0, dtype=np.float64), np.empty(0, dtype=np.float64)
+    day_offset, kwh_offset = _column_offsets(n_rows)
+    day = np.memmap(path, dtype='<f8', mode='r', offset=day_offset, shape=(n_rows,))
+    kwh = np.memmap(path, dtype='<f8', mode='r', offset=kwh_offset, shape=(n_rows,))
+    return day, kwh
+
+
+def load_usage_arrays(csv_file_path, use_binary_cache=True, chunksize=None, on_chunk=None):
+    """
+    Memuat (day, kWh) dari CSV melalui cache biner kolumnar.
+
+    Pada pemuatan pertama, CSV diparsing lalu file biner dibuat di sebelahnya.
+    Pemuatan berikutnya memakai memory-map dari file biner tersebut. Cache dianggap
+    kedaluwarsa jika waktu modifikasi atau ukuran CSV berubah. Jika file biner tidak
+    dapat ditulis (mis. direktori read-only), data dari CSV tetap dikembalikan.
+    `chunksize` dan `on_chunk` diteruskan ke `read_usage_arrays` saat CSV diparsing.
+    """
+    source_stat = os.stat(csv_file_path)
+    cache_path = binary_cache_path(csv_file_path)
+    if use_binary_cache:
+        try:
+            _, mtime_ns, size = read_binary_header(cache_path)
+            if mtime_ns == source_stat.st_mtime_ns and size == source_stat.st_size:
+                with stage('load_binary') as record:
+                    day, kwh = open_binary_usage(cache_path)
+                    record.rows = day.size
+                return day, kwh
+        except (OSError, ValueError, struct.error):
+            pass
+
+    # Parser CSV (pandas) hanya dimuat jika file biner tidak dapat dipakai
+    from usage_loader import read_usage_arrays
+
+    day, kwh = read_usage_arrays(csv_file_path, chunksize=chunksize, on_chunk=on_chunk)
+    if not use_binary_cache:
+        return day, kwh
+
+    try:
+        with stage('write_binary', rows=day.size):
+            write_binary_usage(cache_path, day, kwh, source_stat)
+    except OSError:
+        pass
+    return day, kwh